@@ -1,19 +1,29 @@
 # -*- coding: utf-8 -*-
 
+import collections
+import cPickle as pickle
+import hashlib
+import logging
 import os
 import glob
+import time
 
+import pkg_resources
+from openfisca_core import legislationsxml
 from openfisca_core.taxbenefitsystems import TaxBenefitSystem
 
 from .entities import entities
-from . import decompositions, scenarios
+from . import decompositions, legislation_cache, scenarios, variables_manifest
 
 from .model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales import preprocessing
+from .model.tableaux_par_defaut import partager_valeur_par_defaut
 from .conf.cache_blacklist import cache_blacklist as conf_cache_blacklist
 
 
 COUNTRY_DIR = os.path.dirname(os.path.abspath(__file__))
 
+log = logging.getLogger(__name__)
+
 
 class FranceTaxBenefitSystem(TaxBenefitSystem):
     """French tax benefit system"""
@@ -21,6 +31,9 @@ class FranceTaxBenefitSystem(TaxBenefitSystem):
     DATA_SOURCES_DIR = os.path.join(COUNTRY_DIR, 'data', 'sources')
     decomposition_file_path = os.path.join(
         os.path.dirname(os.path.abspath(decompositions.__file__)), 'decomp.xml')
+    package_metadata = None
+    # Profiler of all the simulations of the scenarios of this tax and benefit system (see profiler.py)
+    profiler = None
     preprocess_legislation = staticmethod(preprocessing.preprocess_legislation)
 
     REFORMS_DIR = os.path.join(COUNTRY_DIR, 'reformes')
@@ -32,9 +45,22 @@ class FranceTaxBenefitSystem(TaxBenefitSystem):
     'superbrut': ['salaire_super_brut', 'chomage_brut', 'retraite_brute', 'pensions_alimentaires_percues', 'pensions_alimentaires_versees', 'rev_cap_brut', 'fon'],
     }
 
-    def __init__(self):
+    def __init__(self, legislation_cache_dir = None, lazy_variables = False, compact_legislation_cache_size = 256):
+        """
+        :param legislation_cache_dir: Optional directory where the preprocessed legislation is pickled, and loaded from
+            instead of parsing the XML parameters, as long as neither these files nor the preprocessing change.
+        :param lazy_variables: When True, the module defining a variable is only imported the first time this variable
+            is requested, using the manifest `model/variables_manifest.json`.
+        :param compact_legislation_cache_size: Maximum number of instants whose compact legislation is kept in memory,
+            shared by all the simulations of this tax and benefit system (None for no limit). See
+            `self.compact_legislation_by_instant_cache.info()` for hits and misses.
+        """
         TaxBenefitSystem.__init__(self, entities)
+        self.compact_legislation_by_instant_cache = legislation_cache.CompactLegislationCache(
+            max_size = compact_legislation_cache_size)
         self.Scenario = scenarios.Scenario
+        self.legislation_cache_dir = legislation_cache_dir
+        self.startup_timings = collections.OrderedDict()
 
         param_files = [
             '__root__.xml',
@@ -54,9 +80,74 @@ class FranceTaxBenefitSystem(TaxBenefitSystem):
             param_path = os.path.join(COUNTRY_DIR, 'parameters', param_file)
             self.add_legislation_params(param_path)
 
-        self.add_variables_from_directory(os.path.join(COUNTRY_DIR, 'model'))
+        start_time = time.time()
+        if lazy_variables:
+            self.column_by_name = variables_manifest.LazyColumnByName(self, variables_manifest.load_manifest())
+        else:
+            self.add_variables_from_directory(os.path.join(COUNTRY_DIR, 'model'))
+        self.startup_timings['variables_import'] = time.time() - start_time
         self.cache_blacklist = conf_cache_blacklist
 
+    def compute_legislation(self, with_source_file_infos = False):
+        cache_file_path = self.get_legislation_cache_file_path()
+        if cache_file_path is not None and os.path.exists(cache_file_path):
+            start_time = time.time()
+            with open(cache_file_path, 'rb') as cache_file:
+                self._legislation_json = pickle.load(cache_file)
+            self.startup_timings['legislation_cache_load'] = time.time() - start_time
+            return
+
+        start_time = time.time()
+        legislation_json = legislationsxml.load_legislation(self.legislation_xml_info_list)
+        self.startup_timings['xml_parse'] = time.time() - start_time
+        start_time = time.time()
+        legislation_json = self.preprocess_legislation(legislation_json)
+        self.startup_timings['preprocessing'] = time.time() - start_time
+        self._legislation_json = legislation_json
+
+        if cache_file_path is not None:
+            # Write to a temporary file first, so that concurrent processes never load a partial pickle.
+            temporary_file_path = '{}.{}.tmp'.format(cache_file_path, os.getpid())
+            try:
+                with open(temporary_file_path, 'wb') as cache_file:
+                    pickle.dump(legislation_json, cache_file, pickle.HIGHEST_PROTOCOL)
+                os.rename(temporary_file_path, cache_file_path)
+            except (IOError, OSError):
+                log.warning(u'Unable to write legislation cache file {}'.format(cache_file_path))
+
+    def load_variable(self, variable_class, update = False):
+        return partager_valeur_par_defaut(TaxBenefitSystem.load_variable(self, variable_class, update = update))
+
+    def get_package_metadata(self):
+        # Memoized, because it is called for each loaded variable and querying pkg_resources is slow.
+        if self.package_metadata is None:
+            self.package_metadata = TaxBenefitSystem.get_package_metadata(self)
+        return self.package_metadata
+
+    def get_legislation_cache_file_path(self):
+        """Return the path of the legislation cache file, named after a hash of the legislation sources."""
+        if self.legislation_cache_dir is None:
+            return None
+        legislation_hash = hashlib.sha1()
+        legislation_hash.update(pkg_resources.get_distribution('OpenFisca-Core').version)
+        for source_file_path in [
+                path_to_xml_file
+                for path_to_xml_file, path_in_legislation_tree in self.legislation_xml_info_list
+                ] + [preprocessing.__file__.replace('.pyc', '.py')]:
+            legislation_hash.update(source_file_path)
+            with open(source_file_path, 'rb') as source_file:
+                legislation_hash.update(source_file.read())
+        for path_to_xml_file, path_in_legislation_tree in self.legislation_xml_info_list:
+            legislation_hash.update(repr(path_in_legislation_tree))
+        return os.path.join(self.legislation_cache_dir, 'legislation-{}.pickle'.format(legislation_hash.hexdigest()))
+
+    def format_startup_timings(self):
+        """Return a human-readable report of the time spent building this tax and benefit system."""
+        return u'\n'.join(
+            u'{:<25} {:8.3f} s'.format(step, duration)
+            for step, duration in self.startup_timings.iteritems()
+            )
+
     def prefill_cache(self):
         # Compute one "zone APL" variable, to pre-load CSV of "code INSEE commune" to "Zone APL".
         from .model.prestations import aides_logement
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""Bounded cache of the compact legislations of a tax and benefit system, keyed by instant."""
+
+
+import collections
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'max_size', 'size'])
+
+
+class CompactLegislationCache(object):
+    """
+    Least recently used cache of compact legislations, keyed by instant.
+
+    It replaces the unbounded dict `compact_legislation_by_instant_cache` of a tax and benefit system, and implements
+    the part of the dict interface used by OpenFisca-Core. As simulations ask their tax and benefit system for each
+    instant they don't know yet, it is shared by all the simulations built from this tax and benefit system, and by
+    the reforms which don't modify its legislation.
+    """
+
+    def __init__(self, max_size = 256):
+        assert max_size is None or max_size > 0, max_size
+        self.compact_legislation_by_instant = collections.OrderedDict()
+        self.hits = 0
+        self.max_size = max_size
+        self.misses = 0
+
+    def __contains__(self, instant):
+        return instant in self.compact_legislation_by_instant
+
+    def __getitem__(self, instant):
+        compact_legislation = self.get(instant)
+        if compact_legislation is None:
+            raise KeyError(instant)
+        return compact_legislation
+
+    def __len__(self):
+        return len(self.compact_legislation_by_instant)
+
+    def __setitem__(self, instant, compact_legislation):
+        compact_legislation_by_instant = self.compact_legislation_by_instant
+        compact_legislation_by_instant.pop(instant, None)
+        compact_legislation_by_instant[instant] = compact_legislation
+        if self.max_size is not None:
+            while len(compact_legislation_by_instant) > self.max_size:
+                compact_legislation_by_instant.popitem(last = False)
+
+    def clear(self):
+        self.compact_legislation_by_instant.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, instant, default = None):
+        compact_legislation_by_instant = self.compact_legislation_by_instant
+        compact_legislation = compact_legislation_by_instant.pop(instant, None)
+        if compact_legislation is None:
+            self.misses += 1
+            return default
+        # Move the instant to the end of the queue, as the most recently used.
+        compact_legislation_by_instant[instant] = compact_legislation
+        self.hits += 1
+        return compact_legislation
+
+    def info(self):
+        return CacheInfo(
+            hits = self.hits,
+            misses = self.misses,
+            max_size = self.max_size,
+            size = len(self.compact_legislation_by_instant),
+            )
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Mois dont la législation est identique, pour partager les calculs faits avec un mois en paramètre supplémentaire."""
+
+
+import weakref
+
+from openfisca_core.legislations import CompactNode
+from openfisca_core.taxscales import AbstractTaxScale
+
+
+# Empreintes des sous-arbres de la législation, par législation compacte puis par chemin.
+empreinte_by_chemin_by_legislation = weakref.WeakKeyDictionary()
+
+
+def empreinte(valeur):
+    """Représentation hashable d'un nœud de la législation compacte, indépendante de son instant."""
+    if isinstance(valeur, CompactNode):
+        return tuple(sorted(
+            (key, empreinte(child))
+            for key, child in valeur.__dict__.iteritems()
+            if key not in ('instant', 'name')
+            ))
+    if isinstance(valeur, AbstractTaxScale):
+        return (valeur.__class__.__name__, ) + tuple(sorted(
+            (key, empreinte(child))
+            for key, child in valeur.__dict__.iteritems()
+            if key != 'name'
+            ))
+    if isinstance(valeur, (list, tuple)):
+        return tuple(empreinte(child) for child in valeur)
+    if isinstance(valeur, dict):
+        return tuple(sorted((key, empreinte(child)) for key, child in valeur.iteritems()))
+    return valeur
+
+
+def get_empreinte(legislation, chemin):
+    empreinte_by_chemin = empreinte_by_chemin_by_legislation.get(legislation)
+    if empreinte_by_chemin is None:
+        empreinte_by_chemin = empreinte_by_chemin_by_legislation[legislation] = {}
+    if chemin not in empreinte_by_chemin:
+        node = legislation
+        for key in chemin.split(u'.'):
+            node = node[key]
+        empreinte_by_chemin[chemin] = empreinte(node)
+    return empreinte_by_chemin[chemin]
+
+
+def premier_mois_equivalent(simulation, mois, chemins):
+    """
+    Renvoie le premier mois de l'année de `mois` pour lequel les sous-arbres `chemins` de la législation sont
+    identiques à ceux de `mois`.
+
+    Une variable qui ne dépend de son paramètre supplémentaire `mois` que par legislation(mois) (restreinte à
+    `chemins`) et par mois.this_year peut ainsi être calculée une seule fois pour tous les mois équivalents.
+    """
+    empreintes = [get_empreinte(simulation.legislation_at(mois.start), chemin) for chemin in chemins]
+    candidat = mois.this_year.first_month
+    while candidat.start < mois.start:
+        legislation = simulation.legislation_at(candidat.start)
+        if all(
+                get_empreinte(legislation, chemin) == empreinte_mois
+                for chemin, empreinte_mois in zip(chemins, empreintes)
+                ):
+            return candidat
+        candidat = candidat.offset(1)
+    return mois
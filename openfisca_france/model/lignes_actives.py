@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+Évaluation des formules sur les seules lignes actives de leur entité.
+
+Une réduction ou un crédit d'impôt est nul pour les foyers dont toutes les cases de la déclaration qui le déterminent
+sont vides. Sa formule déclare ces cases (décorateur sur_lignes_actives) : elle n'est alors évaluée que sur les foyers
+ayant au moins une de ces cases renseignée, et le résultat est replacé dans un tableau nul pour les autres.
+"""
+
+
+import functools
+
+import numpy as np
+
+
+# Au-delà de cette proportion de lignes actives, la formule est évaluée sur toute l'entité.
+PROPORTION_MAX_ACTIFS = 0.5
+
+
+class EvaluationRestreinteImpossible(Exception):
+    """La formule lit une variable qui ne peut pas être restreinte aux lignes actives."""
+    pass
+
+
+class SimulationRestreinte(object):
+    """Simulation dont les variables de l'entité `entity` sont restreintes aux lignes `lignes`."""
+
+    def __init__(self, simulation, entity, lignes):
+        self.simulation = simulation
+        self.entity = entity
+        self.lignes = lignes
+
+    def __getattr__(self, name):
+        raise EvaluationRestreinteImpossible(name)
+
+    def calculate(self, column_name, period, **parameters):
+        self.get_holder_restreint(column_name)
+        return self.simulation.calculate(column_name, period, **parameters)[self.lignes]
+
+    def calculate_add(self, column_name, period, **parameters):
+        self.get_holder_restreint(column_name)
+        return self.simulation.calculate_add(column_name, period, **parameters)[self.lignes]
+
+    def get_holder_restreint(self, column_name):
+        holder = self.simulation.get_or_new_holder(column_name)
+        if holder.entity is not self.entity:
+            raise EvaluationRestreinteImpossible(column_name)
+        return holder
+
+    def legislation_at(self, *args, **kwargs):
+        return self.simulation.legislation_at(*args, **kwargs)
+
+
+def get_indices_hors_defaut(simulation, variable_name, period):
+    """Indices triés des entités dont la variable diffère de sa valeur par défaut."""
+    holder = simulation.get_or_new_holder(variable_name)
+    array = simulation.calculate(variable_name, period)
+    if array.strides == (0, ):
+        # Tableau par défaut partagé
+        return np.empty(0, dtype = np.int32)
+    return np.flatnonzero(array != holder.column.default)
+
+
+def get_lignes_actives(simulation, variables_names, period):
+    indices = [get_indices_hors_defaut(simulation, variable_name, period) for variable_name in variables_names]
+    return np.unique(np.concatenate(indices)) if indices else np.empty(0, dtype = np.int32)
+
+
+def sur_lignes_actives(*cases):
+    """
+    Restreint une fonction de formule aux lignes dont au moins une des cases `cases` (variables saisies de son entité)
+    n'a pas sa valeur par défaut. La fonction doit renvoyer 0 pour toutes les autres lignes.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def function_sur_lignes_actives(self, simulation, period):
+            holder = self.holder
+            entity = holder.entity
+            lignes = get_lignes_actives(simulation, cases, period)
+            if len(lignes) > PROPORTION_MAX_ACTIFS * entity.count:
+                return function(self, simulation, period)
+            array = self.zeros(dtype = holder.column.dtype)
+            if len(lignes) == 0:
+                return array
+            try:
+                array[lignes] = function(self, SimulationRestreinte(simulation, entity, lignes), period)
+            except EvaluationRestreinteImpossible:
+                return function(self, simulation, period)
+            return array
+
+        function_sur_lignes_actives.cases = cases
+        return function_sur_lignes_actives
+
+    return decorator
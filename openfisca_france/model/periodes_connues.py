@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""Index des périodes pour lesquelles la valeur d'une variable est connue (saisie ou déjà calculée)."""
+
+
+import bisect
+import weakref
+
+
+# Index, par holder : un holder n'appartient qu'à une simulation.
+index_periodes_by_holder = weakref.WeakKeyDictionary()
+
+unit_weights = {
+    u'day': 1,
+    u'month': 2,
+    u'year': 3,
+    }
+
+
+def cle_periode(period):
+    """Clé de tri équivalente à periods.compare_period_start puis periods.compare_period_size."""
+    unit, start, size = period
+    return (start, unit_weights[unit], size)
+
+
+class IndexPeriodes(object):
+    """
+    Périodes connues d'un holder, triées par jour du mois puis par début et taille.
+
+    L'index est mis à jour à partir des périodes qu'on lui signale comme en cours de calcul ; il n'est reconstruit
+    entièrement que si le dictionnaire des valeurs du holder a été remplacé ou complété par ailleurs (saisie, etc.).
+    """
+
+    def __init__(self):
+        self.array_by_period = None
+        self.cles_by_jour = {}
+        self.periodes = set()
+        self.periodes_en_attente = []
+        self.nb_reconstructions = 0
+
+    def ajouter(self, period):
+        self.periodes.add(period)
+        bisect.insort(self.cles_by_jour.setdefault(period.start.day, []), (cle_periode(period), period))
+
+    def reconstruire(self, array_by_period):
+        self.array_by_period = array_by_period
+        self.cles_by_jour = {}
+        self.periodes = set()
+        self.periodes_en_attente = []
+        for period in array_by_period or ():
+            self.ajouter(period)
+        self.nb_reconstructions += 1
+
+    def synchroniser(self, array_by_period):
+        if array_by_period is not self.array_by_period:
+            self.reconstruire(array_by_period)
+            return
+        for period in self.periodes_en_attente:
+            if period not in self.periodes and period in array_by_period:
+                self.ajouter(period)
+        self.periodes_en_attente = []
+        # Le holder ne permet pas de retirer une période : ses clés ne peuvent qu'être ajoutées (mise en cache, saisie)
+        # ou toutes supprimées (delete_arrays, qui remplace le dictionnaire). Comparer les tailles suffit donc.
+        if array_by_period is not None and len(array_by_period) != len(self.periodes):
+            self.reconstruire(array_by_period)
+
+    def derniere_periode(self, jour):
+        """Renvoie la dernière période connue (par début, puis par taille) qui commence au jour `jour` d'un mois."""
+        cles = self.cles_by_jour.get(jour)
+        return cles[-1][1] if cles else None
+
+
+def get_derniere_valeur_connue(holder, period):
+    """
+    Renvoie la dernière période connue (triée par début puis par taille) commençant le même jour du mois que
+    `period`, avec la valeur associée, ou (None, None).
+
+    `period` est considérée comme en cours de calcul : elle sera ajoutée à l'index lors de l'appel suivant, une fois
+    mise en cache.
+    """
+    index = index_periodes_by_holder.get(holder)
+    if index is None:
+        index = index_periodes_by_holder[holder] = IndexPeriodes()
+    array_by_period = holder._array_by_period
+    index.synchroniser(array_by_period)
+    index.periodes_en_attente.append(period)
+    derniere_periode = index.derniere_periode(period.start.day)
+    if derniere_periode is None:
+        return None, None
+    return derniere_periode, array_by_period[derniere_periode]
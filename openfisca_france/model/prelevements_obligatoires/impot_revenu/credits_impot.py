@@ -7,6 +7,7 @@ import logging
 from numpy import around, logical_or as or_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.lignes_actives import sur_lignes_actives
 
 log = logging.getLogger(__name__)
 
@@ -266,6 +267,7 @@ class accult(Variable):
     start_date = date(2002, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7uo')
     def function(self, simulation, period):
         '''
         Acquisition de biens culturels (case 7UO)
@@ -286,6 +288,7 @@ class acqgpl(Variable):
     stop_date = date(2007, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7up', 'f7uq')
     def function(self, simulation, period):
         '''
         Crédit d'impôt pour dépense d'acquisition ou de transformation d'un véhicule GPL ou mixte
@@ -306,6 +309,7 @@ class aidmob(Variable):
     stop_date = date(2008, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f1ar', 'f1br', 'f1cr', 'f1dr', 'f1er')
     def function(self, simulation, period):
         '''
         Crédit d'impôt aide à la mobilité
@@ -328,6 +332,7 @@ class aidper(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2003, 12, 31))
+    @sur_lignes_actives('f7wi')
     def function_20020101_20031231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -352,6 +357,7 @@ class aidper(DatedVariable):
         return P.taux_wi * min_(f7wi, max0)
 
     @dated_function(start = date(2004, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7wi', 'f7wj')
     def function_20040101_20051231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -379,6 +385,7 @@ class aidper(DatedVariable):
                     P.taux_wi * min_(f7wi, max1))
 
     @dated_function(start = date(2006, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7wi', 'f7wj')
     def function_20060101_20091231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -401,6 +408,7 @@ class aidper(DatedVariable):
                     P.taux_wi * min_(f7wi, max1))
 
     @dated_function(start = date(2010, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7sf', 'f7wi', 'f7wj', 'f7wl')
     def function_20100101_20111231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -424,6 +432,7 @@ class aidper(DatedVariable):
         return P.taux_wl * min_(f7wl+f7sf, max0) + P.taux_wj * min_(f7wj, max1)  + P.taux_wi * min_(f7wi, max2)
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7wi', 'f7wj', 'f7wl', 'f7wr')
     def function_20120101_20121231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -449,6 +458,7 @@ class aidper(DatedVariable):
                 P.taux_wj * min_(f7wj, max1)  + P.taux_wi * min_(f7wi, max2))
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7wj', 'f7wl', 'f7wr')
     def function_20130101_20131231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -473,6 +483,7 @@ class aidper(DatedVariable):
                 min_(f7wj, max1))
 
     @dated_function(start = date(2014, 1, 1))
+    @sur_lignes_actives('f7wj', 'f7wl', 'f7wr')
     def function_2014__(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de l’aide aux personnes
@@ -506,6 +517,7 @@ class assloy(Variable):
     start_date = date(2005, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f4bf')
     def function(self, simulation, period):
         '''
         Crédit d’impôt primes d’assurance pour loyers impayés (case 4BF)
@@ -524,6 +536,7 @@ class autent(Variable):
     start_date = date(2009, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f8uy')
     def function(self, simulation, period):
         '''
         Auto-entrepreneur : versements d’impôt sur le revenu (case 8UY)
@@ -541,6 +554,7 @@ class ci_garext(Variable):
     start_date = date(2005, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7ga', 'f7gb', 'f7gc', 'f7ge', 'f7gf', 'f7gg')
     def function(self, simulation, period):
         '''
         Frais de garde des enfants à l’extérieur du domicile (cases 7GA à 7GC et 7GE à 7GG)
@@ -594,6 +608,7 @@ class creimp(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2002, 12, 31))
+    @sur_lignes_actives('f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8td_2002_2005', 'f8te', 'f8tf', 'f8tg', 'f8th')
     def function_20020101_20021231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -608,6 +623,9 @@ class creimp(DatedVariable):
         return (f2ab + f8ta + f8tb + f8tc + f8td_2002_2005 + f8te - f8tf + f8tg + f8th)
 
     @dated_function(start = date(2003, 1, 1), stop = date(2003, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8td_2002_2005', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp',
+        )
     def function_20030101_20031231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -624,6 +642,10 @@ class creimp(DatedVariable):
         return (f2ab + f8ta + f8tb + f8tc + f8td_2002_2005 + f8te - f8tf + f8tg + f8th + f8to - f8tp)
 
     @dated_function(start = date(2004, 1, 1), stop = date(2004, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8td_2002_2005', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz',
+        'f8uz',
+        )
     def function_20040101_20041231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -642,6 +664,10 @@ class creimp(DatedVariable):
         return (f2ab + f8ta + f8tb + f8tc + f8td_2002_2005 + f8te - f8tf + f8tg + f8th + f8to - f8tp + f8tz + f8uz)
 
     @dated_function(start = date(2005, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8td_2002_2005', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz',
+        'f8uz', 'f8wa', 'f8wb', 'f8wc', 'f8we',
+        )
     def function_20050101_20051231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -665,6 +691,10 @@ class creimp(DatedVariable):
                 f8wb + f8wc + f8we)
 
     @dated_function(start = date(2006, 1, 1), stop = date(2006, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz', 'f8uz', 'f8wa', 'f8wb',
+        'f8wc', 'f8wd', 'f8we', 'f8wr', 'f8ws', 'f8wt', 'f8wu',
+        )
     def function_20060101_20061231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -692,6 +722,10 @@ class creimp(DatedVariable):
                 f8wd + f8we + f8wr + f8ws + f8wt + f8wu)
 
     @dated_function(start = date(2007, 1, 1), stop = date(2007, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz', 'f8uz', 'f8wa', 'f8wb',
+        'f8wc', 'f8wd', 'f8wr', 'f8ws', 'f8wt', 'f8wu', 'f8wv', 'f8wx',
+        )
     def function_20070101_20071231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -720,6 +754,10 @@ class creimp(DatedVariable):
                 f8wd + f8wr + f8ws + f8wt + f8wu + f8wv + f8wx)
 
     @dated_function(start = date(2008, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz', 'f8uz', 'f8wa', 'f8wb',
+        'f8wc', 'f8wd', 'f8we', 'f8wr', 'f8ws', 'f8wt', 'f8wu', 'f8wv', 'f8wx',
+        )
     def function_20080101_20081231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -749,6 +787,10 @@ class creimp(DatedVariable):
                 f8wd + f8wr + f8ws + f8wt + f8wu + f8wv + f8wx)
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz', 'f8uz', 'f8wa', 'f8wb', 'f8wd',
+        'f8we', 'f8wr', 'f8ws', 'f8wt', 'f8wu', 'f8wv', 'f8wx',
+        )
     def function_20090101_20091231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -776,6 +818,10 @@ class creimp(DatedVariable):
                 f8we + f8wr + f8ws + f8wt + f8wu + f8wv + f8wx)
 
     @dated_function(start = date(2010, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8tz', 'f8uz', 'f8wa', 'f8wb',
+        'f8wd', 'f8we', 'f8wr', 'f8wt', 'f8wu', 'f8wv',
+        )
     def function_20100101_20111231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -802,6 +848,10 @@ class creimp(DatedVariable):
         f8we + f8wr + f8wt + f8wu + f8wv)
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f8ta', 'f8tb', 'f8tc', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8to', 'f8tp', 'f8ts', 'f8tz', 'f8uz', 'f8wa',
+        'f8wb', 'f8wd', 'f8we', 'f8wr', 'f8wt', 'f8wu', 'f8wv',
+        )
     def function_20120101_20121231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f8ta = simulation.calculate('f8ta', period)
@@ -829,6 +879,10 @@ class creimp(DatedVariable):
                 f8wd + f8we + f8wr + f8wt + f8wu + f8wv)
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f2ab', 'f2ck', 'f8ta', 'f8tb', 'f8tc', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8tl', 'f8to', 'f8tp', 'f8ts', 'f8tz',
+        'f8uw', 'f8uz', 'f8wa', 'f8wb', 'f8wc', 'f8wd', 'f8we', 'f8wr', 'f8wt', 'f8wu',
+        )
     def function_20130101_20131231(self, simulation, period):
         f2ab = simulation.calculate('f2ab', period)
         f2ck = simulation.calculate('f2ck', period)
@@ -865,6 +919,7 @@ class direpa(Variable):
     label = u"Crédit d’impôt directive « épargne »"
     definition_period = YEAR
 
+    @sur_lignes_actives('f2bg')
     def function(self, simulation, period):
         '''
         Crédit d’impôt directive « épargne » (case 2BG)
@@ -883,6 +938,7 @@ class divide(Variable):
     stop_date = date(2009, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f2dc', 'f2gr')
     def function(self, simulation, period):
         '''
         Crédit d'impôt dividendes
@@ -905,6 +961,7 @@ class drbail(Variable):
     label = u"Crédit d’impôt représentatif de la taxe additionnelle au droit de bail"
     definition_period = YEAR
 
+    @sur_lignes_actives('f4tq')
     def function(self, simulation, period):
         '''
         Crédit d’impôt représentatif de la taxe additionnelle au droit de bail (case 4TQ)
@@ -924,6 +981,7 @@ class inthab(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2007, 1, 1), stop = date(2007, 12, 31))
+    @sur_lignes_actives('f7uh')
     def function_20070101_20071231(self, simulation, period):
         '''
         Crédit d’impôt intérêts des emprunts pour l’habitation principale (cases 7UH)
@@ -943,6 +1001,7 @@ class inthab(DatedVariable):
         return P.taux1 * min_(max0, f7uh)
 
     @dated_function(start = date(2008, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7vy', 'f7vz')
     def function_20080101_20081231(self, simulation, period):
         '''
         Crédit d’impôt intérêts des emprunts pour l’habitation principale (cases 7VX, 7VY et 7VZ)
@@ -968,6 +1027,7 @@ class inthab(DatedVariable):
                     P.taux3 * min_(f7vz, max1))
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7vx', 'f7vy', 'f7vz')
     def function_20090101_20091231(self, simulation, period):
         '''
         Crédit d’impôt intérêts des emprunts pour l’habitation principale (cases 7VX, 7VY et 7VZ)
@@ -996,6 +1056,7 @@ class inthab(DatedVariable):
                     P.taux3 * min_(f7vz, max2))
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7vw', 'f7vx', 'f7vy', 'f7vz')
     def function_20100101_20101231(self, simulation, period):
         '''
         Crédit d’impôt intérêts des emprunts pour l’habitation principale (cases 7VW, 7VX, 7VY et 7VZ)
@@ -1027,6 +1088,7 @@ class inthab(DatedVariable):
                     P.taux3 * min_(f7vz, max3))
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7vu', 'f7vv', 'f7vw', 'f7vx', 'f7vy', 'f7vz')
     def function_20110101_20111231(self, simulation, period):
         '''
         Crédit d’impôt intérêts des emprunts pour l’habitation principale (cases 7VW, 7VX, 7VY et 7VZ)
@@ -1064,6 +1126,7 @@ class inthab(DatedVariable):
                     P.taux5 * min_(f7vv, max5))
 
     @dated_function(start = date(2012, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7vt', 'f7vu', 'f7vv', 'f7vw', 'f7vx', 'f7vy', 'f7vz')
     def function_20120101_20131231(self, simulation, period):
         '''
         Crédit d’impôt intérêts des emprunts pour l’habitation principale (cases 7VW, 7VX, 7VY et 7VZ)
@@ -1171,6 +1234,7 @@ class mecena(Variable):
     start_date = date(2003, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7us')
     def function(self, simulation, period):
         '''
         Mécénat d'entreprise (case 7US)
@@ -1189,6 +1253,7 @@ class percvm(Variable):
     stop_date = date(2010, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f3vv_end_2010')
     def function(self, simulation, period):
         '''
         Crédit d’impôt pertes sur cessions de valeurs mobilières (3VV)
@@ -1207,6 +1272,7 @@ class preetu(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2005, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7uk')
     def function_20050101_20051231(self, simulation, period):
         '''
         Crédit d’impôt pour souscription de prêts étudiants (cases 7UK, 7VO et 7TD)
@@ -1220,6 +1286,7 @@ class preetu(DatedVariable):
         return P.taux * min_(f7uk, P.max)
 
     @dated_function(start = date(2006, 1, 1), stop = date(2007, 12, 31))
+    @sur_lignes_actives('f7uk', 'f7vo')
     def function_20060101_20071231(self, simulation, period):
         '''
         Crédit d’impôt pour souscription de prêts étudiants (cases 7UK, 7VO et 7TD)
@@ -1235,6 +1302,7 @@ class preetu(DatedVariable):
         return P.taux * min_(f7uk, max1)
 
     @dated_function(start = date(2008, 1, 1))
+    @sur_lignes_actives('f7td', 'f7uk', 'f7vo')
     def function_20080101_20151231(self, simulation, period):
         '''
         Crédit d’impôt pour souscription de prêts étudiants (cases 7UK, 7VO et 7TD)
@@ -1258,6 +1326,7 @@ class prlire(Variable):
     stop_date = date(2013, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f2ch', 'f2dh')
     def function(self, simulation, period):
         '''
         Prélèvement libératoire à restituer (case 2DH)
@@ -1280,6 +1349,7 @@ class quaenv(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2005, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7wf', 'f7wg', 'f7wh')
     def function_20050101_20051231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de la qualité environnementale
@@ -1305,6 +1375,7 @@ class quaenv(DatedVariable):
             P.taux_wh * min_(f7wh, max2))
 
     @dated_function(start = date(2006, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7wf', 'f7wg', 'f7wh', 'f7wq')
     def function_20060101_20081231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de la qualité environnementale
@@ -1332,6 +1403,7 @@ class quaenv(DatedVariable):
                     P.taux_wq * min_(f7wq, max3))
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7sb', 'f7sc', 'f7sd', 'f7se', 'f7wf', 'f7wg', 'f7wh', 'f7wk', 'f7wq')
     def function_20090101_20091231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de la qualité environnementale
@@ -1376,6 +1448,7 @@ class quaenv(DatedVariable):
                     P.taux_wq * min_(f7wq, max8))
 
     @dated_function(start = date(2010, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7sb', 'f7sd', 'f7se', 'f7sh', 'f7wf', 'f7wg', 'f7wh', 'f7wk', 'f7wq')
     def function_20100101_20111231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de la qualité environnementale
@@ -1419,6 +1492,11 @@ class quaenv(DatedVariable):
             )
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f7sd', 'f7se', 'f7sf', 'f7sg', 'f7sh', 'f7si', 'f7sj', 'f7sk', 'f7sl', 'f7sm', 'f7sn', 'f7so', 'f7sp', 'f7sq',
+        'f7sr', 'f7ss', 'f7st', 'f7su', 'f7sv', 'f7sw', 'f7sz', 'f7tt', 'f7tu', 'f7tv', 'f7tw', 'f7tx', 'f7ty', 'f7wc',
+        'f7wg', 'f7wh', 'f7wk',
+        )
     def function_20120101_20121231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de la qualité environnementale
@@ -1501,6 +1579,10 @@ class quaenv(DatedVariable):
         return not_(f7wg) * or_(not_(f7we), (rfr < 30000)) * (montant + collectif) + f7sz
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7sd', 'f7se', 'f7sf', 'f7sg', 'f7sh', 'f7si', 'f7sj', 'f7sk', 'f7sl', 'f7sm', 'f7sn', 'f7so', 'f7sp', 'f7sq',
+        'f7sr', 'f7ss', 'f7st', 'f7su', 'f7sv', 'f7sw', 'f7sz', 'f7wc', 'f7wg', 'f7wh', 'f7wk',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Crédits d’impôt pour dépenses en faveur de la qualité environnementale
@@ -1620,6 +1702,7 @@ class saldom2(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2007, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7db', 'f7dl')
     def function_20070101_20081231(self, simulation, period):
         '''
         Crédit d’impôt emploi d’un salarié à domicile (cases 7DB, 7DG)
@@ -1644,6 +1727,7 @@ class saldom2(DatedVariable):
         return P.taux * min_(f7db, maxEffectif)
 
     @dated_function(start = date(2009, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7db', 'f7dl')
     def function_20090101_20131231(self, simulation, period):
         '''
         Crédit d’impôt emploi d’un salarié à domicile (cases 7DB, 7DG)
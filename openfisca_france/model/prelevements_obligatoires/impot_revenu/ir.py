@@ -7,8 +7,8 @@ import logging
 
 from numpy import datetime64, logical_and as and_, logical_or as or_, logical_xor as xor_, round as round_
 
-from openfisca_core import periods
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.periodes_connues import get_derniere_valeur_connue
 
 
 log = logging.getLogger(__name__)
@@ -63,12 +63,6 @@ class age(Variable):
     set_input = set_input_dispatch_by_period
 
     def function(self, simulation, period):
-        def compare_periods(x, y):
-            a = x[0]
-            b = y[0]
-
-            return periods.compare_period_start(a, b) or periods.compare_period_size(a, b)
-
         has_birth = simulation.get_or_new_holder('date_naissance')._array is not None
         if not has_birth:
             has_age_en_mois = bool(simulation.get_or_new_holder('age_en_mois')._array_by_period)
@@ -76,14 +70,12 @@ class age(Variable):
                 return simulation.calculate('age_en_mois', period) // 12
 
             # If age is known at the same day of another year, compute the new age from it.
-            holder = self.holder
             start = period.start
-            if holder._array_by_period is not None:
-                for last_period, last_array in sorted(holder._array_by_period.iteritems(), cmp = compare_periods, reverse = True):
-                    last_start = last_period.start
-                    if last_start.day == start.day:
-                        return last_array + int((start.year - last_start.year) +
-                            (start.month - last_start.month) / 12)
+            last_period, last_array = get_derniere_valeur_connue(self.holder, period)
+            if last_period is not None:
+                last_start = last_period.start
+                return last_array + int((start.year - last_start.year) +
+                    (start.month - last_start.month) / 12)
 
         date_naissance = simulation.calculate('date_naissance', period)
         return (datetime64(period.start) - date_naissance).astype('timedelta64[Y]')
@@ -97,21 +89,12 @@ class age_en_mois(Variable):
     definition_period = MONTH
 
     def function(self, simulation, period):
-
-        def compare_periods(x, y):
-            a = x[0]
-            b = y[0]
-
-            return periods.compare_period_start(a, b) or periods.compare_period_size(a, b)
-
         # If age_en_mois is known at the same day of another month, compute the new age_en_mois from it.
-        holder = self.holder
         start = period.start
-        if holder._array_by_period is not None:
-            for last_period, last_array in sorted(holder._array_by_period.iteritems(), cmp = compare_periods, reverse = True):
-                last_start = last_period.start
-                if last_start.day == start.day:
-                    return last_array + ((start.year - last_start.year) * 12 + (start.month - last_start.month))
+        last_period, last_array = get_derniere_valeur_connue(self.holder, period)
+        if last_period is not None:
+            last_start = last_period.start
+            return last_array + ((start.year - last_start.year) * 12 + (start.month - last_start.month))
 
         has_birth = simulation.get_or_new_holder('date_naissance')._array is not None
         if not has_birth:
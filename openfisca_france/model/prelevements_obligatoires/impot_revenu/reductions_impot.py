@@ -7,6 +7,7 @@ import logging
 from numpy import around
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.lignes_actives import sur_lignes_actives
 
 
 log = logging.getLogger(__name__)
@@ -451,6 +452,7 @@ class adhcga(Variable):
     label = u"adhcga"
     definition_period = YEAR
 
+    @sur_lignes_actives('f7ff', 'f7fg')
     def function(self, simulation, period):
         '''
         Frais de comptabilité et d'adhésion à un CGA ou AA
@@ -471,6 +473,7 @@ class assvie(Variable):
     stop_date = date(2004, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7gw', 'f7gx', 'f7gy')
     def function(self, simulation, period):
         '''
         Assurance-vie (cases GW, GX et GY de la 2042)
@@ -493,6 +496,7 @@ class cappme(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2002, 12, 31))
+    @sur_lignes_actives('f7cf')
     def function_20020101_20021231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -508,6 +512,7 @@ class cappme(DatedVariable):
         return P.taux * min_(base, seuil)
 
     @dated_function(start = date(2003, 1, 1), stop = date(2003, 12, 31))
+    @sur_lignes_actives('f7cf', 'f7cl')
     def function_20030101_20031231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -524,6 +529,7 @@ class cappme(DatedVariable):
         return P.taux * min_(base, seuil)
 
     @dated_function(start = date(2004, 1, 1), stop = date(2004, 12, 31))
+    @sur_lignes_actives('f7cf', 'f7cl', 'f7cm')
     def function_20040101_20041231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -541,6 +547,7 @@ class cappme(DatedVariable):
         return P.taux * min_(base, seuil)
 
     @dated_function(start = date(2005, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7cf', 'f7cl', 'f7cm', 'f7cn')
     def function_20050101_20081231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -559,6 +566,7 @@ class cappme(DatedVariable):
         return P.taux * min_(base, seuil)
 
     @dated_function(start = date(2009, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7cf', 'f7cl', 'f7cm', 'f7cn', 'f7cu')
     def function_20090101_20101231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -579,6 +587,7 @@ class cappme(DatedVariable):
         return P.taux * min_(base, seuil)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7cf', 'f7cl', 'f7cm', 'f7cn', 'f7cq', 'f7cu')
     def function_20110101_20111231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -600,6 +609,7 @@ class cappme(DatedVariable):
         return max_(P.taux25 * min_(base, seuil), P.taux * min_(max0, f7cf + f7cu))
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7cf', 'f7cl', 'f7cm', 'f7cn', 'f7cq', 'f7cu')
     def function_20120101_20121231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -624,6 +634,7 @@ class cappme(DatedVariable):
                 mini(f7cu, seuil2, seuil1))
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7cc', 'f7cf', 'f7cl', 'f7cm', 'f7cn', 'f7cq', 'f7cu')
     def function_20130101_20131231(self, simulation, period):
         '''
         Souscriptions au capital des PME
@@ -691,6 +702,7 @@ class creaen(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2006, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7fy', 'f7gy')
     def function_20060101_20081231(self, simulation, period):
         '''
         Aide aux créateurs et repreneurs d'entreprises
@@ -704,6 +716,7 @@ class creaen(DatedVariable):
         return (P.base * f7fy + P.hand * f7gy)
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7fy', 'f7gy', 'f7hy', 'f7iy', 'f7jy', 'f7ky')
     def function_20090101_20091231(self, simulation, period):
         '''
         Aide aux créateurs et repreneurs d'entreprises
@@ -722,6 +735,7 @@ class creaen(DatedVariable):
                     P.hand * ((f7ky + f7gy) + f7iy / 2))
 
     @dated_function(start = date(2010, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7fy', 'f7gy', 'f7hy', 'f7iy', 'f7jy', 'f7ky', 'f7ly', 'f7my')
     def function_20100101_20111231(self, simulation, period):
         '''
         Aide aux créateurs et repreneurs d'entreprises
@@ -742,6 +756,7 @@ class creaen(DatedVariable):
                     P.hand * ((f7ky + f7gy) + (f7iy + f7my) / 2))
 
     @dated_function(start = date(2012, 1, 1), stop = date(2014, 12, 31))
+    @sur_lignes_actives('f7ly', 'f7my')
     def function_20120101_20141231(self, simulation, period):
         '''
         Aide aux créateurs et repreneurs d'entreprises
@@ -763,6 +778,7 @@ class deffor(Variable):
     start_date = date(2006, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7uc')
     def function(self, simulation, period):
         '''
         Défense des forêts contre l'incendie
@@ -780,6 +796,7 @@ class daepad(Variable):
     label = u"daepad"
     definition_period = YEAR
 
+    @sur_lignes_actives('f7cd', 'f7ce')
     def function(self, simulation, period):
         '''
         Dépenses d'accueil dans un établissement pour personnes âgées dépendantes
@@ -799,6 +816,7 @@ class dfppce(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2003, 12, 31))
+    @sur_lignes_actives('f7uf')
     def function_20020101_20031231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -814,6 +832,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2004, 1, 1), stop = date(2004, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7xs')
     def function_20040101_20041231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -830,6 +849,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2005, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7xs', 'f7xt')
     def function_20050101_20051231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -847,6 +867,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2006, 1, 1), stop = date(2006, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7xs', 'f7xt', 'f7xu')
     def function_20060101_20061231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -865,6 +886,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2007, 1, 1), stop = date(2007, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7xs', 'f7xt', 'f7xu', 'f7xw')
     def function_20070101_20071231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -884,6 +906,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2008, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7xs', 'f7xt', 'f7xu', 'f7xw', 'f7xy')
     def function_20080101_20101231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -904,6 +927,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7vc', 'f7xs', 'f7xt', 'f7xu', 'f7xw', 'f7xy')
     def function_20110101_20111231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -924,6 +948,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7vc', 'f7xs', 'f7xt', 'f7xu', 'f7xw', 'f7xy')
     def function_20120101_20121231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -944,6 +969,7 @@ class dfppce(DatedVariable):
         return P.taux_dons_oeuvres * min_(base, max1)
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7uf', 'f7uh', 'f7vc', 'f7xs', 'f7xt', 'f7xu', 'f7xw', 'f7xy')
     def function_20130101_20131231(self, simulation, period):
         '''
         Dons aux autres oeuvres et dons effectués pour le financement des partis
@@ -978,6 +1004,7 @@ class doment(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2005, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7oz', 'f7pz', 'f7qz', 'f7rz', 'f7ur')
     def function_20050101_20051231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -991,6 +1018,7 @@ class doment(DatedVariable):
         return  f7ur + f7oz + f7pz + f7qz + f7rz
 
     @dated_function(start = date(2006, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7oz', 'f7pz', 'f7qz', 'f7rz', 'f7sz', 'f7ur')
     def function_20060101_20081231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -1005,6 +1033,7 @@ class doment(DatedVariable):
         return  f7ur + f7oz + f7pz + f7qz + f7rz + f7sz
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7oz', 'f7pz', 'f7qe', 'f7qf', 'f7qg', 'f7qh', 'f7qi', 'f7qj', 'f7qz', 'f7rz', 'f7sz')
     def function_20090101_20091231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -1024,6 +1053,10 @@ class doment(DatedVariable):
         return  f7oz + f7pz + f7qz + f7rz + f7sz + f7qe + f7qf + f7qg + f7qh + f7qi + f7qj
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives(
+        'f7ks', 'f7lg', 'f7ls', 'f7ma', 'f7mm', 'f7oz', 'f7pz', 'f7qe', 'f7qf', 'f7qg', 'f7qh', 'f7qi', 'f7qj', 'f7qo',
+        'f7qp', 'f7qq', 'f7qr', 'f7qs', 'f7qz', 'f7rz',
+        )
     def function_20100101_20101231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -1053,6 +1086,11 @@ class doment(DatedVariable):
                     f7mm + f7ma + f7lg + f7ks + f7ls)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives(
+        'f7ks', 'f7kt', 'f7ku', 'f7lg', 'f7lh', 'f7li', 'f7ma', 'f7mb', 'f7mc', 'f7mm', 'f7mn', 'f7oz', 'f7pa', 'f7pb',
+        'f7pd', 'f7pe', 'f7pf', 'f7ph', 'f7pi', 'f7pj', 'f7pl', 'f7pz', 'f7qe', 'f7qf', 'f7qg', 'f7qh', 'f7qi', 'f7qo',
+        'f7qp', 'f7qq', 'f7qr', 'f7qv', 'f7qz',
+        )
     def function_20110101_20111231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -1096,6 +1134,13 @@ class doment(DatedVariable):
                     f7qp + f7qq + f7qr + f7qe + f7qv)
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f7ks', 'f7kt', 'f7ku', 'f7lg', 'f7lh', 'f7li', 'f7ma', 'f7mb', 'f7mc', 'f7mm', 'f7mn', 'f7nu', 'f7nv', 'f7nw',
+        'f7ny', 'f7pa', 'f7pb', 'f7pd', 'f7pe', 'f7pf', 'f7ph', 'f7pi', 'f7pj', 'f7pl', 'f7pm', 'f7pn', 'f7po', 'f7pp',
+        'f7pr', 'f7ps', 'f7pt', 'f7pu', 'f7pw', 'f7px', 'f7py', 'f7pz', 'f7qe', 'f7qf', 'f7qg', 'f7qi', 'f7qo', 'f7qp',
+        'f7qr', 'f7qv', 'f7qz', 'f7rg', 'f7ri', 'f7rj', 'f7rk', 'f7rl', 'f7rm', 'f7ro', 'f7rp', 'f7rq', 'f7rr', 'f7rt',
+        'f7ru', 'f7rv', 'f7rw', 'f7rx', 'f7ry',
+        )
     def function_20120101_20121231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -1168,6 +1213,14 @@ class doment(DatedVariable):
                     f7rg + f7ri + f7rj + f7rk + f7rl + f7rm + f7ro + f7rp + f7rq + f7rr + f7rt + f7ru + f7rv + f7rw)
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7ks', 'f7kt', 'f7ku', 'f7lg', 'f7lh', 'f7li', 'f7ma', 'f7mb', 'f7mc', 'f7mm', 'f7mn', 'f7nu', 'f7nv', 'f7nw',
+        'f7ny', 'f7pa', 'f7pb', 'f7pd', 'f7pe', 'f7pf', 'f7ph', 'f7pi', 'f7pj', 'f7pl', 'f7pm', 'f7pn', 'f7po', 'f7pp',
+        'f7pr', 'f7ps', 'f7pt', 'f7pu', 'f7pw', 'f7px', 'f7py', 'f7qe', 'f7qf', 'f7qg', 'f7qi', 'f7qo', 'f7qp', 'f7qr',
+        'f7qv', 'f7qz', 'f7rg', 'f7ri', 'f7rj', 'f7rk', 'f7rl', 'f7rm', 'f7ro', 'f7rp', 'f7rq', 'f7rr', 'f7rt', 'f7ru',
+        'f7rv', 'f7rw', 'f7ry', 'fhsa', 'fhsb', 'fhsc', 'fhse', 'fhsf', 'fhsg', 'fhsh', 'fhsj', 'fhsk', 'fhsl', 'fhsm',
+        'fhso', 'fhsp', 'fhsq', 'fhsr', 'fhst', 'fhsu', 'fhsv', 'fhsw', 'fhsz', 'fhta', 'fhtb', 'fhtd',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissements dans les DOM-TOM dans le cadre d'une entrepise.
@@ -1277,6 +1330,7 @@ class domlog(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2002, 12, 31))
+    @sur_lignes_actives('f7ua', 'f7ub', 'f7uc', 'f7uj')
     def function_20020101_20021231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1292,6 +1346,7 @@ class domlog(DatedVariable):
         return P.taux1 * f7uj + P.taux2 * (f7ua + f7ub + f7uc)
 
     @dated_function(start = date(2003, 1, 1), stop = date(2004, 12, 31))
+    @sur_lignes_actives('f7ua', 'f7ub', 'f7uc', 'f7ui', 'f7uj')
     def function_20030101_20041231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1308,6 +1363,7 @@ class domlog(DatedVariable):
         return P.taux1 * f7uj + P.taux2 * (f7ua + f7ub + f7uc) + f7ui
 
     @dated_function(start = date(2005, 1, 1), stop = date(2007, 12, 31))
+    @sur_lignes_actives('f7ua', 'f7ub', 'f7uc', 'f7ui', 'f7uj')
     def function_20050101_20071231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1324,6 +1380,7 @@ class domlog(DatedVariable):
         return P.taux1 * f7uj + P.taux2 * (f7ua + f7ub) + f7ui
 
     @dated_function(start = date(2008, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7ui')
     def function_20080101_20081231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1334,6 +1391,7 @@ class domlog(DatedVariable):
         return f7ui
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7qb', 'f7qc', 'f7qd', 'f7qk')
     def function_20090101_20091231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1347,6 +1405,7 @@ class domlog(DatedVariable):
         return f7qb + f7qc + f7qd + f7qk / 2
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7qb', 'f7qc', 'f7qd', 'f7ql', 'f7qm', 'f7qt')
     def function_20100101_20101231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1363,6 +1422,9 @@ class domlog(DatedVariable):
         return f7qb + f7qc + f7qd + f7ql + f7qt + f7qm
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives(
+        'f7oa', 'f7ob', 'f7oc', 'f7oh', 'f7oi', 'f7oj', 'f7ok', 'f7qb', 'f7qc', 'f7qd', 'f7ql', 'f7qm', 'f7qt',
+        )
     def function_20110101_20111231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1386,6 +1448,10 @@ class domlog(DatedVariable):
         return f7qb + f7qc + f7qd + f7ql + f7qm + f7qt + f7oa + f7ob + f7oc + f7oh + f7oi + f7oj + f7ok
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f7oa', 'f7ob', 'f7oc', 'f7oh', 'f7oi', 'f7oj', 'f7ok', 'f7ol', 'f7om', 'f7on', 'f7oo', 'f7op', 'f7oq', 'f7or',
+        'f7os', 'f7ot', 'f7ou', 'f7ov', 'f7ow', 'f7qb', 'f7qc', 'f7qd', 'f7ql', 'f7qm', 'f7qt',
+        )
     def function_20120101_20121231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1422,6 +1488,11 @@ class domlog(DatedVariable):
                     f7on + f7oo + f7op + f7oq + f7or + f7os + f7ot + f7ou + f7ov + f7ow)
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7oa', 'f7ob', 'f7oc', 'f7oh', 'f7oi', 'f7oj', 'f7ok', 'f7ol', 'f7om', 'f7on', 'f7oo', 'f7op', 'f7oq', 'f7or',
+        'f7os', 'f7ot', 'f7ou', 'f7ov', 'f7ow', 'f7qb', 'f7qc', 'f7qd', 'f7ql', 'f7qm', 'f7qt', 'fhod', 'fhoe', 'fhof',
+        'fhog', 'fhox', 'fhoy', 'fhoz',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissements OUTRE-MER dans le secteur du logement et autres secteurs d’activité
@@ -1476,6 +1547,7 @@ class domsoc(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2010, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7kg', 'f7kh', 'f7ki', 'f7qj', 'f7qk', 'f7qn', 'f7qs', 'f7qu', 'f7qw', 'f7qx')
     def function_20100101_20121231(self, simulation, period):
         '''
         Investissements outre-mer dans le logement social (déclaration n°2042 IOM)
@@ -1496,6 +1568,9 @@ class domsoc(DatedVariable):
         return  f7qn + f7qk + f7qu + f7kg + f7kh + f7ki + f7qj + f7qs + f7qw + f7qx
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7kg', 'f7kh', 'f7ki', 'f7qj', 'f7qk', 'f7qn', 'f7qs', 'f7qu', 'f7qw', 'f7qx', 'fhra', 'fhrb', 'fhrc', 'fhrd',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissements outre-mer dans le logement social (déclaration n°2042 IOM)
@@ -1527,6 +1602,7 @@ class donapd(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7ud')
     def function_20020101_20101231(self, simulation, period):
         '''
         Dons effectués à  des organises d'aide aux personnes en difficulté (2002-2010)
@@ -1537,6 +1613,7 @@ class donapd(DatedVariable):
         return P.taux * min_(f7ud, P.max)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7ud', 'f7va')
     def function_20110101_20131231(self, simulation, period):
         '''
         Dons effectués à  des organises d'aide aux personnes en difficulté (2011-2013)
@@ -1555,6 +1632,7 @@ class duflot(Variable):
     start_date = date(2013, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7gh', 'f7gi')
     def function(self, simulation, period):
         '''
         Investissements locatifs interméiaires (loi Duflot)
@@ -1577,6 +1655,7 @@ class ecodev(Variable):
     stop_date = date(2009, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7uh')
     def function(self, simulation, period):
         '''
         Sommes versées sur un compte épargne codéveloppement (case 7UH)
@@ -1595,6 +1674,7 @@ class ecpess(Variable):
     label = u"ecpess"
     definition_period = YEAR
 
+    @sur_lignes_actives('f7ea', 'f7eb', 'f7ec', 'f7ed', 'f7ef', 'f7eg')
     def function(self, simulation, period):
         '''
         Réduction d'impôt au titre des enfants à charge poursuivant leurs études secondaires ou supérieures
@@ -1619,6 +1699,7 @@ class garext(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2002, 12, 31))
+    @sur_lignes_actives('f7ga', 'f7gb', 'f7gc')
     def function_20020101_20021231(self, simulation, period):
         '''
         Frais de garde des enfants à l’extérieur du domicile (cases GA, GB, GC de la 2042)
@@ -1635,6 +1716,7 @@ class garext(DatedVariable):
         return P.taux * (min_(f7ga, max1) + min_(f7gb, max1) + min_(f7gc, max1))
 
     @dated_function(start = date(2003, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7ga', 'f7gb', 'f7gc', 'f7ge', 'f7gf', 'f7gg')
     def function_20030101_20051231(self, simulation, period):
         '''
         Frais de garde des enfants à l’extérieur du domicile (cases GA, GB, GC de la 2042)
@@ -1667,6 +1749,7 @@ class intagr(Variable):
     start_date = date(2005, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7um')
     def function(self, simulation, period):
         '''
         Intérêts pour paiement différé accordé aux agriculteurs
@@ -1688,6 +1771,7 @@ class intcon(Variable):
     stop_date = date(2005, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7uh')
     def function(self, simulation, period):
         '''
         Intérêts des prêts à la consommation (case UH)
@@ -1708,6 +1792,7 @@ class intemp(Variable):
     stop_date = date(2003, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7wg')
     def function(self, simulation, period):
         '''
         Intérêts d'emprunts
@@ -1728,6 +1813,7 @@ class invfor(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2005, 12, 31))
+    @sur_lignes_actives('f7un')
     def function_20020101_20051231(self, simulation, period):
         '''
         Investissements forestiers pour 2002-2005
@@ -1741,6 +1827,7 @@ class invfor(DatedVariable):
         return P.taux * min_(f7un, seuil)
 
     @dated_function(start = date(2006, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7un')
     def function_20060101_20081231(self, simulation, period):
         '''
         Investissements forestiers pour 2006-2008
@@ -1752,6 +1839,7 @@ class invfor(DatedVariable):
         return P.taux * f7un
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7un', 'f7up', 'f7uq')
     def function_20090101_20091231(self, simulation, period):
         '''
         Investissements forestiers pour 2009
@@ -1767,6 +1855,7 @@ class invfor(DatedVariable):
                 min_(f7uq, P.iforges_seuil * (maries_ou_pacses + 1)))
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7te', 'f7un', 'f7up', 'f7uq', 'f7uu')
     def function_20100101_20101231(self, simulation, period):
         '''
         Investissements forestiers pour 2010
@@ -1786,6 +1875,7 @@ class invfor(DatedVariable):
             min_(f7uq, P.iforges_seuil * (maries_ou_pacses + 1))))
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7te', 'f7tf', 'f7ul', 'f7un', 'f7up', 'f7uq', 'f7uu', 'f7uv')
     def function_20110101_20111231(self, simulation, period):
         '''
         Investissements forestiers pour 2011 cf. 2041 GK
@@ -1812,6 +1902,7 @@ class invfor(DatedVariable):
             P.taux_ass * min_(f7ul, P.ifortra_seuil * (maries_ou_pacses + 1)))
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7te', 'f7tf', 'f7tg', 'f7ul', 'f7un', 'f7up', 'f7uq', 'f7uu', 'f7uv', 'f7uw')
     def function_20120101_20121231(self, simulation, period):
         '''
         Investissements forestiers pour 2012 cf. 2041 GK
@@ -1842,6 +1933,7 @@ class invfor(DatedVariable):
             P.taux_ass * min_(f7ul, P.ifortra_seuil * (maries_ou_pacses + 1)))
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7te', 'f7tf', 'f7tg', 'f7th', 'f7ul', 'f7un', 'f7up', 'f7uq', 'f7uu', 'f7uv', 'f7uw', 'f7ux')
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissements forestiers pour 2013 cf. 2041 GK
@@ -1883,6 +1975,7 @@ class invlst(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2004, 1, 1), stop = date(2004, 12, 31))
+    @sur_lignes_actives('f7xc', 'f7xf', 'f7xg', 'f7xh', 'f7xi', 'f7xj', 'f7xk', 'f7xl', 'f7xm', 'f7xn', 'f7xo')
     def function_20040101_20041231(self, simulation, period):
         '''
         Investissements locatifs dans le secteur touristique
@@ -1926,6 +2019,7 @@ class invlst(DatedVariable):
         return around(xc + xd + xe + xf + xg + xh + xi + xj + xk + xl + xm + xn + xo)
 
     @dated_function(start = date(2005, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7xc', 'f7xf', 'f7xg', 'f7xh', 'f7xi', 'f7xj', 'f7xk', 'f7xl', 'f7xm', 'f7xn', 'f7xo')
     def function_20050101_20101231(self, simulation, period):
         '''
         Investissements locatifs dans le secteur touristique
@@ -1969,6 +2063,10 @@ class invlst(DatedVariable):
         return around(xc + xd + xe + xf + xg + xh + xi + xj + xk + xl + xm + xn + xo)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives(
+        'f7xa', 'f7xb', 'f7xc', 'f7xf', 'f7xg', 'f7xh', 'f7xi', 'f7xj', 'f7xk', 'f7xl', 'f7xm', 'f7xn', 'f7xo', 'f7xp',
+        'f7xq', 'f7xr',
+        )
     def function_20110101_20111231(self, simulation, period):
         '''
         Investissements locatifs dans le secteur touristique
@@ -2013,6 +2111,10 @@ class invlst(DatedVariable):
         return around(xc + xa + xg + xb + xh + xi + xj + xl + xo)
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f7xa', 'f7xb', 'f7xc', 'f7xf', 'f7xg', 'f7xh', 'f7xi', 'f7xj', 'f7xk', 'f7xl', 'f7xm', 'f7xn', 'f7xo', 'f7xp',
+        'f7xq', 'f7xr', 'f7xv', 'f7xx', 'f7xz',
+        )
     def function_20120101_20121231(self, simulation, period):
         '''
         Investissements locatifs dans le secteur touristique
@@ -2062,6 +2164,9 @@ class invlst(DatedVariable):
         return around(xc + xa + xg + xx + xb + xz + xh + xi + xj + xl + xo)
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7uy', 'f7uz', 'f7xf', 'f7xi', 'f7xj', 'f7xk', 'f7xm', 'f7xn', 'f7xo', 'f7xp', 'f7xq', 'f7xr', 'f7xv',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissements locatifs dans le secteur touristique
@@ -2099,6 +2204,7 @@ class invrev(Variable):
     stop_date = date(2003, 12, 31)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7gs', 'f7gt', 'f7gu', 'f7gv', 'f7xg')
     def function(self, simulation, period):
         '''
         Investissements locatifs dans les résidences de tourisme situées dans une zone de
@@ -2127,6 +2233,7 @@ class locmeu(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7ij')
     def function_20090101_20091231(self, simulation, period):
         '''
         Investissement en vue de la location meublée non professionnelle dans certains établissements ou résidences
@@ -2138,6 +2245,7 @@ class locmeu(DatedVariable):
         return P.taux * min_(P.max, f7ij) / 9
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7ij', 'f7ik', 'f7il', 'f7im', 'f7is')
     def function_20100101_20101231(self, simulation, period):
         '''
         Investissement en vue de la location meublée non professionnelle dans certains établissements ou résidences
@@ -2153,6 +2261,9 @@ class locmeu(DatedVariable):
         return ((min_(P.max, max_(f7ij, f7il)) + min_(P.max, f7im)) / 9 + f7ik) * P.taux + f7is
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives(
+        'f7ij', 'f7ik', 'f7il', 'f7im', 'f7in', 'f7io', 'f7ip', 'f7iq', 'f7ir', 'f7is', 'f7it', 'f7iu', 'f7iv', 'f7iw',
+        )
     def function_20110101_20111231(self, simulation, period):
         '''
         Investissement en vue de la location meublée non professionnelle dans certains établissements ou résidences
@@ -2181,6 +2292,10 @@ class locmeu(DatedVariable):
             f7is + f7iu + f7it)
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f7ia', 'f7ib', 'f7ic', 'f7id', 'f7ie', 'f7if', 'f7ig', 'f7ih', 'f7ij', 'f7ik', 'f7il', 'f7im', 'f7in', 'f7io',
+        'f7ip', 'f7iq', 'f7ir', 'f7is', 'f7it', 'f7iu', 'f7iv', 'f7iw', 'f7ix', 'f7iz',
+        )
     def function_20120101_20121231(self, simulation, period):
         '''
         Investissement en vue de la location meublée non professionnelle dans certains établissements ou résidences
@@ -2221,6 +2336,11 @@ class locmeu(DatedVariable):
             f7ia + f7ib + f7ic + f7ih + f7is + f7iu + f7it + f7ix + f7iz)
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7ia', 'f7ib', 'f7ic', 'f7id', 'f7ie', 'f7if', 'f7ig', 'f7ih', 'f7ij', 'f7ik', 'f7il', 'f7im', 'f7in', 'f7io',
+        'f7ip', 'f7iq', 'f7ir', 'f7is', 'f7it', 'f7iu', 'f7iv', 'f7iw', 'f7ix', 'f7iy', 'f7iz', 'f7jc', 'f7ji', 'f7js',
+        'f7jt', 'f7ju', 'f7jv', 'f7jw', 'f7jx', 'f7jy',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissement en vue de la location meublée non professionnelle dans certains établissements ou résidences
@@ -2280,6 +2400,7 @@ class mohist(Variable):
     start_date = date(2008, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7nz')
     def function(self, simulation, period):
         '''
         Travaux de conservation et de restauration d’objets classés monuments historiques (case NZ)
@@ -2298,6 +2419,7 @@ class patnat(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7ka')
     def function_20100101_20101231(self, simulation, period):
         '''
         Dépenses de protections du patrimoine naturel (case 7KA)
@@ -2310,6 +2432,7 @@ class patnat(DatedVariable):
         return P.taux * min_(f7ka, max1)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7ka', 'f7kb')
     def function_20110101_20111231(self, simulation, period):
         '''
         Dépenses de protections du patrimoine naturel (case 7KA, 7KB)
@@ -2323,6 +2446,7 @@ class patnat(DatedVariable):
         return P.taux * min_(f7ka, max1) + f7kb
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7ka', 'f7kb', 'f7kc')
     def function_20120101_20121231(self, simulation, period):
         '''
         Dépenses de protections du patrimoine naturel (case 7KA, 7KB, 7KC)
@@ -2337,6 +2461,7 @@ class patnat(DatedVariable):
         return P.taux * min_(f7ka, max1) + f7kb + f7kc
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7ka', 'f7kb', 'f7kc', 'f7kd')
     def function_20130101_20131231(self, simulation, period):
         '''
         Dépenses de protections du patrimoine naturel (case 7KA, 7KB, 7KC)
@@ -2358,6 +2483,7 @@ class prcomp(Variable):
     label = u"Prestations compensatoires"
     definition_period = YEAR
 
+    @sur_lignes_actives('f7wm', 'f7wn', 'f7wo', 'f7wp')
     def function(self, simulation, period):
         '''
         Prestations compensatoires
@@ -2411,6 +2537,7 @@ class repsoc(Variable):
     start_date = date(2003, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7fh')
     def function(self, simulation, period):
         '''
         Intérèts d'emprunts pour reprises de société
@@ -2431,6 +2558,7 @@ class resimm(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2009, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7ra', 'f7rb')
     def function_20090101_20101231(self, simulation, period):
         '''
         Travaux de restauration immobilière (cases 7RA et 7RB)
@@ -2445,6 +2573,7 @@ class resimm(DatedVariable):
         return P.taux_rb * min_(f7rb, max1) + P.taux_ra * min_(f7ra, max2)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives('f7ra', 'f7rb', 'f7rc', 'f7rd')
     def function_20110101_20111231(self, simulation, period):
         '''
         Travaux de restauration immobilière (cases 7RA, 7RB, 7RC, 7RD)
@@ -2464,6 +2593,7 @@ class resimm(DatedVariable):
                 P.taux_ra * min_(f7ra, max4))
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives('f7ra', 'f7rb', 'f7rc', 'f7rd', 'f7re', 'f7rf')
     def function_20120101_20121231(self, simulation, period):
         '''
         Travaux de restauration immobilière (cases 7RA, 7RB, 7RC, 7RD, 7RE, 7RF)
@@ -2486,6 +2616,7 @@ class resimm(DatedVariable):
                 P.taux_ra * min_(f7ra, max4) + P.taux_re * min_(f7re, max5))
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7ra', 'f7rb', 'f7rc', 'f7rd', 'f7re', 'f7rf', 'f7sx', 'f7sy')
     def function_20130101_20131231(self, simulation, period):
         '''
         Travaux de restauration immobilière (cases 7RA, 7RB, 7RC, 7RD, 7RE, 7RF, 7SX, 7SY)
@@ -2516,6 +2647,7 @@ class rsceha(Variable):
     label = u"rsceha"
     definition_period = YEAR
 
+    @sur_lignes_actives('f7gz')
     def function(self, simulation, period):
         '''
         Rentes de survie et contrats d'épargne handicap
@@ -2537,6 +2669,7 @@ class saldom(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2004, 12, 31))
+    @sur_lignes_actives('f7df')
     def function_20020101_20041231(self, simulation, period):
         '''
         Sommes versées pour l'emploi d'un salariés à  domicile
@@ -2552,6 +2685,7 @@ class saldom(DatedVariable):
         return P.taux * min_(f7df, max1)
 
     @dated_function(start = date(2005, 1, 1), stop = date(2006, 12, 31))
+    @sur_lignes_actives('f7df', 'f7dl')
     def function_20050101_20061231(self, simulation, period):
         '''
         Sommes versées pour l'emploi d'un salariés à  domicile
@@ -2573,6 +2707,7 @@ class saldom(DatedVariable):
         return P.taux * min_(f7df, max1)
 
     @dated_function(start = date(2007, 1, 1), stop = date(2008, 12, 31))
+    @sur_lignes_actives('f7db', 'f7df', 'f7dl')
     def function_20070101_20081231(self, simulation, period):
         '''
         Sommes versées pour l'emploi d'un salariés à  domicile
@@ -2596,6 +2731,7 @@ class saldom(DatedVariable):
         return P.taux * min_(f7df, max1)
 
     @dated_function(start = date(2009, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7db', 'f7df', 'f7dl')
     def function_20090101_20131231(self, simulation, period):
         '''
         Sommes versées pour l'emploi d'un salariés à  domicile
@@ -2628,6 +2764,7 @@ class scelli(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2009, 1, 1), stop = date(2009, 12, 31))
+    @sur_lignes_actives('f7hj', 'f7hk')
     def function_20090101_20091231(self, simulation, period):
         '''
         Investissements locatif neufs : Dispositif Scellier (cases 7HJ et 7HK)
@@ -2640,6 +2777,7 @@ class scelli(DatedVariable):
         return max_(P.taux1 * min_(P.max, f7hj), P.taux2 * min_(P.max, f7hk)) / 9
 
     @dated_function(start = date(2010, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7hj', 'f7hk', 'f7hl', 'f7hm', 'f7hn', 'f7ho', 'f7hr', 'f7hs', 'f7la')
     def function_20100101_20101231(self, simulation, period):
         '''
         Investissements locatif neufs : Dispositif Scellier
@@ -2668,6 +2806,11 @@ class scelli(DatedVariable):
                 f7la)
 
     @dated_function(start = date(2011, 1, 1), stop = date(2011, 12, 31))
+    @sur_lignes_actives(
+        'f7hj', 'f7hk', 'f7hl', 'f7hm', 'f7hn', 'f7ho', 'f7hr', 'f7hs', 'f7ht', 'f7hu', 'f7hv', 'f7hw', 'f7hx', 'f7hz',
+        'f7la', 'f7lb', 'f7lc', 'f7na', 'f7nb', 'f7nc', 'f7nd', 'f7ne', 'f7nf', 'f7ng', 'f7nh', 'f7ni', 'f7nj', 'f7nk',
+        'f7nl', 'f7nm', 'f7nn', 'f7no', 'f7np', 'f7nq', 'f7nr', 'f7ns', 'f7nt',
+        )
     def function_20110101_20111231(self, simulation, period):
         '''
         Investissements locatif neufs : Dispositif Scellier
@@ -2730,6 +2873,13 @@ class scelli(DatedVariable):
                 )
 
     @dated_function(start = date(2012, 1, 1), stop = date(2012, 12, 31))
+    @sur_lignes_actives(
+        'f7ha', 'f7hb', 'f7hd', 'f7he', 'f7hf', 'f7hg', 'f7hh', 'f7hj', 'f7hk', 'f7hl', 'f7hm', 'f7hn', 'f7ho', 'f7hr',
+        'f7hs', 'f7ht', 'f7hu', 'f7hv', 'f7hw', 'f7hx', 'f7hz', 'f7ja', 'f7jb', 'f7jd', 'f7je', 'f7jf', 'f7jg', 'f7jh',
+        'f7jj', 'f7jk', 'f7jl', 'f7jm', 'f7jn', 'f7jo', 'f7jp', 'f7jq', 'f7jr', 'f7la', 'f7lb', 'f7lc', 'f7ld', 'f7le',
+        'f7lf', 'f7na', 'f7nb', 'f7nc', 'f7nd', 'f7ne', 'f7nf', 'f7ng', 'f7nh', 'f7ni', 'f7nj', 'f7nk', 'f7nl', 'f7nm',
+        'f7nn', 'f7no', 'f7np', 'f7nq', 'f7nr', 'f7ns', 'f7nt',
+        )
     def function_20120101_20121231(self, simulation, period):
         '''
         Investissements locatif neufs : Dispositif Scellier
@@ -2825,6 +2975,14 @@ class scelli(DatedVariable):
                 )
 
     @dated_function(start = date(2013, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives(
+        'f7fa', 'f7fb', 'f7fc', 'f7fd', 'f7gj', 'f7gk', 'f7gl', 'f7gp', 'f7gs', 'f7gt', 'f7gu', 'f7gv', 'f7gw', 'f7gx',
+        'f7ha', 'f7hb', 'f7hd', 'f7he', 'f7hf', 'f7hg', 'f7hh', 'f7hj', 'f7hk', 'f7hl', 'f7hm', 'f7hn', 'f7ho', 'f7hr',
+        'f7hs', 'f7ht', 'f7hu', 'f7hv', 'f7hw', 'f7hx', 'f7hz', 'f7ja', 'f7jb', 'f7jd', 'f7je', 'f7jf', 'f7jg', 'f7jh',
+        'f7jj', 'f7jk', 'f7jl', 'f7jm', 'f7jn', 'f7jo', 'f7jp', 'f7jq', 'f7jr', 'f7la', 'f7lb', 'f7lc', 'f7ld', 'f7le',
+        'f7lf', 'f7lm', 'f7ls', 'f7lz', 'f7mg', 'f7na', 'f7nb', 'f7nc', 'f7nd', 'f7ne', 'f7nf', 'f7ng', 'f7nh', 'f7ni',
+        'f7nj', 'f7nk', 'f7nl', 'f7nm', 'f7nn', 'f7no', 'f7np', 'f7nq', 'f7nr', 'f7ns', 'f7nt',
+        )
     def function_20130101_20131231(self, simulation, period):
         '''
         Investissements locatif neufs : Dispositif Scellier
@@ -2946,6 +3104,7 @@ class sofica(Variable):
     start_date = date(2006, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7fn', 'f7gn')
     def function(self, simulation, period):
         '''
         Souscriptions au capital de SOFICA
@@ -2969,6 +3128,7 @@ class sofipe(Variable):
     stop_date = date(2011, 1, 1)
     definition_period = YEAR
 
+    @sur_lignes_actives('f7gs')
     def function(self, simulation, period):
         """
         Souscription au capital d’une SOFIPECHE (case 7GS)
@@ -2991,6 +3151,7 @@ class spfcpi(DatedVariable):
     definition_period = YEAR
 
     @dated_function(start = date(2002, 1, 1), stop = date(2002, 12, 31))
+    @sur_lignes_actives('f7gq')
     def function_20020101_20021231(self, simulation, period):
         '''
         Souscription de parts de fonds communs de placement dans l'innovation,
@@ -3006,6 +3167,7 @@ class spfcpi(DatedVariable):
         return P.taux1 * min_(f7gq, max1)
 
     @dated_function(start = date(2003, 1, 1), stop = date(2006, 12, 31))
+    @sur_lignes_actives('f7fq', 'f7gq')
     def function_20030101_20061231(self, simulation, period):
         '''
         Souscription de parts de fonds communs de placement dans l'innovation,
@@ -3022,6 +3184,7 @@ class spfcpi(DatedVariable):
         return (P.taux1 * min_(f7gq, max1) + P.taux1 * min_(f7fq, max1))
 
     @dated_function(start = date(2007, 1, 1), stop = date(2010, 12, 31))
+    @sur_lignes_actives('f7fm', 'f7fq', 'f7gq')
     def function_20070101_20101231(self, simulation, period):
         '''
         Souscription de parts de fonds communs de placement dans l'innovation,
@@ -3041,6 +3204,7 @@ class spfcpi(DatedVariable):
                     P.taux2 * min_(f7fm, max1))
 
     @dated_function(start = date(2011, 1, 1), stop = date(2013, 12, 31))
+    @sur_lignes_actives('f7fl', 'f7fm', 'f7fq', 'f7gq')
     def function_20110101_20131231(self, simulation, period):
         '''
         Souscription de parts de fonds communs de placement dans l'innovation,
@@ -3060,6 +3224,7 @@ class spfcpi(DatedVariable):
                 P.taux3 * min_(f7fl, max1))
 
     @dated_function(start = date(2014, 1, 1), stop = date(2014, 12, 31))
+    @sur_lignes_actives('f7gq')
     def function_20140101_20141231(self, simulation, period):
         '''
         Souscription de parts de fonds communs de placement dans l'innovation,
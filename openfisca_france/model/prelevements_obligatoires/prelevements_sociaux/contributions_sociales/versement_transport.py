@@ -1,13 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
+import logging
+import os
 
-
-from numpy import logical_or as or_, fromiter
+import numpy as np
+from numpy import logical_or as or_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
 from openfisca_france.france_taxbenefitsystem import COUNTRY_DIR
 
+
+log = logging.getLogger(__name__)
+
+
 class taux_versement_transport(Variable):
     column = FloatCol
     entity = Individu
@@ -21,15 +28,8 @@ class taux_versement_transport(Variable):
 
         seuil_effectif = simulation.legislation_at(period.start).cotsoc.versement_transport.seuil_effectif
 
-        preload_taux_versement_transport()
         public = (categorie_salarie >= 2)
-        taux_versement_transport = fromiter(
-            (
-                get_taux_versement_transport(code_commune, period)
-                for code_commune in depcom_entreprise
-                ),
-            dtype = 'float',
-            )
+        taux_versement_transport = get_taux_versement_transport(depcom_entreprise, period)
         # "L'entreprise emploie-t-elle plus de 9 ou 10 salariés dans le périmètre de l'Autorité organisatrice de transport
         # (AOT) suivante ou syndicat mixte de transport (SMT)"
         return taux_versement_transport * or_(effectif_entreprise >= seuil_effectif, public) / 100
@@ -48,34 +48,119 @@ class versement_transport(Variable):
         return cotisation
 
 
+# Compiled rate table
+#
+# The JSON table is compiled once into two files stored in a cache directory (not in the package, which may be
+# read-only), named after the SHA-1 of the JSON source so that a new table never reuses the files of an old one:
+# - taux-<sha1>.npy: the rate (AOT + SMT, in %) of each commune for each effective-date interval, one row per interval,
+#   loaded as a memory map so that worker processes share its pages;
+# - taux_index-<sha1>.npz: the sorted commune codes and the sorted effective dates.
+# Row 0 of the rate matrix holds the rates before the first effective date (i.e. zeros).
+# Each file is written to a temporary file renamed when complete, the index last: a process which finds the index
+# always finds a complete rate matrix.
 
-# File loading and parsing -> global table_versement_transport
-
-def preload_taux_versement_transport():
-    if not 'table_versement_transport' in globals():
-        global table_versement_transport
-        with open(COUNTRY_DIR + '/assets/versement_transport/taux.json') as data_file:
-            table_versement_transport = json.load(data_file)
+TAUX_JSON_PATH = os.path.join(COUNTRY_DIR, 'assets', 'versement_transport', 'taux.json')
 
+communes_versement_transport = None
+dates_versement_transport = None
+taux_by_date_by_commune_versement_transport = None
 
-def get_taux_versement_transport(code_commune, period):
-    instant = period.start
-    taux_commune = table_versement_transport.get(code_commune, None)
-    if taux_commune is None:
-        return 0.0 + 0.0
-    else:
-        aot = taux_commune.get('aot', None)
-        smt = taux_commune.get('smt', None)
-        return select_temporal_taux_versement_transport(aot, instant) + select_temporal_taux_versement_transport(smt, instant)
 
+def get_cache_dir():
+    """Directory of the compiled tables: $OPENFISCA_FRANCE_CACHE_DIR, or openfisca-france in the user cache."""
+    cache_dir = os.environ.get('OPENFISCA_FRANCE_CACHE_DIR')
+    if cache_dir:
+        return cache_dir
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+        'openfisca-france')
 
-def select_temporal_taux_versement_transport(rates, instant):
 
-        if rates is None:
-            return 0.0
-
-        taux = rates.get('taux')
-        for date in sorted(taux, reverse=True):
-            if str(instant) >= date:
-                return float(taux[date])
-        return 0.0
+def preload_taux_versement_transport():
+    global communes_versement_transport, dates_versement_transport, taux_by_date_by_commune_versement_transport
+    if taux_by_date_by_commune_versement_transport is not None:
+        return
+    communes_versement_transport, dates_versement_transport, taux_by_date_by_commune_versement_transport = \
+        load_taux_versement_transport(TAUX_JSON_PATH, get_cache_dir())
+
+
+def load_taux_versement_transport(json_path, cache_dir):
+    """
+    Return the (communes, dates, taux_by_date_by_commune) arrays of the JSON table, from their compiled files in
+    `cache_dir` when they exist, else compiled (and stored in `cache_dir` for the next processes).
+    """
+    with open(json_path, 'rb') as data_file:
+        source_hash = hashlib.sha1(data_file.read()).hexdigest()
+    npy_path = os.path.join(cache_dir, 'taux-{}.npy'.format(source_hash))
+    index_path = os.path.join(cache_dir, 'taux_index-{}.npz'.format(source_hash))
+    if os.path.exists(index_path):
+        index = np.load(index_path)
+        return index['communes'], index['dates'], np.load(npy_path, mmap_mode = 'r')
+
+    communes, dates, taux_by_date_by_commune = compile_taux_versement_transport(json_path)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        write_atomically(npy_path, lambda npy_file: np.save(npy_file, taux_by_date_by_commune))
+        write_atomically(index_path, lambda index_file: np.savez(index_file, communes = communes, dates = dates))
+    except (IOError, OSError):
+        log.warning(u'Unable to store compiled versement transport rates in {}. They will be compiled again by the '
+            u'next process.'.format(cache_dir))
+    return communes, dates, taux_by_date_by_commune
+
+
+def write_atomically(file_path, write):
+    temporary_file_path = '{}.{}.tmp'.format(file_path, os.getpid())
+    try:
+        with open(temporary_file_path, 'wb') as temporary_file:
+            write(temporary_file)
+        os.rename(temporary_file_path, file_path)
+    finally:
+        if os.path.exists(temporary_file_path):
+            os.remove(temporary_file_path)
+
+
+def compile_taux_versement_transport(json_path):
+    """Compile the JSON table into (communes, dates, taux_by_date_by_commune) arrays."""
+    with open(json_path) as data_file:
+        table_versement_transport = json.load(data_file)
+
+    communes = sorted(table_versement_transport)
+    dates = sorted(set(
+        date
+        for taux_commune in table_versement_transport.itervalues()
+        for key in ('aot', 'smt')
+        if taux_commune.get(key) is not None
+        for date in taux_commune[key]['taux']
+        ))
+    date_index_by_date = {date: index for index, date in enumerate(dates)}
+
+    # A rate set at a given date applies until the next date defined for the same AOT or SMT.
+    taux_by_date_by_commune = np.zeros((len(dates) + 1, len(communes)))
+    taux_by_date = np.empty(len(dates) + 1)
+    for commune_index, commune in enumerate(communes):
+        taux_commune = table_versement_transport[commune]
+        for key in ('aot', 'smt'):
+            rates = taux_commune.get(key)
+            if rates is None:
+                continue
+            taux_by_date.fill(0)
+            for date, taux in sorted(rates['taux'].iteritems()):
+                taux_by_date[date_index_by_date[date] + 1:] = float(taux)
+            taux_by_date_by_commune[:, commune_index] += taux_by_date
+    return (
+        np.array(communes, dtype = '|S5'),
+        np.array(dates, dtype = '|S10'),
+        taux_by_date_by_commune,
+        )
+
+
+def get_taux_versement_transport(depcom_entreprise, period):
+    """Return the rates (in %) of an array of communes, for the start of the given period."""
+    preload_taux_versement_transport()
+    taux_by_commune = taux_by_date_by_commune_versement_transport[
+        dates_versement_transport.searchsorted(str(period.start), side = 'right')
+        ]
+    depcom_entreprise = depcom_entreprise.astype(communes_versement_transport.dtype)
+    position = communes_versement_transport.searchsorted(depcom_entreprise)
+    position[position == len(communes_versement_transport)] = 0
+    return np.where(communes_versement_transport[position] == depcom_entreprise, taux_by_commune[position], 0.)
@@ -2,21 +2,37 @@
 
 from __future__ import division
 
-from functools import partial
 import logging
 
 from numpy import (
-    busday_count as original_busday_count, datetime64, logical_or as or_, logical_and as and_, timedelta64
+    busday_count, busdaycalendar, datetime64, flatnonzero, logical_or as or_, logical_and as and_, timedelta64,
+    where, zeros,
     )
 
 from openfisca_core import periods
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
 from openfisca_france.assets.holidays import holidays
+from openfisca_france.model.lignes_actives import EvaluationRestreinteImpossible, SimulationRestreinte
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    calculate_cumul_annuel
 
 
 log = logging.getLogger(__name__)
 
+# Calendrier des jours ouvrés (du lundi au vendredi, hors jours fériés français), construit une seule fois.
+calendrier_jours_ouvres = busdaycalendar(weekmask = '1111100', holidays = holidays)
+jours_ouvres_by_mois = {}
+
+
+def get_jours_ouvres_mois(debut_mois, fin_mois):
+    """Renvoie le nombre de jours ouvrés du mois, mis en cache pour chaque mois."""
+    jours_ouvres = jours_ouvres_by_mois.get(debut_mois)
+    if jours_ouvres is None:
+        jours_ouvres = jours_ouvres_by_mois[debut_mois] = busday_count(
+            debut_mois, fin_mois, busdaycal = calendrier_jours_ouvres)
+    return jours_ouvres
+
 
 class assiette_allegement(Variable):
     base_function = requested_period_added_value
@@ -70,25 +86,22 @@ class coefficient_proratisation(Variable):
         # http://www.gestiondelapaie.com/flux-paie/?1029-la-bonne-premiere-paye
 
         # Méthode numpy de calcul des jours travaillés
-        busday_count = partial(original_busday_count, holidays=holidays)  # @holidays : jours feriés français
-
         debut_mois = datetime64(period.start.offset('first-of', 'month'))
         fin_mois = datetime64(period.start.offset('last-of', 'month')) + timedelta64(1,
                                                                                      'D')  # busday ignores the last day
 
-        jours_ouvres_ce_mois = busday_count(
-            debut_mois,
-            fin_mois,
-            weekmask='1111100'
-        )
+        jours_ouvres_ce_mois = get_jours_ouvres_mois(debut_mois, fin_mois)
 
         mois_incomplet = or_(contrat_de_travail_debut > debut_mois, contrat_de_travail_fin < fin_mois)
         # jours travaillables sur l'intersection du contrat de travail et du mois en cours
-        jours_ouvres_ce_mois_incomplet = busday_count(
-            max_(contrat_de_travail_debut, debut_mois),
-            min_(contrat_de_travail_fin, fin_mois),
-            weekmask='1111100'
-        )
+        # Seuls les mois incomplets demandent un décompte : les autres ont tous les jours ouvrés du mois.
+        jours_ouvres_ce_mois_incomplet = self.zeros(dtype = jours_ouvres_ce_mois.dtype) + jours_ouvres_ce_mois
+        if mois_incomplet.any():
+            jours_ouvres_ce_mois_incomplet[mois_incomplet] = busday_count(
+                max_(contrat_de_travail_debut[mois_incomplet], debut_mois),
+                min_(contrat_de_travail_fin[mois_incomplet], fin_mois),
+                busdaycal = calendrier_jours_ouvres,
+                )
 
         duree_legale_mensuelle = 35 * 52 / 12  # ~151,67
 
@@ -428,17 +441,44 @@ def switch_on_allegement_mode(simulation, period, mode_recouvrement, variable_na
 
         Name of the computation method specific to the allegement
         should precisely be the variable name prefixed with 'compute_'
+
+        Each payment option is only computed for the individuals who use it: the progressive and anticipated
+        options sum the allegement over the previous months.
     """
     compute_function = globals()['compute_' + variable_name]
-    return switch(
-        mode_recouvrement,
-        {
-            0: compute_allegement_annuel(simulation, period, variable_name, compute_function),
-            1: compute_allegement_anticipe(simulation, period, variable_name, compute_function),
-            2: compute_allegement_progressif(simulation, period, variable_name, compute_function),
-        },
-    )
+    compute_allegement_by_mode = {
+        0: compute_allegement_annuel,
+        1: compute_allegement_anticipe,
+        2: compute_allegement_progressif,
+        }
+    holder = simulation.get_or_new_holder(variable_name)
+    allegement = zeros(len(mode_recouvrement), dtype = holder.column.dtype)
+    for mode, compute_allegement in sorted(compute_allegement_by_mode.iteritems()):
+        lignes = flatnonzero(mode_recouvrement == mode)
+        if len(lignes) == 0:
+            continue
+        if len(lignes) < len(mode_recouvrement):
+            simulation_restreinte = SimulationRestreinte(simulation, holder.entity, lignes)
+            try:
+                allegement[lignes] = compute_allegement(
+                    simulation_restreinte, period, variable_name, compute_function)
+                continue
+            except EvaluationRestreinteImpossible:
+                pass
+        allegement = where(
+            mode_recouvrement == mode,
+            compute_allegement(simulation, period, variable_name, compute_function),
+            allegement,
+            )
+    return allegement
+
 
+def calculate_cumul_annuel_sur_lignes(simulation, variable_name, period):
+    """Cumul annuel de la variable, restreint aux lignes de la simulation si elle est restreinte."""
+    if isinstance(simulation, SimulationRestreinte):
+        cumul = calculate_cumul_annuel(simulation.simulation, variable_name, period, max_nb_cycles = 1)
+        return cumul[simulation.lignes]
+    return calculate_cumul_annuel(simulation, variable_name, period, max_nb_cycles = 1)
 
 
 def compute_allegement_annuel(simulation, period, variable_name, compute_function):
@@ -452,9 +492,10 @@ def compute_allegement_anticipe(simulation, period, variable_name, compute_funct
     if period.start.month < 12:
         return compute_function(simulation, period.first_month)
     if period.start.month == 12:
-        cumul = simulation.calculate_add(
+        cumul = calculate_cumul_annuel_sur_lignes(
+            simulation,
             variable_name,
-            period.start.offset('first-of', 'year').period('month', 11), max_nb_cycles=1)
+            period.start.offset('first-of', 'year').period('month', 11))
         return compute_function(
             simulation, period.this_year
             ) - cumul
@@ -467,7 +508,7 @@ def compute_allegement_progressif(simulation, period, variable_name, compute_fun
     if period.start.month > 1:
         up_to_this_month = period.start.offset('first-of', 'year').period('month', period.start.month)
         up_to_previous_month = period.start.offset('first-of', 'year').period('month', period.start.month - 1)
-        cumul = simulation.calculate_add(variable_name, up_to_previous_month, max_nb_cycles=1)
+        cumul = calculate_cumul_annuel_sur_lignes(simulation, variable_name, up_to_previous_month)
         return compute_function(simulation, up_to_this_month) - cumul
 
 
@@ -1,7 +1,51 @@
 # -*- coding: utf-8 -*-
 
+import weakref
+
+from numpy import (finfo, float as np_float, inf, logical_and as and_, maximum as max_, minimum as min_,
+    round as round_, where, zeros)
+
+from openfisca_core import periods
+
 from openfisca_france.model.base import CATEGORIE_SALARIE
 
+
+# Barèmes empilés par catégorie de salarié, calculés une seule fois par noeud de législation compacte (donc par période)
+baremes_empiles_by_bareme_name_by_node = weakref.WeakKeyDictionary()
+
+
+def get_baremes_empiles(bareme_by_type_sal_name, bareme_name):
+    """
+    Renvoie les seuils et les taux du barème bareme_name de chaque catégorie de salarié, empilés dans deux matrices
+    (une ligne par catégorie).
+
+    Les barèmes sont complétés par des tranches vides (seuil infini, taux nul) pour avoir tous le même nombre de
+    tranches. Les catégories sans barème ont un taux nul, de même que la ligne supplémentaire (à l'indice
+    len(CATEGORIE_SALARIE)) utilisée pour les valeurs de categorie_salarie hors de l'énumération.
+    """
+    baremes_empiles_by_bareme_name = baremes_empiles_by_bareme_name_by_node.setdefault(bareme_by_type_sal_name, {})
+    baremes_empiles = baremes_empiles_by_bareme_name.get(bareme_name)
+    if baremes_empiles is None:
+        bareme_by_type_sal_index = {}
+        for type_sal_name, type_sal_index in CATEGORIE_SALARIE:
+            if type_sal_name not in bareme_by_type_sal_name:  # to deal with public_titulaire_militaire
+                continue
+            bareme = bareme_by_type_sal_name[type_sal_name].get(bareme_name)  # TODO; should have better warnings
+            if bareme is not None:
+                bareme_by_type_sal_index[type_sal_index] = bareme
+        nb_tranches = max(
+            [len(bareme_type_sal.thresholds) for bareme_type_sal in bareme_by_type_sal_index.itervalues()] or [1])
+        nb_categories = len(CATEGORIE_SALARIE) + 1
+        seuils = zeros((nb_categories, nb_tranches + 1)) + inf
+        seuils[:, 0] = 0
+        taux = zeros((nb_categories, nb_tranches))
+        for type_sal_index, bareme in bareme_by_type_sal_index.iteritems():
+            seuils[type_sal_index, :len(bareme.thresholds)] = bareme.thresholds
+            taux[type_sal_index, :len(bareme.rates)] = bareme.rates
+        baremes_empiles = baremes_empiles_by_bareme_name[bareme_name] = (seuils, taux)
+    return baremes_empiles
+
+
 def apply_bareme_for_relevant_type_sal(
         bareme_by_type_sal_name,
         bareme_name,
@@ -10,23 +54,40 @@ def apply_bareme_for_relevant_type_sal(
         plafond_securite_sociale,
         round_base_decimals = 2,
         ):
+    """
+    Applique à chaque individu le barème bareme_name de sa catégorie de salarié.
+
+    Au lieu de calculer le barème de chaque catégorie sur toute la population, les barèmes de toutes les catégories
+    sont empilés, et chaque individu est évalué en une seule passe sur les seuils de sa propre catégorie. Le résultat
+    est identique, tranche par tranche, à celui de MarginalRateTaxScale.calc.
+    """
     assert bareme_by_type_sal_name is not None
     assert bareme_name is not None
     assert categorie_salarie is not None
     assert base is not None
     assert plafond_securite_sociale is not None
-    def iter_cotisations():
-        for type_sal_name, type_sal_index in CATEGORIE_SALARIE:
-            if type_sal_name not in bareme_by_type_sal_name:  # to deal with public_titulaire_militaire
-                continue
-            bareme = bareme_by_type_sal_name[type_sal_name].get(bareme_name)  # TODO; should have better warnings
-            if bareme is not None:
-                yield bareme.calc(
-                    base * (categorie_salarie == type_sal_index),
-                    factor = plafond_securite_sociale,
-                    round_base_decimals = round_base_decimals,
-                    )
-    return - sum(iter_cotisations())
+    seuils, taux = get_baremes_empiles(bareme_by_type_sal_name, bareme_name)
+    if not taux.any():
+        return zeros(len(base))
+    # Les valeurs hors de l'énumération (par exemple une catégorie sommée sur plusieurs mois par calculate_add) ne
+    # correspondent à aucun barème.
+    categorie_salarie = where(
+        and_(categorie_salarie >= 0, categorie_salarie < len(CATEGORIE_SALARIE)),
+        categorie_salarie,
+        len(CATEGORIE_SALARIE),
+        )
+    seuils = seuils[categorie_salarie]
+    taux = taux[categorie_salarie]
+    # finfo(float).eps is used to avoid nan = 0 * inf creation
+    facteur = plafond_securite_sociale + zeros(len(base)) + finfo(np_float).eps
+    seuils = seuils * facteur[:, None]
+    if round_base_decimals is not None:
+        seuils = round_(seuils, round_base_decimals)
+    assiettes_tranches = max_(min_(base[:, None], seuils[:, 1:]) - seuils[:, :-1], 0)
+    if round_base_decimals is None:
+        return - (taux * assiettes_tranches).sum(axis = 1)
+    assiettes_tranches = round_(assiettes_tranches, round_base_decimals)
+    return - round_(taux * assiettes_tranches, round_base_decimals).sum(axis = 1)
 
 
 def apply_bareme(simulation, period, cotisation_type = None, bareme_name = None, variable_name = None):
@@ -101,7 +162,7 @@ def compute_cotisation_anticipee(simulation, period, cotisation_type = None, bar
             )
     if period.start.month == 12:
         assert variable_name is not None
-        cumul = simulation.calculate_add(variable_name, period.start.offset('first-of', 'month').offset(
+        cumul = calculate_cumul_annuel(simulation, variable_name, period.start.offset('first-of', 'month').offset(
             -11, 'month').period('month', 11), max_nb_cycles = 1) # December variable_name depends on variable_name in the past 11 months. We need to explicitely allow this recursion.
 
         return compute_cotisation(
@@ -110,3 +171,77 @@ def compute_cotisation_anticipee(simulation, period, cotisation_type = None, bar
             cotisation_type = cotisation_type,
             bareme_name = bareme_name,
             ) - cumul
+
+
+# Registres des cumuls annuels, par holder : un holder n'appartient qu'à une simulation, et les tableaux qu'il contient
+# ne sont pas partagés avec ceux des simulations clonées.
+cumul_annuel_by_holder = weakref.WeakKeyDictionary()
+
+
+class CumulAnnuel(object):
+    """
+    Registre des sommes, depuis janvier, des valeurs mensuelles d'une variable (sommes préfixes).
+
+    Chaque mois a une entrée (tableau du mois, entrée du mois précédent, somme depuis janvier) : la somme jusqu'à un
+    mois est lue dans son entrée, et seule celle d'un mois manquant est calculée, en ajoutant la valeur du mois à la
+    somme du mois précédent. Une entrée n'est réutilisée que tant que le tableau du mois en cache et l'entrée du mois
+    précédent sont ceux dont elle est issue.
+    """
+
+    def __init__(self):
+        self.entree_by_month = {}
+        self.nb_cumuls_calcules = 0
+        self.nb_cumuls_reutilises = 0
+        # Nombre maximal de périodes de la variable en cours de calcul (cycles imbriqués) lors d'une demande de cumul
+        self.profondeur_cycles_max = 0
+
+    def get_entree_valide(self, holder, month):
+        entree = self.entree_by_month.get(month)
+        if entree is None or holder.get_array(month) is not entree[0]:
+            return None
+        if month.start.month > 1 and entree[1] is not self.entree_by_month.get(month.offset(-1)):
+            return None
+        return entree
+
+
+def get_cumul_annuel(simulation, variable_name):
+    holder = simulation.get_or_new_holder(variable_name)
+    cumul_annuel = cumul_annuel_by_holder.get(holder)
+    if cumul_annuel is None:
+        cumul_annuel = cumul_annuel_by_holder[holder] = CumulAnnuel()
+    return cumul_annuel
+
+
+def calculate_cumul_annuel(simulation, variable_name, period, max_nb_cycles = None):
+    """
+    Équivalent de simulation.calculate_add(variable_name, period, max_nb_cycles = max_nb_cycles), pour une période
+    de quelques mois commençant en janvier.
+
+    La somme depuis janvier est lue dans le registre de la variable, qui n'est complété que des mois manquants : un
+    calcul mois par mois sur toute l'année ne calcule qu'une somme par mois.
+    """
+    assert period.unit == periods.MONTH and period.start.month == 1 and period.size <= 12, period
+    holder = simulation.get_or_new_holder(variable_name)
+    cumul_annuel = get_cumul_annuel(simulation, variable_name)
+    cumul_annuel.profondeur_cycles_max = max(
+        cumul_annuel.profondeur_cycles_max,
+        len(simulation.requested_periods_by_variable_name.get(variable_name, [])),
+        )
+    # Mois manquants, du dernier mois de la période au premier mois ayant une entrée valide
+    months = []
+    month = period.start.offset(period.size - 1, 'month').period('month')
+    while True:
+        entree = cumul_annuel.get_entree_valide(holder, month)
+        if entree is not None:
+            cumul_annuel.nb_cumuls_reutilises += 1
+            break
+        months.append(month)
+        if month.start.month == 1:
+            break
+        month = month.offset(-1)
+    for month in reversed(months):
+        array = holder.compute(period = month, max_nb_cycles = max_nb_cycles).array
+        entree = cumul_annuel.entree_by_month[month] = (array, entree, array.copy() if entree is None
+            else entree[2] + array)
+        cumul_annuel.nb_cumuls_calcules += 1
+    return entree[2].copy()
@@ -7,7 +7,7 @@ import json
 import logging
 import pkg_resources
 
-from numpy import ceil, fromiter, int16, logical_or as or_, logical_and as and_, take
+from numpy import array, ceil, int16, logical_or as or_, logical_and as and_, take
 
 import openfisca_france
 from openfisca_core.periods import Instant
@@ -18,7 +18,9 @@ from openfisca_france.model.caracteristiques_socio_demographiques.logement impor
 
 log = logging.getLogger(__name__)
 
-zone_apl_by_depcom = None
+# Index précompilé des zones APL : codes INSEE (depcom) triés et zones correspondantes, même ordre.
+zone_apl_depcoms = None
+zone_apl_zones = None
 
 
 class al_nb_personnes_a_charge(Variable):
@@ -838,20 +840,21 @@ class zone_apl(Variable):
         '''
         depcom = menage('depcom', period)
 
-        preload_zone_apl()
-        default_value = 2
-        return fromiter(
-            (
-                zone_apl_by_depcom.get(depcom_cell, default_value)
-                for depcom_cell in depcom
-                ),
-            dtype = int16,
-            )
+        return zone_apl_from_depcom(depcom)
+
+
+def zone_apl_from_depcom(depcom, default_value = 2):
+    """Retrouve les zones APL d'un tableau de depcom par recherche dichotomique dans l'index précompilé."""
+    preload_zone_apl()
+    depcom = depcom.astype(zone_apl_depcoms.dtype)
+    position = zone_apl_depcoms.searchsorted(depcom)
+    position[position == len(zone_apl_depcoms)] = 0
+    return where(zone_apl_depcoms[position] == depcom, zone_apl_zones[position], default_value).astype(int16)
 
 
 def preload_zone_apl():
-    global zone_apl_by_depcom
-    if zone_apl_by_depcom is None:
+    global zone_apl_depcoms, zone_apl_zones
+    if zone_apl_depcoms is None:
         with pkg_resources.resource_stream(
                 openfisca_france.__name__,
                 'assets/apl/20110914_zonage.csv',
@@ -870,3 +873,6 @@ def preload_zone_apl():
             commune_depcom_by_subcommune_depcom = json.load(json_file)
             for subcommune_depcom, commune_depcom in commune_depcom_by_subcommune_depcom.iteritems():
                 zone_apl_by_depcom[subcommune_depcom] = zone_apl_by_depcom[commune_depcom]
+        depcoms = sorted(zone_apl_by_depcom)
+        zone_apl_zones = array([zone_apl_by_depcom[depcom] for depcom in depcoms], dtype = int16)
+        zone_apl_depcoms = array(depcoms, dtype = '|S5')
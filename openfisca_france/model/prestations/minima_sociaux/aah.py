@@ -4,6 +4,7 @@ from __future__ import division
 from numpy import absolute as abs_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.sommes_glissantes import calculate_add_glissant
 
 # TODO : Aujourd'hui, cette BR correspond uniquement au demandeur, pas au conjoint.
 class aah_base_ressources(Variable):
@@ -73,26 +74,32 @@ class aah_base_ressources_eval_trimestrielle(Variable):
         three_previous_months = period.start.period('month', 3).offset(-3)
         last_year = period.last_year
 
-        salaire_net = simulation.calculate_add('salaire_net', three_previous_months)
-        chomage_net = simulation.calculate_add('chomage_net', three_previous_months)
-        retraite_nette = simulation.calculate_add('retraite_nette', three_previous_months)
-        pensions_alimentaires_percues = simulation.calculate_add('pensions_alimentaires_percues', three_previous_months)
-        pensions_alimentaires_versees_individu = simulation.calculate_add(
+        salaire_net = calculate_add_glissant(simulation, 'salaire_net', three_previous_months)
+        chomage_net = calculate_add_glissant(simulation, 'chomage_net', three_previous_months)
+        retraite_nette = calculate_add_glissant(simulation, 'retraite_nette', three_previous_months)
+        pensions_alimentaires_percues = calculate_add_glissant(simulation,
+            'pensions_alimentaires_percues', three_previous_months)
+        pensions_alimentaires_versees_individu = calculate_add_glissant(simulation,
             'pensions_alimentaires_versees_individu', three_previous_months)
-        rsa_base_ressources_patrimoine_i = simulation.calculate_add('rsa_base_ressources_patrimoine_individu', three_previous_months)
-        indemnites_journalieres_imposables = simulation.calculate_add('indemnites_journalieres_imposables', three_previous_months)
-        indemnites_stage = simulation.calculate_add('indemnites_stage', three_previous_months)
-        revenus_stage_formation_pro = simulation.calculate_add('revenus_stage_formation_pro', three_previous_months)
-        allocation_securisation_professionnelle = simulation.calculate_add(
+        rsa_base_ressources_patrimoine_i = calculate_add_glissant(simulation,
+            'rsa_base_ressources_patrimoine_individu', three_previous_months)
+        indemnites_journalieres_imposables = calculate_add_glissant(simulation,
+            'indemnites_journalieres_imposables', three_previous_months)
+        indemnites_stage = calculate_add_glissant(simulation, 'indemnites_stage', three_previous_months)
+        revenus_stage_formation_pro = calculate_add_glissant(simulation,
+            'revenus_stage_formation_pro', three_previous_months)
+        allocation_securisation_professionnelle = calculate_add_glissant(simulation,
             'allocation_securisation_professionnelle', three_previous_months)
-        prestation_compensatoire = simulation.calculate_add('prestation_compensatoire', three_previous_months)
-        pensions_invalidite = simulation.calculate_add('pensions_invalidite', three_previous_months)
-        indemnites_chomage_partiel = simulation.calculate_add('indemnites_chomage_partiel', three_previous_months)
-        bourse_recherche = simulation.calculate_add('bourse_recherche', three_previous_months)
-        gains_exceptionnels = simulation.calculate_add('gains_exceptionnels', three_previous_months)
+        prestation_compensatoire = calculate_add_glissant(simulation, 'prestation_compensatoire', three_previous_months)
+        pensions_invalidite = calculate_add_glissant(simulation, 'pensions_invalidite', three_previous_months)
+        indemnites_chomage_partiel = calculate_add_glissant(simulation,
+            'indemnites_chomage_partiel', three_previous_months)
+        bourse_recherche = calculate_add_glissant(simulation, 'bourse_recherche', three_previous_months)
+        gains_exceptionnels = calculate_add_glissant(simulation, 'gains_exceptionnels', three_previous_months)
 
         def revenus_tns():
-            revenus_auto_entrepreneur = simulation.calculate_add('tns_auto_entrepreneur_benefice', three_previous_months)
+            revenus_auto_entrepreneur = calculate_add_glissant(simulation,
+                'tns_auto_entrepreneur_benefice', three_previous_months)
 
             # Les revenus TNS hors AE sont estimés en se basant sur le revenu N-1
             tns_micro_entreprise_benefice = simulation.calculate('tns_micro_entreprise_benefice', last_year) * 3 / 12
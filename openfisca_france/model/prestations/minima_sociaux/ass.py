@@ -5,6 +5,7 @@ from __future__ import division
 from numpy import absolute as abs_, logical_and as and_, logical_or as or_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.sommes_glissantes import calculate_add_glissant
 
 
 class ass_precondition_remplie(Variable):
@@ -71,15 +72,16 @@ class ass_base_ressources_individu(Variable):
         # N-1
         last_year = period.last_year
 
-        salaire_imposable = simulation.calculate_add('salaire_imposable', previous_year)
+        salaire_imposable = calculate_add_glissant(simulation, 'salaire_imposable', previous_year)
         salaire_imposable_this_month = simulation.calculate('salaire_imposable', period)
         salaire_imposable_interrompu = (salaire_imposable > 0) * (salaire_imposable_this_month == 0)
         # Le Salaire d'une activité partielle est neutralisé en cas d'interruption
         salaire_imposable = (1 - salaire_imposable_interrompu) * salaire_imposable
-        retraite_nette = simulation.calculate_add('retraite_nette', previous_year)
+        retraite_nette = calculate_add_glissant(simulation, 'retraite_nette', previous_year)
 
         def revenus_tns():
-            revenus_auto_entrepreneur = simulation.calculate_add('tns_auto_entrepreneur_benefice', previous_year)
+            revenus_auto_entrepreneur = calculate_add_glissant(simulation,
+                'tns_auto_entrepreneur_benefice', previous_year)
 
             # Les revenus TNS hors AE sont estimés en se basant sur le revenu N-1
             tns_micro_entreprise_benefice = simulation.calculate('tns_micro_entreprise_benefice', last_year)
@@ -88,14 +90,14 @@ class ass_base_ressources_individu(Variable):
 
             return revenus_auto_entrepreneur + tns_micro_entreprise_benefice + tns_benefice_exploitant_agricole + tns_autres_revenus
 
-        pensions_alimentaires_percues = simulation.calculate_add('pensions_alimentaires_percues', previous_year)
-        pensions_alimentaires_versees_individu = simulation.calculate_add(
-            'pensions_alimentaires_versees_individu', previous_year
-            )
+        pensions_alimentaires_percues = calculate_add_glissant(simulation,
+            'pensions_alimentaires_percues', previous_year)
+        pensions_alimentaires_versees_individu = calculate_add_glissant(simulation,
+            'pensions_alimentaires_versees_individu', previous_year)
 
-        aah = simulation.calculate_add('aah', previous_year)
-        indemnites_stage = simulation.calculate_add('indemnites_stage', previous_year)
-        revenus_stage_formation_pro = simulation.calculate_add('revenus_stage_formation_pro', previous_year)
+        aah = calculate_add_glissant(simulation, 'aah', previous_year)
+        indemnites_stage = calculate_add_glissant(simulation, 'indemnites_stage', previous_year)
+        revenus_stage_formation_pro = calculate_add_glissant(simulation, 'revenus_stage_formation_pro', previous_year)
 
         return (
             salaire_imposable + retraite_nette + pensions_alimentaires_percues - abs_(pensions_alimentaires_versees_individu) +
@@ -123,7 +125,7 @@ class ass_base_ressources_conjoint(Variable):
         ) > 0
 
         def calculateWithAbatement(ressourceName, neutral_totale = False):
-            ressource_year = simulation.calculate_add(ressourceName, previous_year)
+            ressource_year = calculate_add_glissant(simulation, ressourceName, previous_year)
             ressource_last_month = simulation.calculate(ressourceName, last_month)
 
             ressource_interrompue = (ressource_year > 0) * (ressource_last_month == 0)
@@ -151,7 +153,8 @@ class ass_base_ressources_conjoint(Variable):
         pensions_alimentaires_percues = calculateWithAbatement('pensions_alimentaires_percues')
 
         def revenus_tns():
-            revenus_auto_entrepreneur = simulation.calculate_add('tns_auto_entrepreneur_benefice', previous_year)
+            revenus_auto_entrepreneur = calculate_add_glissant(simulation,
+                'tns_auto_entrepreneur_benefice', previous_year)
 
             # Les revenus TNS hors AE sont estimés en se basant sur le revenu N-1
             tns_micro_entreprise_benefice = simulation.calculate('tns_micro_entreprise_benefice', last_year)
@@ -160,7 +163,8 @@ class ass_base_ressources_conjoint(Variable):
 
             return revenus_auto_entrepreneur + tns_micro_entreprise_benefice + tns_benefice_exploitant_agricole + tns_autres_revenus
 
-        pensions_alimentaires_versees_individu = simulation.calculate_add('pensions_alimentaires_versees_individu', previous_year)
+        pensions_alimentaires_versees_individu = calculate_add_glissant(simulation,
+            'pensions_alimentaires_versees_individu', previous_year)
 
         result = (
             salaire_imposable + pensions_alimentaires_percues - abs_(pensions_alimentaires_versees_individu) +
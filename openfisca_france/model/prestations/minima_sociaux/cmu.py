@@ -7,6 +7,7 @@ from functools import partial
 from numpy import absolute as abs_, apply_along_axis, array, int32, logical_or as or_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.sommes_glissantes import calculate_add_glissant
 
 class cmu_acs_eligibilite(Variable):
     column = BoolCol
@@ -23,7 +24,7 @@ class cmu_acs_eligibilite(Variable):
         # Une personne de 25 ans ne doit pas être à charge fiscale, ni hébergée par ses parents, ni recevoir de pensions alimentaires pour pouvoir bénéficier de la CMU individuellement.
         a_charge_des_parents = simulation.calculate('enfant_a_charge', this_year)
         habite_chez_parents = simulation.calculate('habite_chez_parents', period)
-        recoit_pension = simulation.calculate_add('pensions_alimentaires_percues', previous_year) > 0
+        recoit_pension = calculate_add_glissant(simulation, 'pensions_alimentaires_percues', previous_year) > 0
         condition_independance = not_(a_charge_des_parents + habite_chez_parents + recoit_pension)
 
         age = simulation.calculate('age', period)
@@ -213,17 +214,18 @@ class cmu_base_ressources_individu(Variable):
         ]
 
         ressources = sum(
-            [simulation.calculate_add(ressource, previous_year) for ressource in ressources_a_inclure]
+            [calculate_add_glissant(simulation, ressource, previous_year) for ressource in ressources_a_inclure]
             )
 
-        pensions_alim_versees = abs_(simulation.calculate_add('pensions_alimentaires_versees_individu', previous_year))
+        pensions_alim_versees = abs_(calculate_add_glissant(simulation,
+            'pensions_alimentaires_versees_individu', previous_year))
 
         revenus_stage_formation_pro_last_month = simulation.calculate('revenus_stage_formation_pro', last_month)
 
         # Abattement sur revenus d'activité si chômage ou formation professionnelle
         def abbattement_chomage():
-            indemnites_chomage_partiel = simulation.calculate_add('indemnites_chomage_partiel', previous_year)
-            salaire_net = simulation.calculate_add('salaire_net', previous_year)
+            indemnites_chomage_partiel = calculate_add_glissant(simulation, 'indemnites_chomage_partiel', previous_year)
+            salaire_net = calculate_add_glissant(simulation, 'salaire_net', previous_year)
             chomage_last_month = simulation.calculate('chomage_net', last_month)
             condition = or_(chomage_last_month > 0, revenus_stage_formation_pro_last_month > 0)
             assiette = indemnites_chomage_partiel + salaire_net
@@ -232,14 +234,16 @@ class cmu_base_ressources_individu(Variable):
 
         # Revenus de stage de formation professionnelle exclus si plus perçus depuis 1 mois
         def neutralisation_stage_formation_pro():
-            revenus_stage_formation_pro_annee = simulation.calculate_add('revenus_stage_formation_pro', previous_year)
+            revenus_stage_formation_pro_annee = calculate_add_glissant(simulation,
+                'revenus_stage_formation_pro', previous_year)
             return (revenus_stage_formation_pro_last_month == 0) * revenus_stage_formation_pro_annee
 
 
         def revenus_tns():
             last_year = period.last_year
 
-            revenus_auto_entrepreneur = simulation.calculate_add('tns_auto_entrepreneur_benefice', previous_year)
+            revenus_auto_entrepreneur = calculate_add_glissant(simulation,
+                'tns_auto_entrepreneur_benefice', previous_year)
 
             # Les revenus TNS hors AE sont estimés en se basant sur le revenu N-1
             tns_micro_entreprise_benefice = simulation.calculate('tns_micro_entreprise_benefice', last_year)
@@ -273,7 +277,8 @@ class cmu_base_ressources(Variable):
         ]
 
         ressources_famille = sum(
-            [famille(ressource, previous_year, options = [ADD]) for ressource in ressources_a_inclure]
+            [calculate_add_glissant(famille.simulation, ressource, previous_year, entity = famille)
+                for ressource in ressources_a_inclure]
             )
 
 
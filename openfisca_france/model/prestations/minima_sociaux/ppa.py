@@ -3,10 +3,21 @@
 from __future__ import division
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.legislation_equivalente import premier_mois_equivalent
 
 from numpy import round as round_
 
 
+# Les variables intermédiaires qui ne dépendent du mois de la demande que par ces paramètres (et par l'année de ce
+# mois) sont calculées pour le premier mois de l'année où ils sont identiques : elles sont ainsi partagées entre les
+# mois de demande.
+CHEMINS_LEGISLATION_PPA = ('cotsoc.gen', 'prestations.minima_sociaux')
+
+
+def mois_legislation_ppa(famille, mois_demande):
+    return premier_mois_equivalent(famille.simulation, mois_demande, CHEMINS_LEGISLATION_PPA)
+
+
 class ppa_eligibilite(Variable):
     column = BoolCol
     entity = Famille
@@ -36,8 +47,11 @@ class ppa_eligibilite_etudiants(Variable):
         etudiant_i = famille.members('etudiant', period)  # individu
         plancher_ressource = 169 * P.cotsoc.gen.smic_h_b * P.prestations.prestations_familiales.af.seuil_rev_taux
 
+        mois_legislation = mois_legislation_ppa(famille, period)
+
         def condition_ressource(period2):
-            revenu_activite = famille.members('ppa_revenu_activite_individu', period2, extra_params = [period])
+            revenu_activite = famille.members(
+                'ppa_revenu_activite_individu', period2, extra_params = [mois_legislation])
             return revenu_activite > plancher_ressource
 
         m_1 = period.offset(-1, 'month')
@@ -177,7 +191,9 @@ class ppa_ressources_hors_activite(Variable):
         pf = famille(
             'ppa_base_ressources_prestations_familiales', period, extra_params = [mois_demande])
         ressources_hors_activite_i = famille.members(
-            'ppa_ressources_hors_activite_individu', period, extra_params = [mois_demande])
+            'ppa_ressources_hors_activite_individu', period,
+            extra_params = [mois_legislation_ppa(famille, mois_demande)],
+            )
         ressources = [
             'ass',
             'asi',
@@ -264,7 +280,7 @@ class ppa_base_ressources(Variable):
 
     def function(famille, period, legislation, mois_demande):
         ppa_revenu_activite = famille(
-            'ppa_revenu_activite', period, extra_params = [mois_demande])
+            'ppa_revenu_activite', period, extra_params = [mois_legislation_ppa(famille, mois_demande)])
         ppa_ressources_hors_activite = famille(
             'ppa_ressources_hors_activite', period, extra_params = [mois_demande])
         return ppa_revenu_activite + ppa_ressources_hors_activite
@@ -302,16 +318,17 @@ class ppa_fictive(Variable):
         forfait_logement = famille('rsa_forfait_logement', mois_demande)
         ppa_majoree_eligibilite = famille('rsa_majore_eligibilite', mois_demande)
 
-        elig = famille('ppa_eligibilite', period, extra_params = [mois_demande])
+        mois_legislation = mois_legislation_ppa(famille, mois_demande)
+        elig = famille('ppa_eligibilite', period, extra_params = [mois_legislation])
         pente = legislation(mois_demande).prestations.minima_sociaux.ppa.pente
         mff_non_majore = famille(
-            'ppa_montant_forfaitaire_familial_non_majore', period, extra_params = [mois_demande])
+            'ppa_montant_forfaitaire_familial_non_majore', period, extra_params = [mois_legislation])
         mff_majore = famille(
-            'ppa_montant_forfaitaire_familial_majore', period, extra_params = [mois_demande])
+            'ppa_montant_forfaitaire_familial_majore', period, extra_params = [mois_legislation])
         montant_forfaitaire_familialise = where(ppa_majoree_eligibilite, mff_majore, mff_non_majore)
         ppa_base_ressources = famille('ppa_base_ressources', period, extra_params = [mois_demande])
-        ppa_revenu_activite = famille('ppa_revenu_activite', period, extra_params = [mois_demande])
-        bonification_i = famille.members('ppa_bonification', period, extra_params = [mois_demande])
+        ppa_revenu_activite = famille('ppa_revenu_activite', period, extra_params = [mois_legislation])
+        bonification_i = famille.members('ppa_bonification', period, extra_params = [mois_legislation])
         bonification = famille.sum(bonification_i)
 
         ppa_montant_base = (
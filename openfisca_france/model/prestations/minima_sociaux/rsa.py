@@ -6,6 +6,7 @@ from __future__ import division
 from numpy import datetime64, floor, logical_and as and_, logical_or as or_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
+from openfisca_france.model.sommes_glissantes import calculate_add_glissant
 from openfisca_france.model.prestations.prestations_familiales.base_ressource import nb_enf
 
 
@@ -105,7 +106,7 @@ class rsa_base_ressources_individu(Variable):
 
         # Les revenus pros interrompus au mois M sont neutralisés s'il n'y a pas de revenus de substitution.
         revenus_pro = sum(
-            individu(type_revenu, period.last_3_months, options = [ADD]) * not_(
+            calculate_add_glissant(individu.simulation, type_revenu, period.last_3_months, entity = individu) * not_(
                 (individu(type_revenu, period) == 0) *
                 (individu(type_revenu, period.last_month) > 0) *
                 not_(has_ressources_substitution)
@@ -131,10 +132,12 @@ class rsa_base_ressources_individu(Variable):
         # sans condition de revenu de substitution.
         neutral_max_forfaitaire = 3 * legislation(period).prestations.minima_sociaux.rmi.rmi
         revenus_non_pros = sum(
-            max_(0, individu(type_revenu, period.last_3_months, options = [ADD]) - neutral_max_forfaitaire * (
-                (individu(type_revenu, period) == 0) *
-                (individu(type_revenu, period.last_month) > 0)
-                ))
+            max_(0,
+                calculate_add_glissant(individu.simulation, type_revenu, period.last_3_months, entity = individu) -
+                neutral_max_forfaitaire * (
+                    (individu(type_revenu, period) == 0) *
+                    (individu(type_revenu, period.last_month) > 0)
+                    ))
             for type_revenu in types_revenus_non_pros
             )
 
@@ -230,7 +233,9 @@ class rsa_base_ressources_prestations_familiales(DatedVariable):
         result = sum(famille(prestation, period) for prestation in prestations_calculees)
 
         result += sum(
-            famille(prestation, period.last_3_months, options = [ADD]) / 3 for prestation in prestations_autres)
+            calculate_add_glissant(famille.simulation, prestation, period.last_3_months, entity = famille) / 3
+            for prestation in prestations_autres
+            )
 
         cf_non_majore_avant_cumul = famille('cf_non_majore_avant_cumul', period)
         cf = famille('cf', period)
@@ -496,15 +501,15 @@ class salaire_net_hors_revenus_exceptionnels(Variable):
             individu('indemnite_fin_contrat_net', period)
             )
 
-class rsa_revenu_activite_individu(DatedVariable):
+
+class rsa_revenu_activite_moyen_individu(Variable):
     column = FloatCol
-    label = u"Revenus d'activité du Rsa - Individuel"
+    label = u"Revenus d'activité moyennés sur les trois derniers mois du Rsa - Individuel"
     entity = Individu
-    start_date = date(2009, 6, 1)
+    start_date = date(2017, 1, 1)
     definition_period = MONTH
 
-    @dated_function(start = date(2017, 01, 01))
-    def function_2017(individu, mois_demande, legislation, mois_courant):
+    def function(individu, mois_demande):
         last_3_months = mois_demande.last_3_months
 
         types_revenus_activite = [
@@ -524,7 +529,7 @@ class rsa_revenu_activite_individu(DatedVariable):
         # Les revenus pros interrompus au mois M sont neutralisés s'il n'y a pas de revenus de substitution.
 
         revenus_moyennes = sum(
-            individu(type_revenu, last_3_months, options = [ADD]) * not_(
+            calculate_add_glissant(individu.simulation, type_revenu, last_3_months, entity = individu) * not_(
                 (individu(type_revenu, mois_demande) == 0) *
                 (individu(type_revenu, mois_demande.last_month) > 0) *
                 not_(has_ressources_substitution)
@@ -534,12 +539,27 @@ class rsa_revenu_activite_individu(DatedVariable):
 
         revenus_tns_annualises = individu('ppa_rsa_derniers_revenus_tns_annuels_connus', mois_demande.this_year)
 
+        return revenus_moyennes + revenus_tns_annualises
+
+
+class rsa_revenu_activite_individu(DatedVariable):
+    column = FloatCol
+    label = u"Revenus d'activité du Rsa - Individuel"
+    entity = Individu
+    start_date = date(2009, 6, 1)
+    definition_period = MONTH
+
+    @dated_function(start = date(2017, 01, 01))
+    def function_2017(individu, mois_demande, legislation, mois_courant):
+        # Seuls les revenus non moyennés dépendent du mois courant
+        revenu_activite_moyen = individu('rsa_revenu_activite_moyen_individu', mois_demande)
+
         revenus_non_moyennes = (
             individu('primes_salaires_net', mois_courant) +
             individu('indemnite_fin_contrat_net', mois_courant)
             )
 
-        return revenus_moyennes + revenus_tns_annualises + revenus_non_moyennes
+        return revenu_activite_moyen + revenus_non_moyennes
 
     @dated_function(stop = date(2016, 12, 31))
     def function_2016(individu, period):
@@ -565,7 +585,7 @@ class rsa_revenu_activite_individu(DatedVariable):
 
         # Les revenus pros interrompus au mois M sont neutralisés s'il n'y a pas de revenus de substitution.
         return sum(
-            individu(type_revenu, last_3_months, options = [ADD]) * not_(
+            calculate_add_glissant(individu.simulation, type_revenu, last_3_months, entity = individu) * not_(
                 (individu(type_revenu, period.first_month) == 0) *
                 (individu(type_revenu, period.last_month) > 0) *
                 not_(has_ressources_substitution)
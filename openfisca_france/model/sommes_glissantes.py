@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""Sommes de variables mensuelles sur des fenêtres glissantes (trois derniers mois, année précédente…)."""
+
+
+import weakref
+
+import numpy as np
+
+from openfisca_core import periods
+
+
+# Sommes préfixes, par holder : un holder n'appartient qu'à une simulation.
+sommes_prefixes_by_holder = weakref.WeakKeyDictionary()
+
+
+class SommesPrefixes(object):
+    """
+    Sommes préfixes des valeurs mensuelles d'une variable : la somme sur des mois consécutifs est la différence entre
+    les sommes préfixes du dernier mois et du mois qui précède le premier.
+
+    Chaque somme préfixe est conservée avec le tableau du mois et la somme préfixe précédente dont elle est issue, pour
+    n'être réutilisée que tant qu'ils n'ont pas changé. Les sommes sont faites en 64 bits.
+    """
+
+    def __init__(self):
+        self.entree_by_month = {}
+        self.nb_sommes_calculees = 0
+        self.nb_sommes_reutilisees = 0
+
+
+def get_sommes_prefixes(simulation, variable_name):
+    holder = simulation.get_or_new_holder(variable_name)
+    sommes_prefixes = sommes_prefixes_by_holder.get(holder)
+    if sommes_prefixes is None:
+        sommes_prefixes = sommes_prefixes_by_holder[holder] = SommesPrefixes()
+    return sommes_prefixes
+
+
+def calculate_add_glissant(simulation, variable_name, period, entity = None):
+    """
+    Équivalent de simulation.calculate_add(variable_name, period) pour une variable mensuelle numérique.
+
+    Lorsque des fenêtres qui se chevauchent sont demandées (par exemple les trois mois précédents de mois successifs),
+    les mois communs ne sont pas sommés à nouveau.
+
+    Lorsque l'entité est donnée, vérifie comme entity(variable_name, period, options = [ADD]) que la variable est
+    définie pour cette entité.
+    """
+    if entity is not None:
+        entity.check_variable_defined_for_entity(variable_name)
+    holder = simulation.get_or_new_holder(variable_name)
+    column = holder.column
+    dtype = np.dtype(column.dtype)
+    if column.definition_period != periods.MONTH or period.unit not in (periods.MONTH, periods.YEAR) \
+            or dtype.kind not in 'fiu':
+        return simulation.calculate_add(variable_name, period)
+    nb_mois = period.size * 12 if period.unit == periods.YEAR else period.size
+
+    sommes_prefixes = get_sommes_prefixes(simulation, variable_name)
+    entree_by_month = sommes_prefixes.entree_by_month
+    month = period.start.period(periods.MONTH)
+    entree = entree_by_month.get(month.offset(-1))
+    if entree is None:
+        # Origine des sommes préfixes
+        entree = entree_by_month[month.offset(-1)] = (
+            None,
+            None,
+            np.zeros(holder.entity.count, dtype = np.float64 if dtype.kind == 'f' else np.int64),
+            )
+    somme_prefixe_debut = somme_prefixe = entree[2]
+    for _ in range(nb_mois):
+        array = holder.compute(period = month).array
+        entree = entree_by_month.get(month)
+        if entree is not None and entree[0] is array and entree[1] is somme_prefixe:
+            sommes_prefixes.nb_sommes_reutilisees += 1
+        else:
+            entree = entree_by_month[month] = (array, somme_prefixe, somme_prefixe + array)
+            sommes_prefixes.nb_sommes_calculees += 1
+        somme_prefixe = entree[2]
+        month = month.offset(1)
+    return (somme_prefixe - somme_prefixe_debut).astype(dtype)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tableaux de valeurs par défaut partagés par les variables saisies que personne ne renseigne (cases de la déclaration,
+booléens case*, revenus tns_*…).
+
+Ces tableaux sont en lecture seule et de pas nul : ils n'occupent pas de mémoire, quelle que soit leur taille, et
+sont réutilisés pour toutes les variables et périodes de même type, même valeur par défaut et même entité. Une formule
+qui voudrait les modifier en place doit d'abord les copier (numpy lève une ValueError sinon).
+"""
+
+
+import numpy as np
+
+from openfisca_core.base_functions import (
+    permanent_default_value,
+    requested_period_default_value,
+    requested_period_last_or_next_value,
+    requested_period_last_value,
+    )
+from openfisca_core.formulas import SimpleFormula
+
+
+# Tableaux par défaut, par type, valeur par défaut et taille.
+tableau_par_defaut_by_cle = {}
+
+
+def get_tableau_par_defaut(dtype, default, size):
+    dtype = np.dtype(dtype)
+    # repr(), pour que les valeurs par défaut non comparables à elles-mêmes (nan) retrouvent leur tableau.
+    cle = (dtype.str, repr(default), size)
+    tableau = tableau_par_defaut_by_cle.get(cle)
+    if tableau is None:
+        tableau = tableau_par_defaut_by_cle[cle] = np.broadcast_to(np.array(default, dtype = dtype), (size, ))
+    return tableau
+
+
+def valeur_par_defaut_partagee(formula, simulation, period, *extra_params):
+    holder = formula.holder
+    column = holder.column
+    return get_tableau_par_defaut(column.dtype, column.default, holder.entity.count)
+
+
+def derniere_valeur_ou_valeur_par_defaut_partagee(formula, simulation, period, *extra_params):
+    if not formula.holder._array_by_period:
+        return valeur_par_defaut_partagee(formula, simulation, period, *extra_params)
+    return requested_period_last_value(formula, simulation, period, *extra_params)
+
+
+def derniere_ou_prochaine_valeur_ou_valeur_par_defaut_partagee(formula, simulation, period, *extra_params):
+    if not formula.holder._array_by_period:
+        return valeur_par_defaut_partagee(formula, simulation, period, *extra_params)
+    return requested_period_last_or_next_value(formula, simulation, period, *extra_params)
+
+
+base_function_partagee_by_base_function = {
+    permanent_default_value: valeur_par_defaut_partagee,
+    requested_period_default_value: valeur_par_defaut_partagee,
+    requested_period_last_or_next_value: derniere_ou_prochaine_valeur_ou_valeur_par_defaut_partagee,
+    requested_period_last_value: derniere_valeur_ou_valeur_par_defaut_partagee,
+    }
+
+
+def partager_valeur_par_defaut(column):
+    """
+    Fait renvoyer un tableau par défaut partagé à la colonne, si c'est une variable saisie (sans formule) dont la
+    valeur non renseignée est la valeur par défaut.
+    """
+    formula_class = column.formula_class
+    if issubclass(formula_class, SimpleFormula) and formula_class.function is None:
+        base_function_partagee = base_function_partagee_by_base_function.get(
+            formula_class.__dict__.get('base_function'))
+        if base_function_partagee is not None:
+            formula_class.base_function = base_function_partagee
+    return column
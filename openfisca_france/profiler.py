@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in profiler of the variables computed by simulations.
+
+A profiled simulation records, for each variable and period: the number of calls, the cache hits, the wall time spent
+in the variable itself (self) and with the variables it requested (cumulative), the bytes of the arrays it computed,
+and the calculations abandoned by a cycle error (and retried, or replaced by a default value, by a caller).
+
+    profiler = SimulationProfiler()
+    simulation = scenario.new_simulation(profiler = profiler)  # Or: tax_benefit_system.profiler = profiler
+    simulation.calculate('revenu_disponible', '2016')
+    print profiler.format_table(limit = 30)
+    profiler.write_stacks('revenu_disponible.stacks')  # For flamegraph.pl, speedscope…
+
+The holders of a profiled simulation are switched to a subclass which times their computations. Simulations built
+without a profiler are left untouched, and pay nothing.
+"""
+
+
+import collections
+import timeit
+
+from openfisca_core.formulas import CycleError
+from openfisca_core.holders import Holder
+from openfisca_core.simulations import Simulation
+
+
+class VariableStatistics(object):
+    __slots__ = ('calls', 'cache_hits', 'self_time', 'cumulative_time', 'allocated_bytes', 'cycle_retries')
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.self_time = 0.
+        self.cumulative_time = 0.
+        self.allocated_bytes = 0
+        self.cycle_retries = 0
+
+    def add(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+class Frame(object):
+    __slots__ = ('variable_name', 'children_time')
+
+    def __init__(self, variable_name):
+        self.variable_name = variable_name
+        self.children_time = 0.
+
+
+class SimulationProfiler(object):
+    """Statistics of the variables computed by the simulations it is attached to."""
+
+    def __init__(self, timer = timeit.default_timer):
+        self.timer = timer
+        self.statistics_by_key = {}  # Key: (variable name, period)
+        self.cumulative_time_by_variable_name = collections.defaultdict(float)
+        self.self_time_by_stack = collections.defaultdict(float)
+        self.stack = []
+
+    def attach(self, simulation):
+        """Profile a simulation (and the simulations which will be cloned from it)."""
+        simulation.__class__ = ProfiledSimulation
+        simulation.profiler = self
+        for holder in simulation.holder_by_name.itervalues():
+            holder.__class__ = ProfiledHolder
+        return simulation
+
+    def compute(self, holder, period, parameters):
+        variable_name = holder.column.name
+        key = (variable_name, period)
+        statistics = self.statistics_by_key.get(key)
+        if statistics is None:
+            statistics = self.statistics_by_key[key] = VariableStatistics()
+        statistics.calls += 1
+        if holder.get_from_cache(period, parameters.get('extra_params')).array is not None:
+            statistics.cache_hits += 1
+            return Holder.compute(holder, period, **parameters)
+
+        stack = self.stack
+        # Cumulative time of a variable, without counting twice its calls for other periods nested in its own.
+        outermost = all(frame.variable_name != variable_name for frame in stack)
+        frame = Frame(variable_name)
+        stack.append(frame)
+        start_time = self.timer()
+        try:
+            dated_holder = Holder.compute(holder, period, **parameters)
+        except CycleError:
+            statistics.cycle_retries += 1
+            raise
+        finally:
+            duration = self.timer() - start_time
+            self_time = duration - frame.children_time
+            self.self_time_by_stack[tuple(stack_frame.variable_name for stack_frame in stack)] += self_time
+            stack.pop()
+            if stack:
+                stack[-1].children_time += duration
+            statistics.self_time += self_time
+            statistics.cumulative_time += duration
+            if outermost:
+                self.cumulative_time_by_variable_name[variable_name] += duration
+        array = dated_holder.array
+        if array is not None and array.strides != (0, ):
+            # Read-only default arrays of zero stride are shared, and allocate nothing.
+            statistics.allocated_bytes += array.nbytes
+        return dated_holder
+
+    def get_rows(self, sort_by = 'self_time', by_variable = False):
+        """
+        Return the (variable name, period, statistics) rows, sorted by decreasing `sort_by`.
+
+        With `by_variable`, the periods of each variable are summed in a row whose period is None.
+        """
+        if by_variable:
+            statistics_by_key = collections.defaultdict(VariableStatistics)
+            for (variable_name, _), statistics in self.statistics_by_key.iteritems():
+                statistics_by_key[(variable_name, None)].add(statistics)
+            for (variable_name, _), statistics in statistics_by_key.iteritems():
+                statistics.cumulative_time = self.cumulative_time_by_variable_name[variable_name]
+        else:
+            statistics_by_key = self.statistics_by_key
+        return sorted(
+            (
+                (variable_name, period, statistics)
+                for (variable_name, period), statistics in statistics_by_key.iteritems()
+                ),
+            key = lambda row: (- getattr(row[2], sort_by), row[0], str(row[1])),
+            )
+
+    def format_table(self, sort_by = 'self_time', by_variable = False, limit = None):
+        """Return the statistics as a text table, sorted by decreasing `sort_by`, with the `limit` first rows."""
+        line_format = u'{:<50} {:<10} {:>8} {:>8} {:>11} {:>11} {:>14} {:>6}'
+        lines = [line_format.format(u'variable', u'period', u'calls', u'hits', u'self (s)', u'cumul. (s)',
+            u'bytes', u'cycles')]
+        rows = self.get_rows(sort_by = sort_by, by_variable = by_variable)
+        for variable_name, period, statistics in rows[:limit]:
+            lines.append(line_format.format(
+                variable_name,
+                u'' if period is None else unicode(period),
+                statistics.calls,
+                statistics.cache_hits,
+                u'{:.6f}'.format(statistics.self_time),
+                u'{:.6f}'.format(statistics.cumulative_time),
+                statistics.allocated_bytes,
+                statistics.cycle_retries,
+                ))
+        return u'\n'.join(lines)
+
+    def iter_stacks(self):
+        """Yield the lines of the stacks, in the folded format of flamegraph.pl ("a;b;c microseconds")."""
+        for stack, self_time in sorted(self.self_time_by_stack.iteritems()):
+            microseconds = int(round(self_time * 1e6))
+            if microseconds > 0:
+                yield u'{} {}'.format(u';'.join(stack), microseconds)
+
+    def write_stacks(self, file_path):
+        with open(file_path, 'w') as stacks_file:
+            for line in self.iter_stacks():
+                stacks_file.write(line.encode('utf-8'))
+                stacks_file.write('\n')
+
+
+class ProfiledHolder(Holder):
+    def compute(self, period, **parameters):
+        return self.simulation.profiler.compute(self, period, parameters)
+
+
+class ProfiledSimulation(Simulation):
+    profiler = None
+
+    def get_or_new_holder(self, column_name):
+        holder = Simulation.get_or_new_holder(self, column_name)
+        if holder.__class__ is Holder:
+            holder.__class__ = ProfiledHolder
+        return holder
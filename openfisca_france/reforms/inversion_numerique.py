@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""Outils d'inversion numérique vectorisée, pour les réformes qui remontent du net (ou de l'imposable) au brut."""
+
+
+from __future__ import division
+
+from numpy import absolute, logical_and as and_, logical_not as not_, logical_or as or_, maximum as max_, where
+
+
+class TargetCalculator(object):
+    """
+    Calcule une variable cible pour des valeurs d'essai d'une variable d'entrée, pour toute la population à la fois.
+
+    Une seule simulation de travail est clonée depuis la simulation d'origine. À chaque évaluation, seules les variables
+    calculées sont oubliées : les variables d'entrée sont conservées.
+    """
+
+    def __init__(self, simulation, input_variable_name, input_periods, target_variable_name, target_period):
+        self.simulation = simulation
+        self.input_periods = input_periods
+        self.target_variable_name = target_variable_name
+        self.target_period = target_period
+        # Variables being calculated in the original simulation: their holders might contain undesired cache.
+        requested_variable_names = set(simulation.requested_periods_by_variable_name)
+
+        scratch_simulation = simulation.clone()
+        # Use distinct cycle detection data, so that the original simulation is left untouched.
+        scratch_simulation.requested_periods_by_variable_name = dict()
+        self.scratch_simulation = scratch_simulation
+
+        # The input variable is not calculated again for the input periods, but manually set as an input variable.
+        input_holder = scratch_simulation.get_or_new_holder(input_variable_name)
+        # Remove its function from the cloned formula, so that other periods get the default value instead of running
+        # the inversion again.
+        input_holder.formula.function = None
+        self.input_holder = input_holder
+
+        self.input_holder_by_name = {
+            name: holder
+            for name, holder in scratch_simulation.holder_by_name.iteritems()
+            if name not in requested_variable_names and name != target_variable_name
+            }
+        self.input_holder_by_name[input_variable_name] = input_holder
+        # Cloned holders still refer to the original simulation, which is used by -core to detect cycles.
+        for holder in self.input_holder_by_name.itervalues():
+            holder.simulation = scratch_simulation
+        self.evaluations_count = 0
+
+    def __call__(self, input_array):
+        scratch_simulation = self.scratch_simulation
+        # Forget the variables calculated with the previous input, and force recomputing of the target.
+        scratch_simulation.holder_by_name = self.input_holder_by_name.copy()
+        self.input_holder.delete_arrays()
+        for input_period in self.input_periods:
+            self.input_holder.put_in_cache(input_array, input_period)
+        self.evaluations_count += 1
+        # Entities are shared between a simulation and its clones: point them to the scratch simulation only while
+        # computing.
+        try:
+            self.set_entities_simulation(scratch_simulation)
+            return scratch_simulation.calculate_add(self.target_variable_name, self.target_period)
+        finally:
+            self.set_entities_simulation(self.simulation)
+
+    def set_entities_simulation(self, simulation):
+        for entity in simulation.entities.itervalues():
+            entity.simulation = simulation
+
+
+def inverse_function(calculate_target, target, guess = None, encadrement = None, xtol = 0.01, max_iterations = 50):
+    """
+    Inverse une fonction croissante et linéaire par morceaux calculate_target, élément par élément.
+
+    Chaque élément garde un encadrement [bas, haut] de sa solution. Le pas suivant est un pas de Newton dont la pente
+    est estimée à partir des deux derniers essais (méthode de la sécante) : il est exact dès que ces deux essais se
+    trouvent sur le même segment que la solution. Lorsque ce pas sort de l'encadrement, on se rabat sur une bissection.
+
+    Lorsqu'une première estimation guess est fournie, seuls les éléments pour lesquels elle n'est pas assez précise
+    sont résolus numériquement. Un encadrement initial (bas, valeur_bas, haut, valeur_haut) déjà évalué peut aussi être
+    fourni.
+    """
+    target = target.astype(float)
+    if guess is not None:
+        ecart_guess = calculate_target(guess) - target
+        resolu_guess = absolute(ecart_guess) <= xtol
+        if resolu_guess.all():
+            return guess
+
+    if encadrement is None:
+        bas = max_(target, 0)
+        haut = max_(target * 2, 1)
+        ecart_bas = calculate_target(bas) - target
+        ecart_haut = None
+    else:
+        bas, valeur_bas, haut, valeur_haut = encadrement
+        ecart_bas = valeur_bas - target
+        ecart_haut = valeur_haut - target
+    # Cas où la cible dépasse le brut (par exemple en présence d'autres revenus) : on repart de zéro.
+    if (ecart_bas > 0).any():
+        bas = where(ecart_bas > 0, 0, bas)
+        ecart_bas = calculate_target(bas) - target
+    if ecart_haut is None:
+        ecart_haut = calculate_target(haut) - target
+    for _ in range(max_iterations):
+        trop_bas = ecart_haut < 0
+        if not trop_bas.any():
+            break
+        bas = where(trop_bas, haut, bas)
+        ecart_bas = where(trop_bas, ecart_haut, ecart_bas)
+        haut = where(trop_bas, haut * 2, haut)
+        ecart_haut = calculate_target(haut) - target
+
+    if guess is not None:
+        # L'estimation, déjà évaluée, resserre l'encadrement des éléments qu'elle ne résout pas.
+        dans_encadrement = and_(guess > bas, guess < haut)
+        sous_cible = and_(dans_encadrement, ecart_guess < 0)
+        sur_cible = and_(dans_encadrement, ecart_guess >= 0)
+        bas, ecart_bas = where(sous_cible, guess, bas), where(sous_cible, ecart_guess, ecart_bas)
+        haut, ecart_haut = where(sur_cible, guess, haut), where(sur_cible, ecart_guess, ecart_haut)
+
+    # Pas de solution positive : le brut est nul.
+    resolu = ecart_bas >= 0
+    essai = where(resolu, bas, secant_step(bas, ecart_bas, haut, ecart_haut, bas, haut))
+    if guess is not None:
+        resolu = or_(resolu, resolu_guess)
+        essai = where(resolu_guess, guess, essai)
+    essai_precedent, ecart_precedent = bas, ecart_bas
+    for _ in range(max_iterations):
+        ecart = calculate_target(essai) - target
+        resolu = or_(resolu, or_(absolute(ecart) <= xtol, haut - bas <= xtol))
+        if resolu.all():
+            break
+        bas, ecart_bas = where(ecart < 0, essai, bas), where(ecart < 0, ecart, ecart_bas)
+        haut, ecart_haut = where(ecart < 0, haut, essai), where(ecart < 0, ecart_haut, ecart)
+        nouvel_essai = secant_step(essai_precedent, ecart_precedent, essai, ecart, bas, haut)
+        essai_precedent, ecart_precedent = essai, ecart
+        essai = where(resolu, essai, nouvel_essai)
+
+    return essai
+
+
+def secant_step(x0, y0, x1, y1, bas, haut):
+    """Pas de la sécante passant par (x0, y0) et (x1, y1), ou milieu de [bas, haut] si ce pas sort de l'intervalle."""
+    pente = y1 - y0
+    pente_valide = and_(not_(absolute(pente) < 1e-12), x1 != x0)
+    x = where(pente_valide, x1 - y1 * (x1 - x0) / where(pente_valide, pente, 1), bas)
+    return where(and_(pente_valide, and_(x > bas, x < haut)), x, (bas + haut) / 2)
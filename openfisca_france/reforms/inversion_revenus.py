@@ -2,279 +2,216 @@
 
 from __future__ import division
 
+import weakref
 
-from openfisca_core import columns, reforms
-from openfisca_core.columns import MONTH, YEAR
-
-from .. import entities
+from numpy import arange, array, clip, ones, where
 
+from openfisca_core import columns
+from openfisca_core.legislations import CompactNode
+from openfisca_core.reforms import Reform
+from openfisca_core.taxscales import MarginalRateTaxScale
 
-def brut_to_target(target_name = None, period = None, simulation = None, **input_array_by_name):
-    simulation = simulation.clone(debug = simulation.debug, debug_all = simulation.debug_all, trace = simulation.trace)
-    simulation.get_or_new_holder(target_name).delete_arrays()
-    for variable_name, array in input_array_by_name.iteritems():
-        simulation.get_or_new_holder(variable_name).put_in_cache(array, period)
-    return simulation.calculate_add(target_name)
-
-
-def build_reform(tax_benefit_system):
-    from scipy.optimize import fsolve
-
-    Reform = reforms.make_reform(
-        key = 'inversion_revenus',
-        name = u'Inversion des revenus',
-        reference = tax_benefit_system,
-        )
-
-    class salaire_imposable_pour_inversion(Reform.Variable):
-        column = columns.FloatCol
-        entity = entities.Individu
-        label = u'Salaire imposable utilisé pour remonter au salaire brut'
-        definition_period = YEAR
-
-    class chomage_imposable_pour_inversion(Reform.Variable):
-        column = columns.FloatCol
-        entity = entities.Individu
-        label = u'Autres revenus imposables (chômage, préretraite), utilisé pour l’inversion'
-        definition_period = YEAR
-
-    class retraite_imposable_pour_inversion(Reform.Variable):
-        column = columns.FloatCol
-        entity = entities.Individu
-        label = u'Pensions, retraites, rentes connues imposables, utilisé pour l’inversion'
-        definition_period = YEAR
-
-    class salaire_de_base(Reform.Variable):
-        column = columns.FloatCol
-        entity = entities.Individu
-        label = u"Salaire brut ou traitement indiciaire brut"
-        reference = tax_benefit_system.column_by_name["salaire_de_base"]
-        url = u"http://www.trader-finance.fr/lexique-finance/definition-lettre-S/Salaire-brut.html"
-        definition_period = MONTH
-
-        def function(self, simulation, period):
-            """Calcule le salaire brut à partir du salaire imposable ou sinon du salaire net.
-
-            Sauf pour les fonctionnaires où il renvoie le traitement indiciaire brut
-            Note : le supplément familial de traitement est imposable.
-            """
-            # Get value for year and divide below.
-            salaire_imposable_pour_inversion = simulation.get_array('salaire_imposable_pour_inversion',
-                period.this_year)
-            if salaire_imposable_pour_inversion is None:
-                salaire_net = simulation.get_array('salaire_net', period)
-                if salaire_net is not None:
-                    # Calcule le salaire brut à partir du salaire net par inversion numérique.
-                    if (salaire_net == 0).all():
-                        # Quick path to avoid fsolve when using default value of input variables.
-                        return salaire_net
-                    simulation = self.holder.entity.simulation
-
-                    def solve_function(salaire_de_base):
-                        return brut_to_target(
-                            target_name = 'salaire_net',
-                            period = period,
-                            salaire_de_base = salaire_de_base,
-                            simulation = simulation,
-                            ) - salaire_net
-                    return fsolve(solve_function, salaire_net)
-
-                salaire_imposable_pour_inversion = simulation.calculate_divide('salaire_imposable_pour_inversion',
-                    period)
-
-            # Calcule le salaire brut à partir du salaire imposable par inversion numérique.
-            if (salaire_imposable_pour_inversion == 0).all():
-                # Quick path to avoid fsolve when using default value of input variables.
-                return salaire_imposable_pour_inversion
-            simulation = self.holder.entity.simulation
-
-            def solve_function(salaire_de_base):
-                return brut_to_target(
-                    target_name = 'salaire_imposable',
-                    period = period,
-                    salaire_de_base = salaire_de_base,
-                    simulation = simulation,
-                    ) - salaire_imposable_pour_inversion
-
-            return fsolve(solve_function, salaire_imposable_pour_inversion)
-
-    #       TODO: inclure un taux de prime et calculer les primes en même temps que salaire_de_base
-
-    #        # Calcule le salaire brut à partir du salaire imposable.
-    #        # Sauf pour les fonctionnaires où il renvoie le traitement indiciaire brut
-    #        # Note : le supplément familial de traitement est imposable.
-    #
-    #        hsup = simulation.calculate('hsup', period)
-    #        categorie_salarie = simulation.calculate('categorie_salarie', period)
-    #        P = simulation.legislation_at(period.start)
-    #
-    #        plafond_securite_sociale = P.cotsoc.gen.plafond_securite_sociale
-    #
-    #        salarie = P.cotsoc.sal.scale_tax_scales(plafond_securite_sociale)
-    #        csg = P.csg.scale_tax_scales(plafond_securite_sociale)
-    #
-    #        salarie['noncadre'].update(salarie['commun'])
-    #        salarie['cadre'].update(salarie['commun'])
-    #
-    #        # log.info(
-    #        #     "Le dictionnaire des barèmes des cotisations salariés des titulaires de l'Etat contient : \n %s",
-    #        #     salarie['fonc']["etat"],
-    #        #     )
-    #
-    #        # Salariés du privé
-    #
-    #        noncadre = salarie['noncadre'].combine_tax_scales()
-    #        cadre = salarie['cadre'].combine_tax_scales()
-    #
-    #        # On ajoute la CSG deductible
-    #        noncadre.add_tax_scale(csg['activite']['deductible'])
-    #        cadre.add_tax_scale(csg['activite']['deductible'])
-    #
-    #        nca = noncadre.inverse()
-    #        cad = cadre.inverse()
-    #        brut_nca = nca.calc(salaire_imposable_pour_inversion)
-    #        brut_cad = cad.calc(salaire_imposable_pour_inversion)
-    #        salbrut = brut_nca * (categorie_salarie == CATEGORIE_SALARIE['prive_non_cadre'])
-    #        salbrut += brut_cad * (categorie_salarie == CATEGORIE_SALARIE['prive_cadre'])
-    #
-    #        # public etat
-    #        # TODO: modifier la contribution exceptionelle de solidarité
-    #        # en fixant son seuil de non imposition dans le barème (à corriger dans param.xml
-    #        # et en tenant compte des éléments de l'assiette
-    #        salarie['fonc']['etat']['excep_solidarite'] = salarie['fonc']['commun']['solidarite']
-    #
-    #        public_etat = salarie['fonc']['etat']['pension']
-    #        # public_colloc = salarie['fonc']["colloc"].combine_tax_scales()  TODO
-    #
-    #        # Pour a fonction publique la csg est calculée sur l'ensemble salbrut(=TIB) + primes
-    #        # Imposable = TIB - csg( (1+taux_prime)*TIB ) - pension(TIB) + taux_prime*TIB
-    #        bareme_csg_titulaire_etat = csg['act']['deduc'].multiply_rates(1 + TAUX_DE_PRIME, inplace = False,
-    #            new_name = "csg deduc titutaire etat")
-    #        public_etat.add_tax_scale(bareme_csg_titulaire_etat)
-    #        bareme_prime = MarginalRateTaxScale(name = "taux de prime")
-    #        bareme_prime.add_bracket(0, -TAUX_DE_PRIME)  # barème équivalent à taux_prime*TIB
-    #        public_etat.add_tax_scale(bareme_prime)
-    #
-    #        etat = public_etat.inverse()
-    #
-    #        # TODO: complete this to deal with the fonctionnaire
-    #        # supp_familial_traitement = 0  # TODO: dépend de salbrut
-    #        # indemnite_residence = 0  # TODO: fix bug
-    #
-    #        # print 'salaire_imposable_pour_inversion', salaire_imposable_pour_inversion
-    #        brut_etat = etat.calc(salaire_imposable_pour_inversion)
-    #        # print 'brut_etat', brut_etat
-    #        # print 'impot', public_etat.calc(brut_etat)
-    #        # print 'brut_etat', brut_etat
-    #        salbrut_etat = (brut_etat)
-    #        # TODO: fonctionnaire
-    #        # print 'salbrut_etat', salbrut_etat
-    #        salbrut += salbrut_etat * (categorie_salarie == CATEGORIE_SALARIE['public_titulaire_etat'])
-    #
-    #        #<NODE desc= "Supplément familial de traitement " shortname="Supp. fam." code= "supp_familial_traitement"/>
-    #        #<NODE desc= "Indemnité de résidence" shortname="Ind. rés." code= "indemenite_residence"/>
-    #        return salbrut + hsup
-
-    class chomage_brut(Reform.Variable):
-        column = columns.FloatCol
-        entity = entities.Individu
-        label = u"Allocations chômage brutes"
-        url = u"http://vosdroits.service-public.fr/particuliers/N549.xhtml"
-        definition_period = MONTH
-
-        def function(self, simulation, period):
-            """"Calcule les allocations chômage brutes à partir des allocations imposables ou sinon des allocations nettes.
-            """
-            # Get value for year and divide below.
-            chomage_imposable_pour_inversion = simulation.get_array(
-                'chomage_imposable_pour_inversion', period.this_year)
-            if chomage_imposable_pour_inversion is None:
-                chomage_net = simulation.get_array('chomage_net', period)
-                if chomage_net is not None:
-                    # Calcule les allocations chomage brutes à partir des allocations nettes par inversion numérique.
-                    if (chomage_net == 0).all():
-                        # Quick path to avoid fsolve when using default value of input variables.
-                        return chomage_net
-                    simulation = self.holder.entity.simulation
-
-                    def solve_function(chomage_brut):
-                        return brut_to_target(
-                            chomage_brut = chomage_brut,
-                            target_name = 'chomage_net',
-                            period = period,
-                            simulation = simulation,
-                            ) - chomage_net
-                    return fsolve(solve_function, chomage_net)
-
-                chomage_imposable_pour_inversion = simulation.calculate_divide(
-                    'chomage_imposable_pour_inversion', period)
-
-            # Calcule les allocations chômage brutes à partir des allocations imposables.
-            # taux_csg_remplacement = simulation.calculate('taux_csg_remplacement', period)
-            if (chomage_imposable_pour_inversion == 0).all():
-                # Quick path to avoid fsolve when using default value of input variables.
-                return chomage_imposable_pour_inversion
-            simulation = self.holder.entity.simulation
-
-            def solve_function(chomage_brut):
-                return brut_to_target(
-                    chomage_brut = chomage_brut,
-                    # taux_csg_remplacement = taux_csg_remplacement,
-                    target_name = 'chomage_imposable',
-                    period = period,
-                    simulation = simulation,
-                    ) - chomage_imposable_pour_inversion
-            return fsolve(solve_function, chomage_imposable_pour_inversion)
-
-    class retraite_brute(Reform.Variable):
-        column = columns.FloatCol
-        entity = entities.Individu
-        label = u"Pensions de retraite brutes"
-        url = u"http://vosdroits.service-public.fr/particuliers/N20166.xhtml"
-        definition_period = MONTH
-
-        def function(self, simulation, period):
-            """"Calcule les pensions de retraite brutes à partir des pensions imposables ou sinon des pensions nettes.
-            """
-            # Get value for year and divide below.
-            retraite_imposable_pour_inversion = simulation.get_array(
-                'retraite_imposable_pour_inversion', period.this_year)
-            if retraite_imposable_pour_inversion is None:
-                retraite_nette = simulation.get_array('retraite_nette', period)
-                if retraite_nette is not None:
-                    # Calcule les pensions de retraite brutes à partir des pensions nettes par inversion numérique.
-                    if (retraite_nette == 0).all():
-                        # Quick path to avoid fsolve when using default value of input variables.
-                        return retraite_nette
-                    simulation = self.holder.entity.simulation
-
-                    def solve_function(retraite_brute):
-                        return brut_to_target(
-                            target_name = 'retraite_nette',
-                            period = period,
-                            retraite_brute = retraite_brute,
-                            simulation = simulation,
-                            ) - retraite_nette
-                    return fsolve(solve_function, retraite_nette)
-
-                retraite_imposable_pour_inversion = simulation.calculate_divide(
-                    'retraite_imposable_pour_inversion', period)
-
-            # Calcule les pensions de retraite brutes à partir des pensions imposables.
-            taux_csg_remplacement = simulation.calculate('taux_csg_remplacement', period)
-            if (retraite_imposable_pour_inversion == 0).all():
-                # Quick path to avoid fsolve when using default value of input variables.
-                return retraite_imposable_pour_inversion
-            simulation = self.holder.entity.simulation
-
-            def solve_function(retraite_brute):
-                return brut_to_target(
-                    retraite_brute = retraite_brute,
-                    taux_csg_remplacement = taux_csg_remplacement,
-                    target_name = 'retraite_imposable',
-                    period = period,
-                    simulation = simulation,
-                    ) - retraite_imposable_pour_inversion
-            return fsolve(solve_function, retraite_imposable_pour_inversion)
-
-    return Reform()
+from .. import entities
+from ..model.base import *
+from .inversion_numerique import TargetCalculator, inverse_function
+
+
+# Noeuds de la législation dont les barèmes (exprimés en plafonds de la sécurité sociale) donnent les points où le
+# passage du brut à l'imposable ou au net change de pente.
+noeuds_baremes_by_revenu = dict(
+    chomage = [
+        'prelevements_sociaux.contributions.csg.chomage',
+        'prelevements_sociaux.contributions.crds.activite',
+        ],
+    retraite = [
+        'prelevements_sociaux.contributions.csg.retraite',
+        'prelevements_sociaux.contributions.crds.retraite',
+        ],
+    salaire = [
+        'cotsoc.cotisations_salarie',
+        'prelevements_sociaux.contributions.csg.activite',
+        'prelevements_sociaux.contributions.crds.activite',
+        ],
+    )
+points_de_rupture_by_revenu_by_legislation = weakref.WeakKeyDictionary()
+
+
+def get_points_de_rupture(legislation, revenu):
+    """
+    Renvoie les montants bruts mensuels où le passage du brut à l'imposable ou au net de revenu peut changer de pente.
+
+    Ces points ne dépendent que de la législation : ils sont calculés une seule fois par législation compacte, donc
+    par période. Un dernier point est ajouté au-delà du dernier seuil, pour connaître la pente du dernier segment.
+    """
+    points_de_rupture_by_revenu = points_de_rupture_by_revenu_by_legislation.setdefault(legislation, {})
+    points_de_rupture = points_de_rupture_by_revenu.get(revenu)
+    if points_de_rupture is None:
+        plafond_securite_sociale = legislation.cotsoc.gen.plafond_securite_sociale
+        seuils = set([0])
+        for path in noeuds_baremes_by_revenu[revenu]:
+            node = legislation
+            for name in path.split('.'):
+                node = getattr(node, name)
+            seuils.update(iter_thresholds(node))
+        points = sorted(seuil * plafond_securite_sociale for seuil in seuils)
+        points.append(2 * points[-1] if points[-1] > 0 else plafond_securite_sociale)
+        points_de_rupture = points_de_rupture_by_revenu[revenu] = array(points)
+    return points_de_rupture
+
+
+def iter_thresholds(node):
+    if isinstance(node, MarginalRateTaxScale):
+        for threshold in node.thresholds:
+            yield threshold
+    elif isinstance(node, CompactNode):
+        for name, child in node.iteritems():
+            for threshold in iter_thresholds(child):
+                yield threshold
+
+
+def inverse_lineaire_par_morceaux(points, valeurs, cible):
+    """
+    Inverse analytiquement, élément par élément, une fonction linéaire entre les points donnés.
+
+    valeurs[k] contient les valeurs de la fonction au point points[k] pour chaque élément. La dernière pente est
+    prolongée au-delà du dernier point.
+
+    Renvoie la solution, et le segment (bas, valeur_bas, haut, valeur_haut) où elle a été trouvée.
+    """
+    segment = clip((valeurs[1:-1] <= cible).sum(axis = 0), 0, len(points) - 2)
+    elements = arange(len(cible))
+    x0 = points[segment]
+    x1 = points[segment + 1]
+    y0 = valeurs[segment, elements]
+    y1 = valeurs[segment + 1, elements]
+    pente = (y1 - y0) / (x1 - x0)
+    return where(pente > 0, x0 + (cible - y0) / where(pente > 0, pente, 1), x0), (x0, y0, x1, y1)
+
+
+def calculate_brut(variable, simulation, period, brut_name, imposable_name, net_name, revenu):
+    """
+    Calcule un revenu brut à partir du revenu imposable annuel (*_pour_inversion) ou sinon du revenu net du mois.
+
+    En mode analytique, la cible est évaluée aux points de rupture de la législation, puis inversée par interpolation
+    linéaire. Seuls les éléments que cette inversion ne résout pas (termes non linéaires : seuils d'exonération,
+    plafond proratisé…) sont ensuite résolus numériquement.
+    """
+    imposable_pour_inversion = simulation.get_array(imposable_name + '_pour_inversion', period.this_year)
+    if imposable_pour_inversion is None:
+        net = simulation.get_array(net_name, period)
+        if net is None:
+            imposable_pour_inversion = simulation.calculate(imposable_name + '_pour_inversion', period.this_year)
+    if imposable_pour_inversion is not None:
+        # Le brut, supposé constant sur l'année, est calculé en une fois pour tous les mois.
+        cible = imposable_pour_inversion / 12
+        input_periods = [period.this_year.first_month.offset(index) for index in range(12)]
+        target_name = imposable_name
+        target_period = period.this_year
+    else:
+        cible = net
+        input_periods = [period]
+        target_name = net_name
+        target_period = period
+    if (cible == 0).all():
+        # Quick path to avoid solving when using default value of input variables.
+        return variable.zeros()
+
+    calculator = TargetCalculator(
+        variable.holder.entity.simulation, brut_name, input_periods, target_name, target_period)
+
+    def calculate_target(brut):
+        return calculator(brut) / len(input_periods)
+
+    guess = encadrement = None
+    if getattr(simulation.tax_benefit_system, 'inversion_analytique', True):
+        points = get_points_de_rupture(simulation.legislation_at(period.start), revenu)
+        valeurs = array([calculate_target(point * ones(len(cible))) for point in points])
+        guess, encadrement = inverse_lineaire_par_morceaux(points, valeurs, cible)
+    brut = inverse_function(calculate_target, cible, guess = guess, encadrement = encadrement)
+
+    holder = variable.holder
+    for input_period in input_periods:
+        if input_period != period and holder.get_array(input_period) is None:
+            holder.put_in_cache(brut, input_period)
+    return brut
+
+
+class salaire_imposable_pour_inversion(Variable):
+    column = columns.FloatCol
+    entity = entities.Individu
+    label = u'Salaire imposable utilisé pour remonter au salaire brut'
+    definition_period = YEAR
+
+
+class chomage_imposable_pour_inversion(Variable):
+    column = columns.FloatCol
+    entity = entities.Individu
+    label = u'Autres revenus imposables (chômage, préretraite), utilisé pour l’inversion'
+    definition_period = YEAR
+
+
+class retraite_imposable_pour_inversion(Variable):
+    column = columns.FloatCol
+    entity = entities.Individu
+    label = u'Pensions, retraites, rentes connues imposables, utilisé pour l’inversion'
+    definition_period = YEAR
+
+
+class salaire_de_base(Variable):
+    column = columns.FloatCol
+    entity = entities.Individu
+    label = u"Salaire brut ou traitement indiciaire brut"
+    url = u"http://www.trader-finance.fr/lexique-finance/definition-lettre-S/Salaire-brut.html"
+    definition_period = MONTH
+
+    def function(self, simulation, period):
+        """Calcule le salaire brut à partir du salaire imposable ou sinon du salaire net.
+
+        Sauf pour les fonctionnaires où il renvoie le traitement indiciaire brut
+        Note : le supplément familial de traitement est imposable.
+        """
+        return calculate_brut(self, simulation, period, 'salaire_de_base', 'salaire_imposable', 'salaire_net',
+            'salaire')
+
+
+class chomage_brut(Variable):
+    column = columns.FloatCol
+    entity = entities.Individu
+    label = u"Allocations chômage brutes"
+    url = u"http://vosdroits.service-public.fr/particuliers/N549.xhtml"
+    definition_period = MONTH
+
+    def function(self, simulation, period):
+        """"Calcule les allocations chômage brutes à partir des allocations imposables ou sinon des allocations nettes.
+        """
+        return calculate_brut(self, simulation, period, 'chomage_brut', 'chomage_imposable', 'chomage_net', 'chomage')
+
+
+class retraite_brute(Variable):
+    column = columns.FloatCol
+    entity = entities.Individu
+    label = u"Pensions de retraite brutes"
+    url = u"http://vosdroits.service-public.fr/particuliers/N20166.xhtml"
+    definition_period = MONTH
+
+    def function(self, simulation, period):
+        """"Calcule les pensions de retraite brutes à partir des pensions imposables ou sinon des pensions nettes.
+        """
+        return calculate_brut(self, simulation, period, 'retraite_brute', 'retraite_imposable', 'retraite_nette',
+            'retraite')
+
+
+class inversion_revenus(Reform):
+    name = u'Inversion des revenus'
+    # Mettre à False pour n'utiliser que l'inversion numérique, sans passer par les points de rupture des barèmes.
+    inversion_analytique = True
+
+    def apply(self):
+        for variable in [
+                chomage_imposable_pour_inversion,
+                retraite_imposable_pour_inversion,
+                salaire_imposable_pour_inversion,
+                ]:
+            self.add_variable(variable)
+        for variable in [chomage_brut, retraite_brute, salaire_de_base]:
+            self.update_variable(variable)
@@ -7,8 +7,10 @@ import logging
 import re
 import uuid
 
-from openfisca_core import conv, scenarios
+import numpy as np
+from openfisca_core import conv, json_to_test_case, scenarios
 from entities import Individu, Famille, FoyerFiscal, Menage
+from variables_manifest import LazyColumnByName, TaxBenefitSystemSubset
 
 
 def N_(message):
@@ -21,45 +23,150 @@ year_or_month_or_day_re = re.compile(ur'(18|19|20)\d{2}(-(0[1-9]|1[0-2])(-([0-2]
 
 class Scenario(scenarios.AbstractScenario):
 
+    def fill_simulation(self, simulation):
+        tax_benefit_system = self.tax_benefit_system
+        if self.test_case is None or not isinstance(tax_benefit_system.column_by_name, LazyColumnByName):
+            return super(Scenario, self).fill_simulation(simulation)
+
+        # With lazily loaded variables, only expose the variables used by the test case, because filling the
+        # simulation iterates over all the columns, which would load every module of the model.
+        variables_name = set(
+            variable_name
+            for entity in tax_benefit_system.entities
+            for entity_member in self.test_case.get(entity.plural) or []
+            for variable_name in entity_member
+            )
+        variables_name.update(
+            axis['name']
+            for parallel_axes in self.axes or []
+            for axis in parallel_axes
+            )
+        self.tax_benefit_system = TaxBenefitSystemSubset(tax_benefit_system, variables_name)
+        try:
+            super(Scenario, self).fill_simulation(simulation)
+        finally:
+            self.tax_benefit_system = tax_benefit_system
+
+    def new_simulation(self, debug = False, debug_all = False, reference = False, trace = False, opt_out_cache = False,
+            profiler = None):
+        """
+        :param profiler: Optional SimulationProfiler (see profiler.py) recording the computations of the simulation.
+            Defaults to the profiler of the tax and benefit system, if any.
+        """
+        simulation = super(Scenario, self).new_simulation(debug = debug, debug_all = debug_all, reference = reference,
+            trace = trace, opt_out_cache = opt_out_cache)
+        if profiler is None:
+            profiler = getattr(simulation.tax_benefit_system, 'profiler', None)
+        if profiler is not None:
+            profiler.attach(simulation)
+        return simulation
+
     def init_single_entity(self, axes = None, enfants = None, famille = None, foyer_fiscal = None, menage = None, parent1 = None, parent2 = None, period = None):
-        if enfants is None:
-            enfants = []
-        assert parent1 is not None
-        famille = famille.copy() if famille is not None else {}
-        foyer_fiscal = foyer_fiscal.copy() if foyer_fiscal is not None else {}
-        individus = []
-        menage = menage.copy() if menage is not None else {}
-        for index, individu in enumerate([parent1, parent2] + (enfants or [])):
-            if individu is None:
-                continue
-            id = individu.get('id')
-            if id is None:
-                individu = individu.copy()
-                individu['id'] = id = 'ind{}'.format(index)
-            individus.append(individu)
-            if index <= 1:
-                famille.setdefault('parents', []).append(id)
-                foyer_fiscal.setdefault('declarants', []).append(id)
-                if index == 0:
-                    menage['personne_de_reference'] = id
-                else:
-                    menage['conjoint'] = id
-            else:
-                famille.setdefault('enfants', []).append(id)
-                foyer_fiscal.setdefault('personnes_a_charge', []).append(id)
-                menage.setdefault('enfants', []).append(id)
         conv.check(self.make_json_or_python_to_attributes())(dict(
             axes = axes,
             period = period,
-            test_case = dict(
-                familles = [famille],
-                foyers_fiscaux = [foyer_fiscal],
-                individus = individus,
-                menages = [menage],
+            test_case = make_single_entity_test_case(
+                enfants = enfants,
+                famille = famille,
+                foyer_fiscal = foyer_fiscal,
+                menage = menage,
+                parent1 = parent1,
+                parent2 = parent2,
                 ),
             ))
         return self
 
+    def init_single_entities(self, single_entities, period = None):
+        """
+        Initialise le scénario avec plusieurs ménages indépendants, pour les calculer dans une seule simulation.
+
+        Chaque ménage est décrit par un dict d'arguments de init_single_entity (sauf axes et period, communs à tous).
+        Les identifiants des individus et des entités sont préfixés par le rang du ménage, et tous les ménages sont
+        validés en une seule fois. Les résultats de la simulation se découpent par ménage avec split_by_single_entity.
+        """
+        test_case = dict(
+            familles = [],
+            foyers_fiscaux = [],
+            individus = [],
+            menages = [],
+            )
+        single_entity_index_by_individu_id = {}
+        for single_entity_index, single_entity in enumerate(single_entities):
+            assert 'axes' not in single_entity and 'period' not in single_entity, \
+                u'axes and period must be given to init_single_entities, not to each single entity'
+            single_entity = single_entity.copy()
+            for key in ('famille', 'foyer_fiscal', 'menage', 'parent1', 'parent2'):
+                if single_entity.get(key) is not None:
+                    single_entity[key] = prefix_id(single_entity[key], single_entity_index, key)
+            single_entity['enfants'] = [
+                prefix_id(enfant, single_entity_index, u'enfant{}'.format(enfant_index))
+                for enfant_index, enfant in enumerate(single_entity.get('enfants') or [])
+                ]
+            single_entity_test_case = make_single_entity_test_case(**single_entity)
+            for key, entity_members in single_entity_test_case.iteritems():
+                test_case[key].extend(entity_members)
+            for individu in single_entity_test_case['individus']:
+                single_entity_index_by_individu_id[individu['id']] = single_entity_index
+
+        conv.check(self.make_json_or_python_to_attributes())(dict(
+            period = period,
+            test_case = test_case,
+            ))
+
+        # Les entités peuvent avoir été réordonnées par la validation : les indices de chaque ménage sont retrouvés
+        # à partir des identifiants de leurs individus.
+        single_entities_count = len(single_entities)
+        self.single_entity_indices_by_entity_key = single_entity_indices_by_entity_key = {}
+        for entity in self.tax_benefit_system.entities:
+            indices_by_single_entity = [[] for _ in range(single_entities_count)]
+            for entity_index, entity_member in enumerate(self.test_case[entity.plural]):
+                if entity.is_person:
+                    individu_id = entity_member['id']
+                else:
+                    individu_id = next(scenarios.iter_over_entity_members(entity, entity_member))[2]
+                indices_by_single_entity[single_entity_index_by_individu_id[individu_id]].append(entity_index)
+            single_entity_indices_by_entity_key[entity.key] = [
+                np.array(indices, dtype = np.int32)
+                for indices in indices_by_single_entity
+                ]
+        return self
+
+    def split_by_single_entity(self, array, entity_key):
+        """
+        Découpe le résultat d'une simulation initialisée par init_single_entities en un tableau par ménage.
+
+        entity_key est la clé de l'entité du tableau (individu, famille, foyer_fiscal ou menage).
+        """
+        return [
+            array[indices]
+            for indices in self.single_entity_indices_by_entity_key[entity_key]
+            ]
+
+    def make_json_or_python_to_test_case(self, period, repair = False):
+        # Same as AbstractScenario.make_json_or_python_to_test_case, but checks the entities in linear time, so that
+        # test cases with many households can be loaded.
+        def json_or_python_to_test_case(value, state = None):
+            if value is None:
+                return value, None
+            if state is None:
+                state = conv.default_state
+
+            test_case = json_to_test_case.check_entities_and_role(value, self.tax_benefit_system, state)
+
+            test_case, error, groupless_persons = check_entities_consistency(test_case, self.tax_benefit_system, state)
+            if error is not None:
+                return test_case, error
+
+            if repair:
+                # Every groupless person is attributed to an entity.
+                test_case = self.attribute_groupless_persons_to_entities(test_case, period, groupless_persons)
+            elif any(groupless_persons.itervalues()):
+                # Let the core function report the persons without entities.
+                return json_to_test_case.check_each_person_has_entities(test_case, self.tax_benefit_system, state)
+
+            return self.post_process_test_case(test_case, period, state)
+
+        return json_or_python_to_test_case
 
     def post_process_test_case(self, test_case, period, state):
 
@@ -153,14 +260,16 @@ class Scenario(scenarios.AbstractScenario):
 
 
     def attribute_groupless_persons_to_entities(self, test_case, period, groupless_individus):
-        individus_without_famille = groupless_individus['familles']
-        individus_without_menage = groupless_individus['menages']
-        individus_without_foyer_fiscal = groupless_individus['foyers_fiscaux']
+        # Dictionnaires ordonnés, pour que les tests d'appartenance et les retraits se fassent en temps constant
+        individus_without_famille = collections.OrderedDict.fromkeys(groupless_individus['familles'])
+        individus_without_menage = collections.OrderedDict.fromkeys(groupless_individus['menages'])
+        individus_without_foyer_fiscal = collections.OrderedDict.fromkeys(groupless_individus['foyers_fiscaux'])
 
         individu_by_id = {
             individu['id']: individu
             for individu in test_case['individus']
             }
+        entity_and_role_index = EntityAndRoleIndex(test_case)
 
         # Affecte à une famille chaque individu qui n'appartient à aucune d'entre elles.
         new_famille = dict(
@@ -168,72 +277,72 @@ class Scenario(scenarios.AbstractScenario):
             parents = [],
             )
         new_famille_id = None
-        for individu_id in individus_without_famille[:]:
+        for individu_id in individus_without_famille.keys():
             # Tente d'affecter l'individu à une famille d'après son foyer fiscal.
-            foyer_fiscal, foyer_fiscal_role = find_foyer_fiscal_and_role(test_case, individu_id)
+            foyer_fiscal, foyer_fiscal_role = entity_and_role_index.find_foyer_fiscal_and_role(individu_id)
             if foyer_fiscal_role == u'declarants' and len(foyer_fiscal[u'declarants']) == 2:
                 for declarant_id in foyer_fiscal[u'declarants']:
                     if declarant_id != individu_id:
-                        famille, other_role = find_famille_and_role(test_case, declarant_id)
+                        famille, other_role = entity_and_role_index.find_famille_and_role(declarant_id)
                         if other_role == u'parents' and len(famille[u'parents']) == 1:
                             # Quand l'individu n'est pas encore dans une famille, mais qu'il est déclarant
                             # dans un foyer fiscal, qu'il y a un autre déclarant dans ce même foyer fiscal
                             # et que cet autre déclarant est seul parent dans sa famille, alors ajoute
                             # l'individu comme autre parent de cette famille.
-                            famille[u'parents'].append(individu_id)
-                            individus_without_famille.remove(individu_id)
+                            entity_and_role_index.add(u'familles', famille, u'parents', individu_id)
+                            del individus_without_famille[individu_id]
                         break
             elif foyer_fiscal_role == u'personnes_a_charge' and foyer_fiscal[u'declarants']:
                 for declarant_id in foyer_fiscal[u'declarants']:
-                    famille, other_role = find_famille_and_role(test_case, declarant_id)
+                    famille, other_role = entity_and_role_index.find_famille_and_role(declarant_id)
                     if other_role == u'parents':
                         # Quand l'individu n'est pas encore dans une famille, mais qu'il est personne à charge
                         # dans un foyer fiscal, qu'il y a un déclarant dans ce foyer fiscal et que ce déclarant
                         # est parent dans sa famille, alors ajoute l'individu comme enfant de cette famille.
-                        famille[u'enfants'].append(individu_id)
-                        individus_without_famille.remove(individu_id)
+                        entity_and_role_index.add(u'familles', famille, u'enfants', individu_id)
+                        del individus_without_famille[individu_id]
                     break
 
             if individu_id in individus_without_famille:
                 # L'individu n'est toujours pas affecté à une famille.
                 # Tente d'affecter l'individu à une famille d'après son ménage.
-                menage, menage_role = find_menage_and_role(test_case, individu_id)
+                menage, menage_role = entity_and_role_index.find_menage_and_role(individu_id)
                 if menage_role == u'personne_de_reference':
                     conjoint_id = menage[u'conjoint']
                     if conjoint_id is not None:
-                        famille, other_role = find_famille_and_role(test_case, conjoint_id)
+                        famille, other_role = entity_and_role_index.find_famille_and_role(conjoint_id)
                         if other_role == u'parents' and len(famille[u'parents']) == 1:
                             # Quand l'individu n'est pas encore dans une famille, mais qu'il est personne de
                             # référence dans un ménage, qu'il y a un conjoint dans ce ménage et que ce
                             # conjoint est seul parent dans sa famille, alors ajoute l'individu comme autre
                             # parent de cette famille.
-                            famille[u'parents'].append(individu_id)
-                            individus_without_famille.remove(individu_id)
+                            entity_and_role_index.add(u'familles', famille, u'parents', individu_id)
+                            del individus_without_famille[individu_id]
                 elif menage_role == u'conjoint':
                     personne_de_reference_id = menage[u'personne_de_reference']
                     if personne_de_reference_id is not None:
-                        famille, other_role = find_famille_and_role(test_case,
+                        famille, other_role = entity_and_role_index.find_famille_and_role(
                             personne_de_reference_id)
                         if other_role == u'parents' and len(famille[u'parents']) == 1:
                             # Quand l'individu n'est pas encore dans une famille, mais qu'il est conjoint
                             # dans un ménage, qu'il y a une personne de référence dans ce ménage et que
                             # cette personne est seul parent dans une famille, alors ajoute l'individu comme
                             # autre parent de cette famille.
-                            famille[u'parents'].append(individu_id)
-                            individus_without_famille.remove(individu_id)
+                            entity_and_role_index.add(u'familles', famille, u'parents', individu_id)
+                            del individus_without_famille[individu_id]
                 elif menage_role == u'enfants' and (menage['personne_de_reference'] is not None
                         or menage[u'conjoint'] is not None):
                     for other_id in (menage['personne_de_reference'], menage[u'conjoint']):
                         if other_id is None:
                             continue
-                        famille, other_role = find_famille_and_role(test_case, other_id)
+                        famille, other_role = entity_and_role_index.find_famille_and_role(other_id)
                         if other_role == u'parents':
                             # Quand l'individu n'est pas encore dans une famille, mais qu'il est enfant dans un
                             # ménage, qu'il y a une personne à charge ou un conjoint dans ce ménage et que
                             # celui-ci est parent dans une famille, alors ajoute l'individu comme enfant de
                             # cette famille.
-                            famille[u'enfants'].append(individu_id)
-                            individus_without_famille.remove(individu_id)
+                            entity_and_role_index.add(u'familles', famille, u'enfants', individu_id)
+                            del individus_without_famille[individu_id]
                         break
 
             if individu_id in individus_without_famille:
@@ -241,13 +350,13 @@ class Scenario(scenarios.AbstractScenario):
                 individu = individu_by_id[individu_id]
                 age = find_age(individu, period.start.date)
                 if len(new_famille[u'parents']) < 2 and (age is None or age >= 18):
-                    new_famille[u'parents'].append(individu_id)
+                    entity_and_role_index.add(u'familles', new_famille, u'parents', individu_id)
                 else:
-                    new_famille[u'enfants'].append(individu_id)
+                    entity_and_role_index.add(u'familles', new_famille, u'enfants', individu_id)
                 if new_famille_id is None:
                     new_famille[u'id'] = new_famille_id = unicode(uuid.uuid4())
                     test_case[u'familles'].append(new_famille)
-                individus_without_famille.remove(individu_id)
+                del individus_without_famille[individu_id]
 
         # Affecte à un foyer fiscal chaque individu qui n'appartient à aucun d'entre eux.
         new_foyer_fiscal = dict(
@@ -255,72 +364,73 @@ class Scenario(scenarios.AbstractScenario):
             personnes_a_charge = [],
             )
         new_foyer_fiscal_id = None
-        for individu_id in individus_without_foyer_fiscal[:]:
+        for individu_id in individus_without_foyer_fiscal.keys():
             # Tente d'affecter l'individu à un foyer fiscal d'après sa famille.
-            famille, famille_role = find_famille_and_role(test_case, individu_id)
+            famille, famille_role = entity_and_role_index.find_famille_and_role(individu_id)
             if famille_role == u'parents' and len(famille[u'parents']) == 2:
                 for parent_id in famille[u'parents']:
                     if parent_id != individu_id:
-                        foyer_fiscal, other_role = find_foyer_fiscal_and_role(test_case, parent_id)
+                        foyer_fiscal, other_role = entity_and_role_index.find_foyer_fiscal_and_role(parent_id)
                         if other_role == u'declarants' and len(foyer_fiscal[u'declarants']) == 1:
                             # Quand l'individu n'est pas encore dans un foyer fiscal, mais qu'il est parent
                             # dans une famille, qu'il y a un autre parent dans cette famille et que cet autre
                             # parent est seul déclarant dans son foyer fiscal, alors ajoute l'individu comme
                             # autre déclarant de ce foyer fiscal.
-                            foyer_fiscal[u'declarants'].append(individu_id)
-                            individus_without_foyer_fiscal.remove(individu_id)
+                            entity_and_role_index.add(u'foyers_fiscaux', foyer_fiscal, u'declarants', individu_id)
+                            del individus_without_foyer_fiscal[individu_id]
                         break
             elif famille_role == u'enfants' and famille[u'parents']:
                 for parent_id in famille[u'parents']:
-                    foyer_fiscal, other_role = find_foyer_fiscal_and_role(test_case, parent_id)
+                    foyer_fiscal, other_role = entity_and_role_index.find_foyer_fiscal_and_role(parent_id)
                     if other_role == u'declarants':
                         # Quand l'individu n'est pas encore dans un foyer fiscal, mais qu'il est enfant dans une
                         # famille, qu'il y a un parent dans cette famille et que ce parent est déclarant dans
                         # son foyer fiscal, alors ajoute l'individu comme personne à charge de ce foyer fiscal.
-                        foyer_fiscal[u'personnes_a_charge'].append(individu_id)
-                        individus_without_foyer_fiscal.remove(individu_id)
+                        entity_and_role_index.add(u'foyers_fiscaux', foyer_fiscal, u'personnes_a_charge', individu_id)
+                        del individus_without_foyer_fiscal[individu_id]
                         break
 
             if individu_id in individus_without_foyer_fiscal:
                 # L'individu n'est toujours pas affecté à un foyer fiscal.
                 # Tente d'affecter l'individu à un foyer fiscal d'après son ménage.
-                menage, menage_role = find_menage_and_role(test_case, individu_id)
+                menage, menage_role = entity_and_role_index.find_menage_and_role(individu_id)
                 if menage_role == u'personne_de_reference':
                     conjoint_id = menage[u'conjoint']
                     if conjoint_id is not None:
-                        foyer_fiscal, other_role = find_foyer_fiscal_and_role(test_case, conjoint_id)
+                        foyer_fiscal, other_role = entity_and_role_index.find_foyer_fiscal_and_role(conjoint_id)
                         if other_role == u'declarants' and len(foyer_fiscal[u'declarants']) == 1:
                             # Quand l'individu n'est pas encore dans un foyer fiscal, mais qu'il est personne de
                             # référence dans un ménage, qu'il y a un conjoint dans ce ménage et que ce
                             # conjoint est seul déclarant dans un foyer fiscal, alors ajoute l'individu comme
                             # autre déclarant de ce foyer fiscal.
-                            foyer_fiscal[u'declarants'].append(individu_id)
-                            individus_without_foyer_fiscal.remove(individu_id)
+                            entity_and_role_index.add(u'foyers_fiscaux', foyer_fiscal, u'declarants', individu_id)
+                            del individus_without_foyer_fiscal[individu_id]
                 elif menage_role == u'conjoint':
                     personne_de_reference_id = menage[u'personne_de_reference']
                     if personne_de_reference_id is not None:
-                        foyer_fiscal, other_role = find_foyer_fiscal_and_role(test_case,
+                        foyer_fiscal, other_role = entity_and_role_index.find_foyer_fiscal_and_role(
                             personne_de_reference_id)
                         if other_role == u'declarants' and len(foyer_fiscal[u'declarants']) == 1:
                             # Quand l'individu n'est pas encore dans un foyer fiscal, mais qu'il est conjoint
                             # dans un ménage, qu'il y a une personne de référence dans ce ménage et que
                             # cette personne est seul déclarant dans un foyer fiscal, alors ajoute l'individu
                             # comme autre déclarant de ce foyer fiscal.
-                            foyer_fiscal[u'declarants'].append(individu_id)
-                            individus_without_foyer_fiscal.remove(individu_id)
+                            entity_and_role_index.add(u'foyers_fiscaux', foyer_fiscal, u'declarants', individu_id)
+                            del individus_without_foyer_fiscal[individu_id]
                 elif menage_role == u'enfants' and (menage['personne_de_reference'] is not None
                         or menage[u'conjoint'] is not None):
                     for other_id in (menage['personne_de_reference'], menage[u'conjoint']):
                         if other_id is None:
                             continue
-                        foyer_fiscal, other_role = find_foyer_fiscal_and_role(test_case, other_id)
+                        foyer_fiscal, other_role = entity_and_role_index.find_foyer_fiscal_and_role(other_id)
                         if other_role == u'declarants':
                             # Quand l'individu n'est pas encore dans un foyer fiscal, mais qu'il est enfant dans
                             # un ménage, qu'il y a une personne à charge ou un conjoint dans ce ménage et que
                             # celui-ci est déclarant dans un foyer fiscal, alors ajoute l'individu comme
                             # personne à charge de ce foyer fiscal.
-                            foyer_fiscal[u'declarants'].append(individu_id)
-                            individus_without_foyer_fiscal.remove(individu_id)
+                            entity_and_role_index.add(u'foyers_fiscaux', foyer_fiscal, u'personnes_a_charge',
+                                individu_id)
+                            del individus_without_foyer_fiscal[individu_id]
                             break
 
             if individu_id in individus_without_foyer_fiscal:
@@ -328,13 +438,13 @@ class Scenario(scenarios.AbstractScenario):
                 individu = individu_by_id[individu_id]
                 age = find_age(individu, period.start.date)
                 if len(new_foyer_fiscal[u'declarants']) < 2 and (age is None or age >= 18):
-                    new_foyer_fiscal[u'declarants'].append(individu_id)
+                    entity_and_role_index.add(u'foyers_fiscaux', new_foyer_fiscal, u'declarants', individu_id)
                 else:
-                    new_foyer_fiscal[u'personnes_a_charge'].append(individu_id)
+                    entity_and_role_index.add(u'foyers_fiscaux', new_foyer_fiscal, u'personnes_a_charge', individu_id)
                 if new_foyer_fiscal_id is None:
                     new_foyer_fiscal[u'id'] = new_foyer_fiscal_id = unicode(uuid.uuid4())
                     test_case[u'foyers_fiscaux'].append(new_foyer_fiscal)
-                individus_without_foyer_fiscal.remove(individu_id)
+                del individus_without_foyer_fiscal[individu_id]
 
         # Affecte à un ménage chaque individu qui n'appartient à aucun d'entre eux.
 
@@ -344,8 +454,8 @@ class Scenario(scenarios.AbstractScenario):
         if famille and menage:
             parent_1 = famille['parents'][0]
             if not menage.get('personne_de_reference') and parent_1 in individus_without_menage:
-                menage['personne_de_reference'] = parent_1
-                individus_without_menage.remove(parent_1)
+                entity_and_role_index.add(u'menages', menage, u'personne_de_reference', parent_1)
+                del individus_without_menage[parent_1]
 
         new_menage = dict(
             autres = [],
@@ -354,89 +464,89 @@ class Scenario(scenarios.AbstractScenario):
             personne_de_reference = None,
             )
         new_menage_id = None
-        for individu_id in individus_without_menage[:]:
+        for individu_id in individus_without_menage.keys():
             # Tente d'affecter l'individu à un ménage d'après sa famille.
-            famille, famille_role = find_famille_and_role(test_case, individu_id)
+            famille, famille_role = entity_and_role_index.find_famille_and_role(individu_id)
             if famille_role == u'parents' and len(famille[u'parents']) == 2:
                 for parent_id in famille[u'parents']:
                     if parent_id != individu_id:
-                        menage, other_role = find_menage_and_role(test_case, parent_id)
+                        menage, other_role = entity_and_role_index.find_menage_and_role(parent_id)
                         if other_role == u'personne_de_reference' and menage[u'conjoint'] is None:
                             # Quand l'individu n'est pas encore dans un ménage, mais qu'il est parent
                             # dans une famille, qu'il y a un autre parent dans cette famille et que cet autre
                             # parent est personne de référence dans un ménage et qu'il n'y a pas de conjoint
                             # dans ce ménage, alors ajoute l'individu comme conjoint de ce ménage.
-                            menage[u'conjoint'] = individu_id
-                            individus_without_menage.remove(individu_id)
+                            entity_and_role_index.add(u'menages', menage, u'conjoint', individu_id)
+                            del individus_without_menage[individu_id]
                         elif other_role == u'conjoint' and menage[u'personne_de_reference'] is None:
                             # Quand l'individu n'est pas encore dans un ménage, mais qu'il est parent
                             # dans une famille, qu'il y a un autre parent dans cette famille et que cet autre
                             # parent est conjoint dans un ménage et qu'il n'y a pas de personne de référence
                             # dans ce ménage, alors ajoute l'individu comme personne de référence de ce ménage.
-                            menage[u'personne_de_reference'] = individu_id
-                            individus_without_menage.remove(individu_id)
+                            entity_and_role_index.add(u'menages', menage, u'personne_de_reference', individu_id)
+                            del individus_without_menage[individu_id]
                         break
             elif famille_role == u'enfants' and famille[u'parents']:
                 for parent_id in famille[u'parents']:
-                    menage, other_role = find_menage_and_role(test_case, parent_id)
+                    menage, other_role = entity_and_role_index.find_menage_and_role(parent_id)
                     if other_role in (u'personne_de_reference', u'conjoint'):
                         # Quand l'individu n'est pas encore dans un ménage, mais qu'il est enfant dans une
                         # famille, qu'il y a un parent dans cette famille et que ce parent est personne de
                         # référence ou conjoint dans un ménage, alors ajoute l'individu comme enfant de ce
                         # ménage.
-                        menage[u'enfants'].append(individu_id)
-                        individus_without_menage.remove(individu_id)
+                        entity_and_role_index.add(u'menages', menage, u'enfants', individu_id)
+                        del individus_without_menage[individu_id]
                         break
 
             if individu_id in individus_without_menage:
                 # L'individu n'est toujours pas affecté à un ménage.
                 # Tente d'affecter l'individu à un ménage d'après son foyer fiscal.
-                foyer_fiscal, foyer_fiscal_role = find_foyer_fiscal_and_role(test_case, individu_id)
+                foyer_fiscal, foyer_fiscal_role = entity_and_role_index.find_foyer_fiscal_and_role(individu_id)
                 if foyer_fiscal_role == u'declarants' and len(foyer_fiscal[u'declarants']) == 2:
                     for declarant_id in foyer_fiscal[u'declarants']:
                         if declarant_id != individu_id:
-                            menage, other_role = find_menage_and_role(test_case, declarant_id)
+                            menage, other_role = entity_and_role_index.find_menage_and_role(declarant_id)
                             if other_role == u'personne_de_reference' and menage[u'conjoint'] is None:
                                 # Quand l'individu n'est pas encore dans un ménage, mais qu'il est déclarant
                                 # dans un foyer fiscal, qu'il y a un autre déclarant dans ce foyer fiscal et que
                                 # cet autre déclarant est personne de référence dans un ménage et qu'il n'y a
                                 # pas de conjoint dans ce ménage, alors ajoute l'individu comme conjoint de ce
                                 # ménage.
-                                menage[u'conjoint'] = individu_id
-                                individus_without_menage.remove(individu_id)
+                                entity_and_role_index.add(u'menages', menage, u'conjoint', individu_id)
+                                del individus_without_menage[individu_id]
                             elif other_role == u'conjoint' and menage[u'personne_de_reference'] is None:
                                 # Quand l'individu n'est pas encore dans un ménage, mais qu'il est déclarant
                                 # dans une foyer fiscal, qu'il y a un autre déclarant dans ce foyer fiscal et
                                 # que cet autre déclarant est conjoint dans un ménage et qu'il n'y a pas de
                                 # personne de référence dans ce ménage, alors ajoute l'individu comme personne
                                 # de référence de ce ménage.
-                                menage[u'personne_de_reference'] = individu_id
-                                individus_without_menage.remove(individu_id)
+                                entity_and_role_index.add(u'menages', menage, u'personne_de_reference', individu_id)
+                                del individus_without_menage[individu_id]
                             break
                 elif foyer_fiscal_role == u'personnes_a_charge' and foyer_fiscal[u'declarants']:
                     for declarant_id in foyer_fiscal[u'declarants']:
-                        menage, other_role = find_menage_and_role(test_case, declarant_id)
+                        menage, other_role = entity_and_role_index.find_menage_and_role(declarant_id)
                         if other_role in (u'personne_de_reference', u'conjoint'):
                             # Quand l'individu n'est pas encore dans un ménage, mais qu'il est personne à charge
                             # dans un foyer fiscal, qu'il y a un déclarant dans ce foyer fiscal et que ce
                             # déclarant est personne de référence ou conjoint dans un ménage, alors ajoute
                             # l'individu comme enfant de ce ménage.
-                            menage[u'enfants'].append(individu_id)
-                            individus_without_menage.remove(individu_id)
+                            entity_and_role_index.add(u'menages', menage, u'enfants', individu_id)
+                            del individus_without_menage[individu_id]
                             break
 
             if individu_id in individus_without_menage:
                 # L'individu n'est toujours pas affecté à un ménage.
                 if new_menage[u'personne_de_reference'] is None:
-                    new_menage[u'personne_de_reference'] = individu_id
+                    entity_and_role_index.add(u'menages', new_menage, u'personne_de_reference', individu_id)
                 elif new_menage[u'conjoint'] is None:
-                    new_menage[u'conjoint'] = individu_id
+                    entity_and_role_index.add(u'menages', new_menage, u'conjoint', individu_id)
                 else:
-                    new_menage[u'enfants'].append(individu_id)
+                    entity_and_role_index.add(u'menages', new_menage, u'enfants', individu_id)
                 if new_menage_id is None:
                     new_menage[u'id'] = new_menage_id = unicode(uuid.uuid4())
                     test_case[u'menages'].append(new_menage)
-                individus_without_menage.remove(individu_id)
+                del individus_without_menage[individu_id]
 
         return test_case
 
@@ -451,51 +561,171 @@ class Scenario(scenarios.AbstractScenario):
         period_start_year = self.period.start.year
         suggestions = dict()
 
-        for individu in test_case['individus']:
-            individu_id = individu['id']
-            if individu.get('age') is None and individu.get('age_en_mois') is None and individu.get('date_naissance') is None:
-                # Add missing date_naissance date to person (a parent is 40 years old and a child is 10 years old.
-                is_parent = any(individu_id in famille['parents'] for famille in test_case['familles'])
-                birth_year = period_start_year - 40 if is_parent else period_start_year - 10
-                date_naissance = datetime.date(birth_year, 1, 1)
-                individu['date_naissance'] = date_naissance
-                suggestions.setdefault('test_case', {}).setdefault('individus', {}).setdefault(individu_id, {})[
-                    'date_naissance'] = date_naissance.isoformat()
-            if individu.get('activite') is None:
-                if find_age(individu, period_start_date) < 16:
-                    individu['activite'] = 2  # Étudiant, élève
-                    suggestions.setdefault('test_case', {}).setdefault('individus', {}).setdefault(individu_id, {})[
-                        'activite'] = u'2'  # Étudiant, élève
-
-        individu_by_id = {
-            individu['id']: individu
-            for individu in test_case['individus']
+        # Les suggestions sont calculées sur des colonnes (une valeur par individu ou par foyer fiscal), pour que les
+        # cas tests comportant beaucoup de ménages ne soient pas ralentis.
+        individus = test_case['individus']
+        parents_id = set(
+            parent_id
+            for famille in test_case['familles']
+            for parent_id in famille['parents']
+            )
+        is_parent = np.array([individu['id'] in parents_id for individu in individus], dtype = bool)
+        has_no_age = np.array(
+            [
+                individu.get('age') is None and individu.get('age_en_mois') is None
+                and individu.get('date_naissance') is None
+                for individu in individus
+                ],
+            dtype = bool,
+            )
+        has_no_activite = np.array([individu.get('activite') is None for individu in individus], dtype = bool)
+
+        # Add missing date_naissance date to person (a parent is 40 years old and a child is 10 years old.
+        birth_year = np.where(is_parent, period_start_year - 40, period_start_year - 10)
+        for index in np.flatnonzero(has_no_age):
+            individu = individus[index]
+            date_naissance = datetime.date(int(birth_year[index]), 1, 1)
+            individu['date_naissance'] = date_naissance
+            suggestions.setdefault('test_case', {}).setdefault('individus', {}).setdefault(individu['id'], {})[
+                'date_naissance'] = date_naissance.isoformat()
+
+        # Comme avec find_age(...) < 16, une personne sans âge (NaN, remplacé par 0) a moins de 16 ans.
+        age = np.nan_to_num(find_age_column(individus, period_start_date))
+        for index in np.flatnonzero(has_no_activite * (age < 16)):
+            individu = individus[index]
+            individu['activite'] = 2  # Étudiant, élève
+            suggestions.setdefault('test_case', {}).setdefault('individus', {}).setdefault(individu['id'], {})[
+                'activite'] = u'2'  # Étudiant, élève
+
+        individu_index_by_id = {
+            individu['id']: index
+            for index, individu in enumerate(individus)
             }
-
-        for foyer_fiscal in test_case['foyers_fiscaux']:
-            if len(foyer_fiscal['declarants']) == 1 and foyer_fiscal['personnes_a_charge']:
-                # Suggest "parent isolé" when foyer_fiscal contains a single "declarant" with "personnes_a_charge".
-                if foyer_fiscal.get('caseT') is None:
-                    suggestions.setdefault('test_case', {}).setdefault('foyers_fiscaux', {}).setdefault(
-                        foyer_fiscal['id'], {})['caseT'] = foyer_fiscal['caseT'] = True
-            elif len(foyer_fiscal['declarants']) == 2:
-                # Suggest "PACSé" or "Marié" instead of "Célibataire" when foyer_fiscal contains 2 "declarants" without
-                # "statut_marital".
-                statut_marital = 5  # PACSé
-                for individu_id in foyer_fiscal['declarants']:
-                    individu = individu_by_id[individu_id]
-                    if individu.get('statut_marital') == 1:  # Marié
-                        statut_marital = 1
-                for individu_id in foyer_fiscal['declarants']:
-                    individu = individu_by_id[individu_id]
-                    if individu.get('statut_marital') is None:
-                        individu['statut_marital'] = statut_marital
-                        suggestions.setdefault('test_case', {}).setdefault('individus', {}).setdefault(individu_id, {})[
-                            'statut_marital'] = unicode(statut_marital)
+        foyers_fiscaux = test_case['foyers_fiscaux']
+        nb_declarants = np.array([len(foyer_fiscal['declarants']) for foyer_fiscal in foyers_fiscaux], dtype = int)
+        has_personnes_a_charge = np.array(
+            [bool(foyer_fiscal['personnes_a_charge']) for foyer_fiscal in foyers_fiscaux], dtype = bool)
+        has_no_case_t = np.array([foyer_fiscal.get('caseT') is None for foyer_fiscal in foyers_fiscaux], dtype = bool)
+
+        # Suggest "parent isolé" when foyer_fiscal contains a single "declarant" with "personnes_a_charge".
+        for index in np.flatnonzero((nb_declarants == 1) * has_personnes_a_charge * has_no_case_t):
+            foyer_fiscal = foyers_fiscaux[index]
+            suggestions.setdefault('test_case', {}).setdefault('foyers_fiscaux', {}).setdefault(
+                foyer_fiscal['id'], {})['caseT'] = foyer_fiscal['caseT'] = True
+
+        # Suggest "PACSé" or "Marié" instead of "Célibataire" when foyer_fiscal contains 2 "declarants" without
+        # "statut_marital".
+        couples = np.flatnonzero(nb_declarants == 2)
+        if len(couples) > 0:
+            # 1 : Marié, 0 : autre statut, -1 : pas de statut
+            statut_marital_code = np.array(
+                [
+                    -1 if statut_marital is None else int(statut_marital == 1)
+                    for statut_marital in (individu.get('statut_marital') for individu in individus)
+                    ],
+                dtype = int,
+                )
+            declarants_index = np.array(
+                [
+                    [individu_index_by_id[individu_id] for individu_id in foyers_fiscaux[index]['declarants']]
+                    for index in couples
+                    ],
+                dtype = int,
+                )
+            declarants_code = statut_marital_code[declarants_index]
+            statut_marital_suggere = np.where((declarants_code == 1).any(axis = 1), 1, 5)  # Marié ou PACSé
+            for couple_index, declarant_index in zip(*np.nonzero(declarants_code == -1)):
+                individu_index = declarants_index[couple_index, declarant_index]
+                individu = individus[individu_index]
+                statut_marital = int(statut_marital_suggere[couple_index])
+                individu['statut_marital'] = statut_marital
+                suggestions.setdefault('test_case', {}).setdefault('individus', {}).setdefault(individu['id'], {})[
+                    'statut_marital'] = unicode(statut_marital)
 
         return suggestions or None
 
 
+# Test case checks
+
+
+def check_entities_consistency(test_case, tax_benefit_system, state):
+    """Same as openfisca_core.json_to_test_case.check_entities_consistency, in linear time.
+
+    The core function removes each member from a list of the remaining persons, which is quadratic in the number of
+    persons. When the test case is invalid, the core function is called, to report the same errors.
+    """
+    persons_id = [person['id'] for person in test_case[tax_benefit_system.person_entity.plural]]
+    if len(set(persons_id)) != len(persons_id):
+        return json_to_test_case.check_entities_consistency(test_case, tax_benefit_system, state)
+    groupless_persons = {}
+    for entity in tax_benefit_system.group_entities:
+        remaining_persons_id = set(persons_id)
+        for entity_json in test_case.get(entity.plural) or []:
+            for role in entity.roles:
+                if role.max == 1:
+                    # Like the core converters, set missing unique roles to None.
+                    members_id = [entity_json.setdefault(role.key, None)]
+                else:
+                    members_id = entity_json.get(role.plural) or []
+                for member_id in members_id:
+                    if member_id is None:
+                        continue
+                    if member_id not in remaining_persons_id:
+                        return json_to_test_case.check_entities_consistency(test_case, tax_benefit_system, state)
+                    remaining_persons_id.remove(member_id)
+        groupless_persons[entity.plural] = [
+            person_id
+            for person_id in persons_id
+            if person_id in remaining_persons_id
+            ]
+    return test_case, None, groupless_persons
+
+
+# Single entity test cases
+
+
+def make_single_entity_test_case(enfants = None, famille = None, foyer_fiscal = None, menage = None, parent1 = None,
+        parent2 = None):
+    if enfants is None:
+        enfants = []
+    assert parent1 is not None
+    famille = famille.copy() if famille is not None else {}
+    foyer_fiscal = foyer_fiscal.copy() if foyer_fiscal is not None else {}
+    individus = []
+    menage = menage.copy() if menage is not None else {}
+    for index, individu in enumerate([parent1, parent2] + (enfants or [])):
+        if individu is None:
+            continue
+        id = individu.get('id')
+        if id is None:
+            individu = individu.copy()
+            individu['id'] = id = 'ind{}'.format(index)
+        individus.append(individu)
+        if index <= 1:
+            famille.setdefault('parents', []).append(id)
+            foyer_fiscal.setdefault('declarants', []).append(id)
+            if index == 0:
+                menage['personne_de_reference'] = id
+            else:
+                menage['conjoint'] = id
+        else:
+            famille.setdefault('enfants', []).append(id)
+            foyer_fiscal.setdefault('personnes_a_charge', []).append(id)
+            menage.setdefault('enfants', []).append(id)
+    return dict(
+        familles = [famille],
+        foyers_fiscaux = [foyer_fiscal],
+        individus = individus,
+        menages = [menage],
+        )
+
+
+def prefix_id(entity_json, single_entity_index, default_id):
+    entity_json = entity_json.copy()
+    entity_json['id'] = u'{}-{}'.format(single_entity_index, entity_json.get('id') or default_id)
+    return entity_json
+
+
 # Finders
 
 
@@ -524,6 +754,28 @@ def find_age(individu, date, default = None):
     return default
 
 
+def find_age_column(individus, date):
+    """Vectorized find_age: return an array of the ages of individus at date, with NaN when an age is unknown."""
+    date_naissance_columns = ([], [], [])
+    age_columns = ([], [])
+    for individu in individus:
+        values = []
+        for key in ('date_naissance', 'age', 'age_en_mois'):
+            value = individu.get(key)
+            if isinstance(value, dict):
+                value = value.values()[0] if value else None
+            values.append(value)
+        date_naissance, age, age_en_mois = values
+        for column, attribute in zip(date_naissance_columns, ('year', 'month', 'day')):
+            column.append(getattr(date_naissance, attribute) if date_naissance is not None else 0)
+        for column, value in zip(age_columns, (age, age_en_mois)):
+            column.append(value if value is not None else np.nan)
+    year, month, day = [np.array(column, dtype = int) for column in date_naissance_columns]
+    age, age_en_mois = [np.array(column, dtype = float) for column in age_columns]
+    age_at_date = date.year - year - ((date.month < month) + (date.month == month) * (date.day < day))
+    return np.where(year > 0, age_at_date, np.where(np.isnan(age), age_en_mois / 12.0, age))
+
+
 def find_famille_and_role(test_case, individu_id):
     for famille in test_case['familles']:
         for role in (u'parents', u'enfants'):
@@ -549,3 +801,48 @@ def find_menage_and_role(test_case, individu_id):
             if individu_id in menage[role]:
                 return menage, role
     return None, None
+
+
+class EntityAndRoleIndex(object):
+    """Index of the famille, foyer fiscal and ménage (and role) of each individu of a test case.
+
+    Equivalent to find_famille_and_role, find_foyer_fiscal_and_role and find_menage_and_role, without scanning every
+    entity for each individu. Entities must be updated with method add, for the index to stay up to date.
+    """
+
+    def __init__(self, test_case):
+        self.entity_and_role_by_individu_id_by_key = dict(
+            familles = {},
+            foyers_fiscaux = {},
+            menages = {},
+            )
+        for key, roles in (
+                (u'familles', (u'parents', u'enfants')),
+                (u'foyers_fiscaux', (u'declarants', u'personnes_a_charge')),
+                (u'menages', (u'personne_de_reference', u'conjoint', u'enfants', u'autres')),
+                ):
+            entity_and_role_by_individu_id = self.entity_and_role_by_individu_id_by_key[key]
+            for entity in test_case[key]:
+                for role in roles:
+                    individus_id = entity.get(role)
+                    if not isinstance(individus_id, list):
+                        individus_id = [] if individus_id is None else [individus_id]
+                    for individu_id in individus_id:
+                        # Like the linear finders, keep the first entity & role found.
+                        entity_and_role_by_individu_id.setdefault(individu_id, (entity, role))
+
+    def add(self, key, entity, role, individu_id):
+        if isinstance(entity[role], list):
+            entity[role].append(individu_id)
+        else:
+            entity[role] = individu_id
+        self.entity_and_role_by_individu_id_by_key[key].setdefault(individu_id, (entity, role))
+
+    def find_famille_and_role(self, individu_id):
+        return self.entity_and_role_by_individu_id_by_key[u'familles'].get(individu_id, (None, None))
+
+    def find_foyer_fiscal_and_role(self, individu_id):
+        return self.entity_and_role_by_individu_id_by_key[u'foyers_fiscaux'].get(individu_id, (None, None))
+
+    def find_menage_and_role(self, individu_id):
+        return self.entity_and_role_by_individu_id_by_key[u'menages'].get(individu_id, (None, None))
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic populations of the benchmarks and scaling tests.
+
+The households are drawn from a seeded random generator, with rough joint distributions of the French population
+(household composition, ages, marital status, activity and employee category by age, salaries by category, pensions,
+housing tenure by age, rent by commune and household size). They are written directly in the holders of a
+simulation, one whole array per variable and period, so that building a simulation stays linear in its size.
+"""
+
+
+import numpy as np
+from openfisca_core import periods, simulations
+
+
+# Household types: (probability, couple, with children)
+household_types = [
+    (.36, False, False),
+    (.09, False, True),
+    (.28, True, False),
+    (.27, True, True),
+    ]
+# Number of children of the households with children
+children_count_probabilities = [.45, .38, .13, .04]
+
+# Age of the reference person of the households without children: (probability, min, max), for singles and couples
+age_ranges_by_couple = {
+    False: [(.30, 20, 35), (.30, 35, 62), (.40, 62, 92)],
+    True: [(.20, 22, 35), (.25, 35, 62), (.55, 62, 92)],
+    }
+
+# Employee categories (enum of categorie_salarie): (probability, median monthly gross salary, sigma of its logarithm)
+PUBLIC_TITULAIRE_ETAT = 2
+PUBLIC_NON_TITULAIRE = 6
+employee_categories = [
+    (.55, 2000., .35),  # prive_non_cadre
+    (.17, 4200., .45),  # prive_cadre
+    (.08, 2700., .30),  # public_titulaire_etat
+    (.01, 2500., .25),  # public_titulaire_militaire
+    (.07, 2100., .25),  # public_titulaire_territoriale
+    (.06, 2400., .30),  # public_titulaire_hospitaliere
+    (.06, 1800., .35),  # public_non_titulaire
+    ]
+smic_mensuel_brut = 1466.62
+part_time_probability = .18
+
+# Communes (depcom): (weight, rent by square meter). The small towns stand for all the communes of zone 3.
+communes = [
+    ('75056', .034, 25.),  # Paris
+    ('92012', .010, 21.),  # Boulogne-Billancourt
+    ('93066', .012, 15.),  # Saint-Denis
+    ('94028', .010, 15.),  # Créteil
+    ('13055', .013, 12.),  # Marseille
+    ('69123', .012, 13.),  # Lyon
+    ('31555', .010, 11.),  # Toulouse
+    ('06088', .010, 14.),  # Nice
+    ('44109', .010, 11.),  # Nantes
+    ('67482', .009, 10.),  # Strasbourg
+    ('33063', .009, 12.),  # Bordeaux
+    ('59350', .009, 11.),  # Lille
+    ('35238', .008, 10.),  # Rennes
+    ('63113', .030, 9.),  # Clermont-Ferrand
+    ('21231', .030, 9.),  # Dijon
+    ('87085', .030, 8.),  # Limoges
+    ('86194', .030, 8.),  # Poitiers
+    ('80021', .030, 8.),  # Amiens
+    ('24322', .110, 7.),  # Périgueux
+    ('23096', .100, 6.),  # Guéret
+    ('48095', .100, 6.),  # Mende
+    ('15014', .100, 6.),  # Aurillac
+    ('12202', .100, 7.),  # Rodez
+    ('56260', .100, 7.),  # Vannes
+    ('62041', .084, 7.),  # Arras
+    ]
+
+# Enums
+ACTIF_OCCUPE, CHOMEUR, ETUDIANT, RETRAITE, AUTRE_INACTIF = range(5)
+MARIE, CELIBATAIRE, DIVORCE, VEUF, PACSE = range(1, 6)
+ACCEDANT, PROPRIETAIRE, LOCATAIRE_HLM, LOCATAIRE_VIDE, LOCATAIRE_MEUBLE, LOGE_GRATUITEMENT = range(1, 7)
+TEMPS_PARTIEL = 1
+
+
+class Population(object):
+    """Persons, entities memberships and inputs of a synthetic population."""
+
+    def __init__(self, persons_count, members_entity_id_by_key, members_legacy_role_by_key, inputs):
+        self.persons_count = persons_count
+        self.members_entity_id_by_key = members_entity_id_by_key
+        self.members_legacy_role_by_key = members_legacy_role_by_key
+        self.inputs = inputs  # List of (variable name, period, array)
+
+    def build_simulation(self, tax_benefit_system, year, **simulation_kwargs):
+        simulation = simulations.Simulation(period = periods.period(year), tax_benefit_system = tax_benefit_system,
+            **simulation_kwargs)
+        set_entities(simulation, self.persons_count, self.members_entity_id_by_key, self.members_legacy_role_by_key)
+        for variable_name, period, array in self.inputs:
+            set_input(simulation, variable_name, period, array)
+        return simulation
+
+
+def build_simulation(tax_benefit_system, households_count, year, seed = 0, **simulation_kwargs):
+    """Return a simulation of a synthetic population of `households_count` households (see generate_population)."""
+    return generate_population(households_count, year, seed = seed).build_simulation(tax_benefit_system, year,
+        **simulation_kwargs)
+
+
+def choose(random, probabilities, size):
+    """Draw `size` indices of `probabilities`."""
+    cumulated_probabilities = np.cumsum(probabilities)
+    return np.searchsorted(cumulated_probabilities / cumulated_probabilities[-1], random.uniform(size = size),
+        side = 'right')
+
+
+def uniform_by_range(random, ranges, size):
+    """Draw `size` values, uniformly in one of the (probability, min, max) ranges."""
+    range_index = choose(random, [probability for probability, _, _ in ranges], size)
+    minimums = np.array([minimum for _, minimum, _ in ranges], dtype = float)[range_index]
+    maximums = np.array([maximum for _, _, maximum in ranges], dtype = float)[range_index]
+    return random.uniform(minimums, maximums)
+
+
+def generate_population(households_count, year, seed = 0):
+    """
+    Generate a synthetic population of `households_count` households, with their incomes of `year` and of the two
+    previous years (used by the means-tested benefits).
+
+    Each household is a ménage and a famille. Married or pacsed couples file one tax return, other adults file their
+    own, and the children are dependants of the reference person. The same seed always gives the same population.
+    """
+    random = np.random.RandomState(seed)
+    year = periods.period(year).this_year
+
+    # Households composition
+    household_type = choose(random, [probability for probability, _, _ in household_types], households_count)
+    couple = np.array([couple for _, couple, _ in household_types])[household_type]
+    with_children = np.array([with_children for _, _, with_children in household_types])[household_type]
+    children_count = np.where(with_children, choose(random, children_count_probabilities, households_count) + 1, 0)
+    adults_count = 1 + couple
+    household_size = adults_count + children_count
+    persons_count = int(household_size.sum())
+
+    # Reference person and spouse ages (in years, at the start of the year)
+    reference_age = np.where(
+        with_children,
+        np.clip(random.normal(38, 7, households_count), 20, 58),
+        np.where(
+            couple,
+            uniform_by_range(random, age_ranges_by_couple[True], households_count),
+            uniform_by_range(random, age_ranges_by_couple[False], households_count),
+            ),
+        )
+    reference_age = np.floor(reference_age)
+    spouse_age = np.floor(np.clip(reference_age + random.normal(-2, 4, households_count), 18, 95))
+    married = couple & (random.uniform(size = households_count) < .7)
+    pacsed = married & (random.uniform(size = households_count) < .15)
+
+    # Persons, ordered by household: reference person, spouse, children
+    household_id = np.repeat(np.arange(households_count, dtype = np.int32), household_size)
+    first_person = np.cumsum(household_size) - household_size
+    rank = np.arange(persons_count, dtype = np.int32) - np.repeat(first_person, household_size)
+    is_reference = rank == 0
+    is_spouse = (rank == 1) & couple[household_id]
+    is_adult = is_reference | is_spouse
+    child_rank = rank - adults_count[household_id]
+    is_child = child_rank >= 0
+    max_child_age = np.minimum(20, reference_age - 18)[household_id]
+    age = np.where(is_reference, reference_age[household_id], spouse_age[household_id])
+    age[is_child] = np.floor(random.uniform(0, max_child_age[is_child] + 1))
+    date_naissance = np.datetime64(str(year.start)) - (
+        (age * 365.25).astype(np.int64) + random.randint(1, 365, size = persons_count)
+        ).astype('timedelta64[D]')
+
+    # Entities
+    legacy_role = np.where(is_child, 2 + child_rank, is_spouse.astype(np.int32))
+    separate_spouse = is_spouse & ~married[household_id]
+    foyer_fiscal_count_by_household = 1 + (couple & ~married)
+    foyer_fiscal_id = np.repeat(np.cumsum(foyer_fiscal_count_by_household) - foyer_fiscal_count_by_household,
+        household_size) + separate_spouse
+    members_entity_id_by_key = dict(
+        famille = household_id,
+        foyer_fiscal = foyer_fiscal_id,
+        menage = household_id,
+        )
+    members_legacy_role_by_key = dict(
+        famille = legacy_role,
+        foyer_fiscal = np.where(separate_spouse, 0, legacy_role),
+        menage = legacy_role,
+        )
+
+    # Marital status
+    statut_marital = np.full(persons_count, CELIBATAIRE, dtype = np.int16)
+    statut_marital[is_adult & married[household_id]] = MARIE
+    statut_marital[is_adult & pacsed[household_id]] = PACSE
+    single = is_reference & ~couple[household_id]
+    draw = random.uniform(size = persons_count)
+    statut_marital[single & (age >= 70) & (draw < .45)] = VEUF
+    statut_marital[single & (age >= 35) & (draw >= .45) & (draw < .7)] = DIVORCE
+
+    # Activity, by age
+    draw = random.uniform(size = persons_count)
+    activite = np.where(is_child, ETUDIANT, AUTRE_INACTIF)
+    working_age = is_adult & (age < 62)
+    student = working_age & (age < 25) & (draw < .4)
+    activite[working_age & (draw < .80)] = CHOMEUR
+    activite[working_age & (draw < .72)] = ACTIF_OCCUPE
+    activite[student] = ETUDIANT
+    activite[is_adult & (age >= 62)] = RETRAITE
+    employed = activite == ACTIF_OCCUPE
+    is_retired = activite == RETRAITE
+    unemployed = activite == CHOMEUR
+
+    # Salaries, by employee category
+    categorie_salarie = np.zeros(persons_count, dtype = np.int16)
+    categorie_salarie[employed] = choose(random, [probability for probability, _, _ in employee_categories],
+        employed.sum())
+    median_salary = np.array([median for _, median, _ in employee_categories])[categorie_salarie]
+    sigma = np.array([sigma for _, _, sigma in employee_categories])[categorie_salarie]
+    full_time_salary = np.maximum(smic_mensuel_brut,
+        median_salary * np.exp(sigma * random.normal(size = persons_count)))
+    part_time = employed & (random.uniform(size = persons_count) < part_time_probability)
+    working_time = np.where(part_time, random.uniform(.4, .9, size = persons_count), 1.)
+    monthly_salary = np.where(employed, full_time_salary * working_time, 0.)
+    titulaire = employed & (categorie_salarie >= PUBLIC_TITULAIRE_ETAT) & (categorie_salarie < PUBLIC_NON_TITULAIRE)
+    salaire_de_base = np.where(titulaire, 0., monthly_salary)
+    traitement_indiciaire_brut = np.where(titulaire, monthly_salary, 0.)
+
+    # Replacement incomes
+    monthly_pension = np.where(is_retired, np.exp(np.log(1400) + .45 * random.normal(size = persons_count)), 0.)
+    monthly_unemployment_benefit = np.where(unemployed & (random.uniform(size = persons_count) < .6),
+        np.exp(np.log(1100) + .4 * random.normal(size = persons_count)), 0.)
+
+    # Housing, by age of the reference person and household size
+    commune_index = choose(random, [weight for _, weight, _ in communes], households_count)
+    depcom = np.array([depcom for depcom, _, _ in communes])[commune_index]
+    rent_by_square_meter = np.array([rent for _, _, rent in communes])[commune_index]
+    owner_probability = np.clip((reference_age - 22) / 50., .1, .75)
+    draw = random.uniform(size = households_count)
+    statut_occupation_logement = np.where(
+        draw < owner_probability,
+        np.where(reference_age < 55, ACCEDANT, PROPRIETAIRE),
+        choose(random, [.35, .53, .06, .06], households_count) + LOCATAIRE_HLM,
+        )
+    tenant = (statut_occupation_logement >= LOCATAIRE_HLM) & (statut_occupation_logement <= LOCATAIRE_MEUBLE)
+    surface = (25 + 15 * (household_size - 1)) * np.exp(.2 * random.normal(size = households_count))
+    loyer = np.where(tenant, surface * rent_by_square_meter, 0.)
+    loyer[statut_occupation_logement == LOCATAIRE_HLM] *= .55
+
+    inputs = [
+        ('date_naissance', None, date_naissance),
+        ('statut_marital', year, statut_marital),
+        ('activite', year, activite),
+        ('categorie_salarie', year, categorie_salarie),
+        ('contrat_de_travail', year, np.where(part_time, TEMPS_PARTIEL, 0)),
+        ('heures_remunerees_volume', year, np.where(part_time, 12 * 151.67 * working_time, 0.)),
+        ('depcom', year, depcom),
+        ('depcom_entreprise', year, np.where(employed, depcom[household_id], '')),
+        ('statut_occupation_logement', year, statut_occupation_logement),
+        ]
+    for years_offset in (-2, -1, 0):
+        # Incomes are the same in the two previous years, to be taken into account by the means-tested benefits.
+        income_year = year.offset(years_offset)
+        inputs.extend([
+            ('salaire_de_base', income_year, 12 * salaire_de_base),
+            ('retraite_brute', income_year, 12 * monthly_pension),
+            ('chomage_brut', income_year, 12 * monthly_unemployment_benefit),
+            ('loyer', income_year, 12 * loyer),
+            ])
+        inputs.extend(
+            # No set_input to divide a yearly amount
+            ('traitement_indiciaire_brut', income_year.first_month.offset(month_index), traitement_indiciaire_brut)
+            for month_index in range(12)
+            )
+    return Population(persons_count, members_entity_id_by_key, members_legacy_role_by_key, inputs)
+
+
+def get_role_by_legacy_role(entity, legacy_roles_count):
+    """
+    Return the roles of the legacy roles of an entity, numbered as in the scenarios: the persons of a role without
+    maximum (children) have consecutive legacy roles, from the first legacy role of their role.
+    """
+    role_by_legacy_role = []
+    for role in entity.roles:
+        if role.subroles:
+            role_by_legacy_role.extend(role.subroles)
+        elif role.max:
+            role_by_legacy_role.extend([role] * role.max)
+        else:
+            role_by_legacy_role.extend([role] * max(legacy_roles_count - len(role_by_legacy_role), 1))
+            break
+    roles = np.empty(len(role_by_legacy_role), dtype = object)
+    roles[:] = role_by_legacy_role
+    return roles
+
+
+def set_entities(simulation, persons_count, members_entity_id_by_key, members_legacy_role_by_key = {}):
+    """
+    Set the sizes and memberships of the entities of a simulation.
+
+    `members_entity_id_by_key` gives, for each group entity, the index of the entity of each person. A missing entity
+    has one entity per person. `members_legacy_role_by_key` gives the legacy roles (0 for the first role).
+    """
+    persons = simulation.persons
+    persons.count = persons.step_size = persons_count
+    for entity in simulation.entities.itervalues():
+        if entity.is_person:
+            continue
+        members_entity_id = members_entity_id_by_key.get(entity.key)
+        if members_entity_id is None:
+            members_entity_id = np.arange(persons_count, dtype = np.int32)
+        members_legacy_role = members_legacy_role_by_key.get(entity.key)
+        if members_legacy_role is None:
+            members_legacy_role = np.zeros(persons_count, dtype = np.int32)
+        entity.members_entity_id = np.asarray(members_entity_id, dtype = np.int32)
+        entity.members_legacy_role = np.asarray(members_legacy_role, dtype = np.int32)
+        entity.roles_count = entity.members_legacy_role.max() + 1 if persons_count else 1
+        roles = get_role_by_legacy_role(entity, entity.roles_count)
+        entity.members_role = roles[np.minimum(entity.members_legacy_role, len(roles) - 1)]
+        entity.count = entity.step_size = entity.members_entity_id.max() + 1 if persons_count else 0
+
+
+def set_input(simulation, variable_name, period, array):
+    holder = simulation.get_or_new_holder(variable_name)
+    holder.set_input(period, np.asarray(array, dtype = holder.column.dtype))
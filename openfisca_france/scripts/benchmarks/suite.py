@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of the main variables of OpenFisca-France, at several population sizes.
+
+Each case is run in its own forked process, so that the first ("cold") calculation does not benefit from what a
+previous case computed. The "warm" time is the best time of the calculation in new simulations of the same process.
+The peak memory is the growth of the resident memory of the process, from its start to its peak.
+"""
+
+
+import collections
+import datetime
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import time
+import traceback
+
+import numpy as np
+import pkg_resources
+
+from openfisca_france.scripts.benchmarks.populations import generate_population
+
+
+Case = collections.namedtuple('Case', ['name', 'variable_name', 'period'])
+
+# Periods are relative to the year of the population: the monthly variables are calculated at its last month, so that
+# the resources of the previous months are known.
+cases = [
+    Case(u'irpp', u'irpp', u'{year}'),
+    Case(u'salaire_net_a_payer', u'salaire_net_a_payer', u'{year}-12'),
+    Case(u'cout_du_travail', u'cout_du_travail', u'{year}-12'),
+    Case(u'rsa', u'rsa', u'{year}-12'),
+    Case(u'ppa', u'ppa', u'{year}-12'),
+    Case(u'aide_logement', u'aide_logement', u'{year}-12'),
+    Case(u'revenu_disponible', u'revenu_disponible', u'{year}'),
+    ]
+case_by_name = collections.OrderedDict((case.name, case) for case in cases)
+
+default_sizes = [1, 1000, 100000, 1000000]
+
+# Differences below these are measurement noise, whatever their ratio.
+min_difference_by_metric = dict(
+    warm_time = 0.01,
+    peak_memory = 1024 * 1024,
+    )
+
+
+def get_resident_memory():
+    """Current resident memory of the process, in bytes."""
+    try:
+        with open('/proc/self/statm') as statm_file:
+            return int(statm_file.read().split()[1]) * resource.getpagesize()
+    except IOError:
+        # Not Linux: the peak is the best approximation available.
+        return get_peak_memory()
+
+
+def get_peak_memory():
+    """Peak resident memory of the process, in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_case(tax_benefit_system, case, size, year, repeats = 3, seed = 0):
+    """Run a benchmark case, in the current process. Return its result as a dict."""
+    start_memory = get_resident_memory()
+    period = case.period.format(year = year)
+
+    start_time = time.time()
+    population = generate_population(size, year, seed = seed)
+    generation_time = time.time() - start_time
+    start_time = time.time()
+    simulation = population.build_simulation(tax_benefit_system, year)
+    build_time = time.time() - start_time
+    persons_count = simulation.persons.count
+    start_time = time.time()
+    array = simulation.calculate(case.variable_name, period)
+    cold_time = time.time() - start_time
+    total = float(np.sum(array, dtype = np.float64))
+    del simulation, array
+
+    warm_times = []
+    for _ in range(repeats):
+        simulation = population.build_simulation(tax_benefit_system, year)
+        start_time = time.time()
+        simulation.calculate(case.variable_name, period)
+        warm_times.append(time.time() - start_time)
+        del simulation
+
+    return collections.OrderedDict([
+        ('case', case.name),
+        ('size', size),
+        ('variable', case.variable_name),
+        ('period', period),
+        ('persons_count', persons_count),
+        ('generation_time', generation_time),
+        ('build_time', build_time),
+        ('cold_time', cold_time),
+        ('warm_time', min(warm_times) if warm_times else None),
+        ('warm_times', warm_times),
+        ('peak_memory', max(get_peak_memory() - start_memory, 0)),
+        ('total', total),
+        ])
+
+
+def run_case_in_child_process(tax_benefit_system, case, size, year, repeats = 3, seed = 0):
+    """Run a benchmark case in a forked process. A case which fails (or is killed, lacking memory) has an error."""
+    parent_connection, child_connection = multiprocessing.Pipe(duplex = False)
+    process = multiprocessing.Process(target = send_case_result,
+        args = (child_connection, tax_benefit_system, case, size, year, repeats, seed))
+    process.start()
+    child_connection.close()
+    try:
+        result = parent_connection.recv()
+    except EOFError:
+        result = None
+    process.join()
+    if result is None:
+        result = collections.OrderedDict([
+            ('case', case.name),
+            ('size', size),
+            ('error', u'Process exited with code {}'.format(process.exitcode)),
+            ])
+    return result
+
+
+def send_case_result(connection, tax_benefit_system, case, size, year, repeats, seed):
+    try:
+        result = run_case(tax_benefit_system, case, size, year, repeats = repeats, seed = seed)
+    except Exception:
+        result = collections.OrderedDict([
+            ('case', case.name),
+            ('size', size),
+            ('error', traceback.format_exc().decode('utf-8')),
+            ])
+    connection.send(result)
+    connection.close()
+
+
+def run_suite(tax_benefit_system, cases_name = None, sizes = None, year = 2016, repeats = 3, seed = 0,
+        callback = None):
+    """Run the benchmark cases at the given sizes, smallest sizes first. Return the results and their metadata."""
+    # Build what the forked processes should share.
+    tax_benefit_system.get_legislation()
+    tax_benefit_system.prefill_cache()
+    results = []
+    for size in sorted(sizes or default_sizes):
+        for case_name in cases_name or case_by_name.keys():
+            result = run_case_in_child_process(tax_benefit_system, case_by_name[case_name], size, year,
+                repeats = repeats, seed = seed)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+    return collections.OrderedDict([
+        ('metadata', get_metadata(year = year, repeats = repeats, seed = seed)),
+        ('results', results),
+        ])
+
+
+def get_metadata(**parameters):
+    metadata = collections.OrderedDict([
+        ('date', datetime.datetime.utcnow().isoformat()),
+        ('git_commit', get_git_commit()),
+        ('openfisca_core', get_distribution_version('OpenFisca-Core')),
+        ('openfisca_france', get_distribution_version('OpenFisca-France')),
+        ('numpy', np.__version__),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('cpu_count', multiprocessing.cpu_count()),
+        ])
+    metadata.update(sorted(parameters.iteritems()))
+    return metadata
+
+
+def get_distribution_version(name):
+    try:
+        return pkg_resources.get_distribution(name).version
+    except pkg_resources.DistributionNotFound:
+        # Package run from its sources
+        return None
+
+
+def get_git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd = os.path.dirname(os.path.abspath(__file__)),
+            stderr = open(os.devnull, 'w')).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(results, baseline, threshold = 0.2):
+    """
+    Compare benchmark results to baseline results (both as returned by run_suite).
+
+    Return the (case, size, metric, baseline value, value) regressions: the metrics greater than their baseline by more
+    than `threshold` (relatively) and than their noise, and the cases which failed while their baseline did not.
+    """
+    baseline_result_by_key = dict(
+        ((result['case'], result['size']), result)
+        for result in baseline['results']
+        )
+    regressions = []
+    for result in results['results']:
+        baseline_result = baseline_result_by_key.get((result['case'], result['size']))
+        if baseline_result is None or 'error' in baseline_result:
+            continue
+        if 'error' in result:
+            regressions.append((result['case'], result['size'], u'error', None, None))
+            continue
+        for metric, min_difference in sorted(min_difference_by_metric.iteritems()):
+            baseline_value = baseline_result.get(metric)
+            value = result.get(metric)
+            if baseline_value is None or value is None:
+                continue
+            if value > baseline_value * (1 + threshold) and value - baseline_value > min_difference:
+                regressions.append((result['case'], result['size'], metric, baseline_value, value))
+    return regressions
+
+
+def format_result(result):
+    if 'error' in result:
+        return u'{:<20} {:>8}   ERROR {}'.format(result['case'], result['size'], result['error'].splitlines()[-1])
+    return u'{:<20} {:>8} {:>10.4f} s {:>10.4f} s {:>10.4f} s {:>9.1f} MiB'.format(result['case'], result['size'],
+        result['build_time'], result['cold_time'], result['warm_time'], result['peak_memory'] / 1024. ** 2)
+
+
+def format_results_header():
+    return u'{:<20} {:>8} {:>12} {:>12} {:>12} {:>13}'.format(u'case', u'size', u'build', u'cold', u'warm',
+        u'peak memory')
+
+
+def format_regressions(regressions):
+    lines = []
+    for case_name, size, metric, baseline_value, value in regressions:
+        if metric == u'error':
+            lines.append(u'{:<20} {:>8} failed'.format(case_name, size))
+        else:
+            lines.append(u'{:<20} {:>8} {:<12} {:>12.4g} -> {:>12.4g} (+{:.0%})'.format(case_name, size, metric,
+                baseline_value, value, value / baseline_value - 1 if baseline_value else float('inf')))
+    return u'\n'.join(lines)
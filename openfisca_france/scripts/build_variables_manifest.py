@@ -0,0 +1,25 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Rebuild model/variables_manifest.json, used to load variables lazily. Run it after adding or moving a variable."""
+
+
+import argparse
+import logging
+import sys
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france import variables_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-v', '--verbose', action = 'store_true', default = False, help = "increase output verbosity")
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
+
+    variables_manifest.write_manifest(FranceTaxBenefitSystem())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Report how many arrays the variables computed with extra parameters (RSA, PPA…) keep in a simulation."""
+
+
+import argparse
+import collections
+import logging
+import sys
+
+from openfisca_core import periods
+
+from openfisca_france import FranceTaxBenefitSystem
+
+
+def build_extra_params_report(simulation):
+    """
+    Return a list of (variable name, arrays count, distinct extra parameters count, bytes) for the variables whose
+    arrays are cached by extra parameters, sorted by decreasing bytes.
+    """
+    report = []
+    for variable_name, holder in simulation.holder_by_name.iteritems():
+        array_by_period = holder._array_by_period
+        if not array_by_period:
+            continue
+        arrays_count = 0
+        bytes_count = 0
+        extra_params_set = set()
+        for values in array_by_period.itervalues():
+            if not isinstance(values, dict):
+                continue
+            for extra_params, array in values.iteritems():
+                arrays_count += 1
+                bytes_count += array.nbytes
+                extra_params_set.add(extra_params)
+        if arrays_count > 0:
+            report.append((variable_name, arrays_count, len(extra_params_set), bytes_count))
+    report.sort(key = lambda row: (- row[3], row[0]))
+    return report
+
+
+def format_extra_params_report(report):
+    lines = [u'{:<50} {:>7} {:>12} {:>12}'.format(u'variable', u'arrays', u'extra_params', u'bytes')]
+    lines.extend(
+        u'{:<50} {:>7} {:>12} {:>12}'.format(variable_name, arrays_count, extra_params_count, bytes_count)
+        for variable_name, arrays_count, extra_params_count, bytes_count in report
+        )
+    totals = [sum(row[index] for row in report) for index in (1, 3)]
+    lines.append(u'{:<50} {:>7} {:>12} {:>12}'.format(u'total', totals[0], u'', totals[1]))
+    return u'\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-m', '--months', default = 12, type = int, help = "number of consecutive months to compute")
+    parser.add_argument('-p', '--period', default = '2017-01', help = "first month to compute")
+    parser.add_argument('-s', '--steps', default = 100, type = int, help = "number of households (salary axis)")
+    parser.add_argument('-v', '--verbose', action = 'store_true', default = False, help = "increase output verbosity")
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
+
+    first_month = periods.period(args.period).first_month
+    tax_benefit_system = FranceTaxBenefitSystem()
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[
+            dict(count = args.steps, max = 2000, min = 0, name = 'salaire_net', period = first_month.offset(
+                index - 3)) for index in range(args.months + 3)
+            ]],
+        enfants = [dict(age = 6)],
+        parent1 = dict(age = 35),
+        period = first_month.start.period(u'month', args.months).offset(-3),
+        ).new_simulation()
+    variables_name = collections.OrderedDict.fromkeys(['rsa', 'ppa'])
+    for index in range(args.months):
+        for variable_name in variables_name:
+            simulation.calculate(variable_name, first_month.offset(index))
+
+    print format_extra_params_report(build_extra_params_report(simulation)).encode('utf-8')
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Report the time spent building FranceTaxBenefitSystem: XML parse, preprocessing and variable import."""
+
+
+import argparse
+import logging
+import sys
+import time
+
+from openfisca_france import FranceTaxBenefitSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-c', '--legislation-cache-dir', default = None,
+        help = "directory of the compiled legislation cache (disabled by default)")
+    parser.add_argument('-l', '--lazy-variables', action = 'store_true', default = False,
+        help = "only import the modules of the variables when they are requested")
+    parser.add_argument('-v', '--verbose', action = 'store_true', default = False, help = "increase output verbosity")
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
+
+    start_time = time.time()
+    tax_benefit_system = FranceTaxBenefitSystem(legislation_cache_dir = args.legislation_cache_dir,
+        lazy_variables = args.lazy_variables)
+    tax_benefit_system.get_legislation()
+    total_duration = time.time() - start_time
+
+    print tax_benefit_system.format_startup_timings().encode('utf-8')
+    print u'{:<25} {:8.3f} s'.format(u'total', total_duration).encode('utf-8')
+
+
+if __name__ == "__main__":
+    sys.exit(main())
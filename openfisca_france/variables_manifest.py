@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""Lazy registration of the variables of the model, using a prebuilt manifest of the module defining each variable."""
+
+
+import collections
+import importlib
+import json
+import os
+from inspect import isclass
+
+from openfisca_core.variables import AbstractVariable
+
+from .model.tableaux_par_defaut import partager_valeur_par_defaut
+
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model')
+MANIFEST_PATH = os.path.join(MODEL_DIR, 'variables_manifest.json')
+MODEL_PACKAGE_NAME = 'openfisca_france.model'
+
+
+def build_manifest(tax_benefit_system):
+    """Return the manifest of an eagerly loaded tax and benefit system: {module_name: [variable_name, ...]}."""
+    variables_name_by_module_name = collections.defaultdict(list)
+    for variable_name, column in tax_benefit_system.column_by_name.iteritems():
+        source_file_path = os.path.relpath(column.formula_class.source_file_path, MODEL_DIR)
+        module_name = '.'.join([MODEL_PACKAGE_NAME] + os.path.splitext(source_file_path)[0].split(os.sep))
+        variables_name_by_module_name[module_name].append(variable_name)
+    return collections.OrderedDict(
+        (module_name, sorted(variables_name))
+        for module_name, variables_name in sorted(variables_name_by_module_name.iteritems())
+        )
+
+
+def load_manifest(manifest_path = MANIFEST_PATH):
+    """Return the module name of each variable, read from the manifest file."""
+    with open(manifest_path) as manifest_file:
+        variables_name_by_module_name = json.load(manifest_file)
+    return {
+        variable_name: module_name
+        for module_name, variables_name in variables_name_by_module_name.iteritems()
+        for variable_name in variables_name
+        }
+
+
+def write_manifest(tax_benefit_system, manifest_path = MANIFEST_PATH):
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(build_manifest(tax_benefit_system), manifest_file, indent = 2, separators = (',', ': '))
+        manifest_file.write('\n')
+
+
+class LazyColumnByName(dict):
+    """
+    Columns of a tax and benefit system, indexed by name, whose variables are loaded when first requested.
+
+    Requesting a column imports the module defining it and registers all the variables of this module. Membership tests
+    and iteration over names only use the manifest; iterating over columns loads every module.
+    """
+
+    def __init__(self, tax_benefit_system, module_name_by_variable_name, parent = None):
+        dict.__init__(self)
+        self.tax_benefit_system = tax_benefit_system
+        self.module_name_by_variable_name = module_name_by_variable_name
+        self.parent = parent  # Mapping this one was copied from (for reforms), which loads the modules.
+        self.loaded_modules_name = set()
+
+    def __contains__(self, variable_name):
+        return dict.__contains__(self, variable_name) or variable_name in self.module_name_by_variable_name
+
+    def __getitem__(self, variable_name):
+        column = self.get(variable_name)
+        if column is None:
+            raise KeyError(variable_name)
+        return column
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def copy(self):
+        new = LazyColumnByName(self.tax_benefit_system, self.module_name_by_variable_name, parent = self)
+        dict.update(new, dict.iteritems(self))
+        return new
+
+    def get(self, variable_name, default = None):
+        column = dict.get(self, variable_name)
+        if column is not None:
+            return column
+        module_name = self.module_name_by_variable_name.get(variable_name)
+        if module_name is None:
+            return default
+        if self.parent is not None:
+            column = self.parent.get(variable_name)
+            if column is not None:
+                dict.setdefault(self, variable_name, column)
+        else:
+            self.load_module(module_name)
+        return dict.get(self, variable_name, default)
+
+    has_key = __contains__
+
+    def items(self):
+        return list(self.iteritems())
+
+    def iteritems(self):
+        self.load_all()
+        return dict.iteritems(self)
+
+    def iterkeys(self):
+        return iter(self.keys())
+
+    def itervalues(self):
+        self.load_all()
+        return dict.itervalues(self)
+
+    def keys(self):
+        return list(set(dict.iterkeys(self)).union(self.module_name_by_variable_name))
+
+    def load_all(self):
+        for variable_name in self.module_name_by_variable_name:
+            if not dict.__contains__(self, variable_name):
+                self.get(variable_name)
+
+    def load_module(self, module_name):
+        if module_name in self.loaded_modules_name:
+            return
+        self.loaded_modules_name.add(module_name)
+        module = importlib.import_module(module_name)
+        for item in dir(module):
+            variable_class = getattr(module, item)
+            # Only keep the variables defined in this module (not imported), like add_variables_from_file does.
+            if isclass(variable_class) and issubclass(variable_class, AbstractVariable) and \
+                    variable_class.__module__ == module.__name__ and not dict.__contains__(self, item):
+                variable_type = variable_class.__bases__[0]
+                variable = variable_type(unicode(item), dict(variable_class.__dict__), variable_class)
+                dict.__setitem__(self, variable.name,
+                    partager_valeur_par_defaut(variable.to_column(self.tax_benefit_system)))
+
+    def values(self):
+        return list(self.itervalues())
+
+
+class TaxBenefitSystemSubset(object):
+    """View of a tax and benefit system whose column_by_name only contains the given variables."""
+
+    def __init__(self, tax_benefit_system, variables_name):
+        self.reference_tax_benefit_system = tax_benefit_system
+        column_by_name = tax_benefit_system.column_by_name
+        self.column_by_name = {
+            variable_name: column_by_name[variable_name]
+            for variable_name in variables_name
+            if variable_name in column_by_name
+            }
+
+    def __getattr__(self, attribute):
+        return getattr(self.reference_tax_benefit_system, attribute)
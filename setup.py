@@ -7,7 +7,7 @@ from setuptools import setup, find_packages
 
 setup(
     name = 'OpenFisca-France',
-    version = '18.2.7',
+    version = '18.10.20',
     author = 'OpenFisca Team',
     author_email = 'contact@openfisca.fr',
     classifiers = [
@@ -29,19 +29,12 @@ setup(
         'api': [
             'OpenFisca-Web-API >= 4.0.0, < 6.0',
             ],
-        'inversion_revenus': [
-            'scipy >= 0.17',
-            ],
-        'de_net_a_brut': [
-            'scipy >= 0.17',
-            ],
         'taxipp': [
             'pandas >= 0.13',
             ],
         'test': [
             'nose',
             'flake8',
-            'scipy >= 0.17', # Only used to test de_net_a_brut reform
             ],
         },
     include_package_data = True,  # Will read MANIFEST.in
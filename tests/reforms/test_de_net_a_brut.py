@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import assert_raises
+
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.reforms.de_net_a_brut import de_net_a_brut
+from ..cache import tax_benefit_system
+
+
+def test_de_net_a_brut_batch():
+    period = periods.period('2016-02')
+    reform = de_net_a_brut(tax_benefit_system)
+    scenario = reform.new_scenario().init_single_entity(
+        axes = [dict(count = 11, max = 5000, min = 0, name = 'salaire_net_a_payer')],
+        period = period,
+        parent1 = dict(
+            categorie_salarie = 'prive_non_cadre',
+            contrat_de_travail_debut = '2016-02',
+            effectif_entreprise = 1,
+            ),
+        )
+    simulation = scenario.new_simulation()
+    salaire_de_base = simulation.calculate('salaire_de_base', period)
+
+    reference_simulation = scenario.new_simulation(reference = True)
+    reference_simulation.holder_by_name['salaire_net_a_payer'].delete_arrays()
+    reference_simulation.get_or_new_holder('salaire_de_base').put_in_cache(salaire_de_base, period)
+    assert_near(
+        reference_simulation.calculate('salaire_net_a_payer', period),
+        simulation.calculate('salaire_net_a_payer', period),
+        absolute_error_margin = 0.05,
+        )
+
+
+def test_de_net_a_brut_sans_salaire_net():
+    period = periods.period('2016-02')
+    reform = de_net_a_brut(tax_benefit_system)
+    simulation = reform.new_scenario().init_single_entity(
+        period = period,
+        parent1 = dict(
+            categorie_salarie = 'prive_non_cadre',
+            contrat_de_travail_debut = '2016-02',
+            ),
+        ).new_simulation()
+    with assert_raises(ValueError):
+        simulation.calculate('salaire_de_base', period)
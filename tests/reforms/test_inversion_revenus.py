@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from numpy import array, minimum as min_
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.reforms.inversion_numerique import inverse_function
+from openfisca_france.reforms.inversion_revenus import inverse_lineaire_par_morceaux, inversion_revenus
+from ..cache import tax_benefit_system
+
+
+def calculate_net(brut):
+    # Net = 80 % du brut jusqu'à 3000, puis 70 % au-delà.
+    return brut * 0.8 - (brut - min_(brut, 3000)) * 0.1
+
+
+def test_inverse_function():
+    net = array([0, 100, 2400, 2401, 5000, 10000])
+    assert_near(calculate_net(inverse_function(calculate_net, net)), net, absolute_error_margin = 0.01)
+
+
+def test_inverse_lineaire_par_morceaux():
+    net = array([0, 100, 2400, 2401, 5000, 10000])
+    points = array([0, 3000, 6000])
+    valeurs = array([calculate_net(point + 0 * net) for point in points])
+    brut, encadrement = inverse_lineaire_par_morceaux(points, valeurs, net)
+    assert_near(calculate_net(brut), net, absolute_error_margin = 0.01)
+    # The analytic solution is exact: it is checked once, and kept.
+    assert (inverse_function(calculate_net, net, guess = brut, encadrement = encadrement) == brut).all()
+
+
+def check_inversion(brut_name, imposable_name, inversion_analytique, parent1 = None):
+    year = periods.period('2016')
+    reform = inversion_revenus(tax_benefit_system)
+    reform.inversion_analytique = inversion_analytique
+    parent1 = dict(parent1 or {})
+    parent1[imposable_name + '_pour_inversion'] = 0
+    simulation = reform.new_scenario().init_single_entity(
+        axes = [dict(count = 5, max = 60000, min = 0, name = imposable_name + '_pour_inversion')],
+        period = year,
+        parent1 = parent1,
+        ).new_simulation()
+    brut = simulation.calculate(brut_name, '2016-03')
+
+    reference_simulation = tax_benefit_system.new_scenario().init_single_entity(
+        axes = [dict(count = 5, max = 1, min = 0, name = brut_name, period = '2016-01')],
+        period = year,
+        parent1 = dict((name, value) for name, value in parent1.iteritems() if not name.endswith('_pour_inversion')),
+        ).new_simulation()
+    holder = reference_simulation.get_or_new_holder(brut_name)
+    holder.delete_arrays()
+    for month in [year.first_month.offset(index) for index in range(12)]:
+        holder.put_in_cache(brut, month)
+    assert_near(
+        reference_simulation.calculate_add(imposable_name, year),
+        simulation.calculate(imposable_name + '_pour_inversion', year),
+        absolute_error_margin = 1,
+        )
+
+
+def test_inversion_revenus():
+    for inversion_analytique in (True, False):
+        yield check_inversion, 'chomage_brut', 'chomage_imposable', inversion_analytique
+        yield check_inversion, 'retraite_brute', 'retraite_imposable', inversion_analytique
+        yield (check_inversion, 'salaire_de_base', 'salaire_imposable', inversion_analytique,
+            dict(categorie_salarie = 'prive_cadre', effectif_entreprise = 1))
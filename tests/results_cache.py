@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache of the results of the YAML tests, keyed on the variables and the legislation parameters each test uses.
+
+A test that passed is recorded with the hashes of the source files of the variables its simulation used, and of the
+values (at every date) of the legislation parameters it read. It is skipped by the next runs as long as none of them
+changed, nor the test itself, nor the code shared by all the variables (the files of the package defining no variable,
+its assets and the version of OpenFisca-Core).
+"""
+
+
+import hashlib
+import json
+import os
+
+import pkg_resources
+from openfisca_core.legislations import CompactNode
+from openfisca_core.taxscales import AbstractTaxScale
+
+import openfisca_france
+
+
+class RecordingNode(object):
+    """Proxy of a node of the compact legislation, recording the paths of the parameters read through it."""
+
+    def __init__(self, node, path, parameters_paths):
+        self._node = node
+        self._path = path
+        self._parameters_paths = parameters_paths
+
+    def __getattr__(self, key):
+        return self._record(key, getattr(self._node, key))
+
+    def __getitem__(self, key):
+        return self._record(key, self._node[key])
+
+    def __iter__(self):
+        self._parameters_paths.add(self._path)
+        return iter(self._node)
+
+    def _record(self, key, value):
+        if key in ('instant', 'name'):
+            return value
+        path = u'.'.join((self._path, key)) if self._path else key
+        if isinstance(value, CompactNode):
+            return RecordingNode(value, path, self._parameters_paths)
+        if callable(value) and not isinstance(value, AbstractTaxScale):
+            # Method of the node (iteritems, combine_tax_scales…): it may read the whole node.
+            self._parameters_paths.add(self._path)
+            return value
+        self._parameters_paths.add(path)
+        return value
+
+
+class UsageRecorder(object):
+    """Record the variables and the legislation parameters used by the simulations of a scenario."""
+
+    def __init__(self, scenario):
+        self.parameters_paths = set()
+        self.simulations = []
+        new_simulation = scenario.new_simulation
+
+        def new_recorded_simulation(*args, **kwargs):
+            simulation = new_simulation(*args, **kwargs)
+            legislation_at = simulation.legislation_at
+            simulation.legislation_at = lambda *args, **kwargs: RecordingNode(legislation_at(*args, **kwargs), u'',
+                self.parameters_paths)
+            self.simulations.append(simulation)
+            return simulation
+
+        scenario.new_simulation = new_recorded_simulation
+
+    @property
+    def variables_names(self):
+        return set(
+            variable_name
+            for simulation in self.simulations
+            for variable_name in simulation.holder_by_name
+            )
+
+
+def hash_file(file_path):
+    with open(file_path, 'rb') as source_file:
+        return hashlib.sha1(source_file.read()).hexdigest()
+
+
+def hash_json(value):
+    return hashlib.sha1(json.dumps(value, default = repr, sort_keys = True)).hexdigest()
+
+
+class ResultsCache(object):
+    def __init__(self, tax_benefit_system, file_path):
+        self.file_path = file_path
+        self.tax_benefit_system = tax_benefit_system
+        self.package_directory = os.path.dirname(os.path.abspath(openfisca_france.__file__))
+        self.file_hash_by_path = {}
+        self.parameter_hash_by_path = {}
+        self.source_file_path_by_variable_name = dict(
+            (variable_name, self.get_source_file_path(column))
+            for variable_name, column in tax_benefit_system.column_by_name.iteritems()
+            )
+        self.common_hash = self.compute_common_hash()
+        if os.path.exists(file_path):
+            with open(file_path) as cache_file:
+                self.record_by_test_key = json.load(cache_file)
+        else:
+            self.record_by_test_key = {}
+
+    def compute_common_hash(self):
+        """Hash the code shared by all the variables: every file of the package which defines no variable."""
+        variables_source_files_path = set(self.source_file_path_by_variable_name.itervalues())
+        common_hash = hashlib.sha1(pkg_resources.get_distribution('OpenFisca-Core').version)
+        for directory, _, files_name in sorted(os.walk(self.package_directory)):
+            for file_name in sorted(files_name):
+                file_path = os.path.join(directory, file_name)
+                if file_path in variables_source_files_path or os.path.splitext(file_name)[1] in ('.pyc', '.pyo'):
+                    continue
+                if not file_name.endswith('.py') and os.sep + 'assets' + os.sep not in file_path:
+                    # Legislation parameters are hashed by value, in the records of the tests reading them.
+                    continue
+                common_hash.update(os.path.relpath(file_path, self.package_directory))
+                common_hash.update(self.get_file_hash(file_path))
+        return common_hash.hexdigest()
+
+    def get_file_hash(self, file_path):
+        file_hash = self.file_hash_by_path.get(file_path)
+        if file_hash is None:
+            file_hash = self.file_hash_by_path[file_path] = hash_file(file_path) if os.path.exists(file_path) else u''
+        return file_hash
+
+    def get_parameter_hash(self, path):
+        """Hash the legislation node at `path` (or its deepest existing ancestor), with all its dated values."""
+        parameter_hash = self.parameter_hash_by_path.get(path)
+        if parameter_hash is None:
+            node = self.tax_benefit_system.get_legislation()
+            for key in path.split(u'.') if path else []:
+                children = node.get('children')
+                if children is None or key not in children:
+                    break
+                node = children[key]
+            parameter_hash = self.parameter_hash_by_path[path] = hash_json(node)
+        return parameter_hash
+
+    def get_source_file_path(self, column):
+        source_file_path = column.formula_class.source_file_path
+        if source_file_path is None or os.path.isabs(source_file_path) and os.path.exists(source_file_path):
+            return source_file_path
+        location = self.tax_benefit_system.get_package_metadata()['location']
+        return os.path.join(location, source_file_path.lstrip(os.sep))
+
+    def get_test_key(self, yaml_path, raw_test):
+        """Return the key of a raw YAML test, or None if its results cannot be cached (reforms)."""
+        if raw_test.get('reforms'):
+            return None
+        return hash_json([
+            self.common_hash,
+            os.path.relpath(yaml_path, os.path.dirname(self.package_directory)),
+            raw_test,
+            ])
+
+    def is_unchanged(self, test_key):
+        record = self.record_by_test_key.get(test_key)
+        return record is not None and all(
+            self.get_file_hash(os.path.join(self.package_directory, file_path)) == file_hash
+            for file_path, file_hash in record['files'].iteritems()
+            ) and all(
+            self.get_parameter_hash(path) == parameter_hash
+            for path, parameter_hash in record['parameters'].iteritems()
+            )
+
+    def make_record(self, usage_recorder):
+        files_path = set(
+            self.source_file_path_by_variable_name[variable_name]
+            for variable_name in usage_recorder.variables_names
+            ) - set([None])
+        return dict(
+            files = dict(
+                (os.path.relpath(file_path, self.package_directory), self.get_file_hash(file_path))
+                for file_path in files_path
+                ),
+            parameters = dict(
+                (path, self.get_parameter_hash(path))
+                for path in usage_recorder.parameters_paths
+                ),
+            )
+
+    def save(self, record_by_test_key):
+        self.record_by_test_key.update(record_by_test_key)
+        with open(self.file_path, 'w') as cache_file:
+            json.dump(self.record_by_test_key, cache_file, sort_keys = True)
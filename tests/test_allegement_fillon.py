@@ -7,7 +7,10 @@ import datetime
 
 from openfisca_core import periods
 from openfisca_core.reforms import Reform, update_legislation
+from openfisca_core.tools import assert_near
 
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    calculate_cumul_annuel, get_cumul_annuel
 from cache import tax_benefit_system
 
 
@@ -209,3 +212,94 @@ def assert_variable(variable_message, employee_type, amount, output):
     assert abs(output - amount) < 0.01, \
         "error for {} ({}) : should be {} instead of {} ".format(variable_message, employee_type, amount, output)
 
+
+def test_modes_de_recouvrement_mixtes():
+    # Chaque individu n'utilise que son propre mode de recouvrement.
+    reform = smic_h_b_9_euros(tax_benefit_system)
+    individus = [
+        test_case_by_employee_type[employee_type]['input_variables']
+        for employee_type in ['circulaire_acoss_2013_regularisation_fin_de_periode', 'circulaire_acoss_2013_progressif']
+        ]
+    date_naissance = datetime.date(1973, 1, 1)
+    simulation = reform.new_scenario().init_single_entity(
+        period = 2013,
+        parent1 = dict(individus[0], date_naissance = date_naissance),
+        parent2 = dict(individus[1], date_naissance = date_naissance),
+        ).new_simulation()
+    for period_str in ['2013-09', '2013-12']:
+        output = simulation.calculate('allegement_fillon', period = periods.period(period_str))
+        for index, employee_type in enumerate([
+                'circulaire_acoss_2013_regularisation_fin_de_periode',
+                'circulaire_acoss_2013_progressif',
+                ]):
+            amount = test_case_by_employee_type[employee_type]['output_variables']['allegement_fillon'][period_str]
+            assert_variable('allegement_fillon at {}'.format(period_str), employee_type, amount, output[index])
+
+
+def test_modes_de_recouvrement_evalues_sur_leurs_lignes():
+    # Chaque mode est évalué sur ses seuls individus : le résultat est celui de l'individu simulé seul.
+    reform = smic_h_b_9_euros(tax_benefit_system)
+    employee_types = [
+        'annuel',
+        'circulaire_acoss_2013_regularisation_fin_de_periode',
+        'circulaire_acoss_2013_progressif',
+        ]
+    # Le troisième salarié est un enfant à charge, qui doit avoir moins de 25 ans.
+    dates_naissance = [datetime.date(1973, 1, 1), datetime.date(1973, 1, 1), datetime.date(1993, 1, 1)]
+    individus = [
+        dict(test_case_by_employee_type[employee_type]['input_variables'], date_naissance = date_naissance)
+        for employee_type, date_naissance in zip(employee_types, dates_naissance)
+        ]
+    simulation = reform.new_scenario().init_single_entity(
+        period = 2013,
+        parent1 = individus[0],
+        parent2 = individus[1],
+        enfants = [individus[2]],
+        ).new_simulation()
+    for period_str in ['2013-03', '2013-12']:
+        period = periods.period(period_str)
+        output = simulation.calculate('allegement_fillon', period = period)
+        for index, employee_type in enumerate(employee_types):
+            simulation_seul = reform.new_scenario().init_single_entity(
+                period = 2013,
+                parent1 = individus[index],
+                ).new_simulation()
+            amount = simulation_seul.calculate('allegement_fillon', period = period)[0]
+            assert_variable('allegement_fillon at {}'.format(period_str), employee_type, amount, output[index])
+
+
+def test_mode_de_recouvrement_inutilise_non_calcule():
+    reform = smic_h_b_9_euros(tax_benefit_system)
+    input_variables = test_case_by_employee_type['circulaire_acoss_2013_regularisation_fin_de_periode'][
+        'input_variables']
+    simulation = reform.new_scenario().init_single_entity(
+        period = 2013,
+        parent1 = dict(input_variables, date_naissance = datetime.date(1973, 1, 1)),
+        ).new_simulation()
+    simulation.calculate('allegement_fillon', period = periods.period('2013-03'))
+    # Le mode progressif, qui cumule les mois précédents, n'est pas calculé.
+    assert simulation.get_or_new_holder('allegement_fillon').get_array(periods.period('2013-02')) is None
+
+
+def test_cumul_annuel_progressif():
+    reform = smic_h_b_9_euros(tax_benefit_system)
+    input_variables = test_case_by_employee_type['circulaire_acoss_2013_progressif']['input_variables']
+    simulation = reform.new_scenario().init_single_entity(
+        period = 2013,
+        parent1 = dict(input_variables, date_naissance = datetime.date(1973, 1, 1)),
+        ).new_simulation()
+    allegement_fillon = simulation.calculate('allegement_fillon', period = periods.period('2013-12'))
+    assert_variable('allegement_fillon at 2013-12', 'circulaire_acoss_2013_progressif', -236.94, allegement_fillon)
+    # Chaque cumul depuis janvier n'est calculé qu'une fois, en ajoutant un mois au cumul précédent.
+    cumul_annuel = get_cumul_annuel(simulation, 'allegement_fillon')
+    assert cumul_annuel.nb_cumuls_calcules == 11
+    assert cumul_annuel.profondeur_cycles_max == 2
+    # Le cumul jusqu'à novembre est lu dans une seule entrée du registre.
+    nb_cumuls_reutilises = cumul_annuel.nb_cumuls_reutilises
+    assert_near(
+        calculate_cumul_annuel(simulation, 'allegement_fillon', periods.period('month:2013-01:11')),
+        simulation.calculate_add('allegement_fillon', periods.period('month:2013-01:11')),
+        absolute_error_margin = 1e-3,
+        )
+    assert cumul_annuel.nb_cumuls_calcules == 11
+    assert cumul_annuel.nb_cumuls_reutilises == nb_cumuls_reutilises + 1
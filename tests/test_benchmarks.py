@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.scripts.benchmarks import suite
+from openfisca_france.scripts.benchmarks.populations import generate_population
+from cache import tax_benefit_system
+
+
+# Role of the scenarios, by legacy role (the last one for the next legacy roles)
+roles_keys_by_entity_key = dict(
+    famille = ['parents', 'parents', 'enfants'],
+    foyer_fiscal = ['declarants', 'declarants', 'personnes_a_charge'],
+    menage = ['personne_de_reference', 'conjoint', 'enfants'],
+    )
+singular_roles_keys = ['personne_de_reference', 'conjoint']
+
+
+def as_scenario_case(population):
+    """Describe a synthetic population as the entities of a Scenario (one dict per person and entity)."""
+    persons = [dict(id = u'individu_{}'.format(index)) for index in range(population.persons_count)]
+    entities_by_key = {}
+    for entity_key, roles_keys in roles_keys_by_entity_key.iteritems():
+        members_entity_id = population.members_entity_id_by_key[entity_key]
+        members_legacy_role = population.members_legacy_role_by_key[entity_key]
+        entities = entities_by_key[entity_key] = [{} for _ in range(members_entity_id.max() + 1)]
+        for person_index in np.argsort(members_legacy_role, kind = 'mergesort'):
+            role_key = roles_keys[min(members_legacy_role[person_index], len(roles_keys) - 1)]
+            entity = entities[members_entity_id[person_index]]
+            if role_key in singular_roles_keys:
+                entity[role_key] = persons[person_index]['id']
+            else:
+                entity.setdefault(role_key, []).append(persons[person_index]['id'])
+    for variable_name, period, array in population.inputs:
+        entity_key = tax_benefit_system.column_by_name[variable_name].entity.key
+        items = persons if entity_key == 'individu' else entities_by_key[entity_key]
+        for item, value in zip(items, array.tolist()):
+            if period is None:
+                item[variable_name] = value.isoformat()
+            else:
+                item.setdefault(variable_name, {})[str(period)] = value
+    return dict(
+        individus = persons,
+        familles = entities_by_key['famille'],
+        foyers_fiscaux = entities_by_key['foyer_fiscal'],
+        menages = entities_by_key['menage'],
+        )
+
+
+def test_population_equivalente_au_scenario():
+    population = generate_population(20, 2016, seed = 1)
+    simulation = population.build_simulation(tax_benefit_system, 2016)
+    scenario_simulation = tax_benefit_system.new_scenario().init_from_test_case(
+        period = periods.period(2016),
+        test_case = as_scenario_case(population),
+        ).new_simulation()
+    for entity_key in roles_keys_by_entity_key:
+        entity = simulation.entities[entity_key]
+        scenario_entity = scenario_simulation.entities[entity_key]
+        assert entity.count == scenario_entity.count
+        assert (entity.members_entity_id == scenario_entity.members_entity_id).all()
+        assert (entity.members_legacy_role == scenario_entity.members_legacy_role).all()
+        assert (entity.members_role == scenario_entity.members_role).all()
+    for variable_name, period in (('irpp', '2016'), ('rsa', '2016-12'), ('revenu_disponible', '2016')):
+        assert_near(simulation.calculate(variable_name, period), scenario_simulation.calculate(variable_name, period),
+            absolute_error_margin = 0.01)
+
+
+def test_population_deterministe():
+    population = generate_population(1000, 2016, seed = 3)
+    same_population = generate_population(1000, 2016, seed = 3)
+    other_population = generate_population(1000, 2016, seed = 4)
+    for (_, _, array), (_, _, same_array) in zip(population.inputs, same_population.inputs):
+        assert (array == same_array).all()
+    assert not all(
+        len(array) == len(other_array) and (array == other_array).all()
+        for (_, _, array), (_, _, other_array) in zip(population.inputs, other_population.inputs)
+        )
+
+
+def test_population_vraisemblable():
+    population = generate_population(10000, 2016)
+    simulation = population.build_simulation(tax_benefit_system, 2016)
+    menage = simulation.entities['menage']
+    age = simulation.calculate('age', '2016-01')
+    assert 2.1 < float(population.persons_count) / menage.count < 2.4
+    assert age.min() >= 0 and age.max() < 100
+    enfant = menage.members_legacy_role >= 2
+    age_personne_de_reference = age[menage.members_legacy_role == 0][menage.members_entity_id]
+    assert (age[enfant] <= age_personne_de_reference[enfant] - 18).all()
+    salaire = simulation.calculate('salaire_de_base', '2016-01') \
+        + simulation.calculate('traitement_indiciaire_brut', '2016-01')
+    assert 0.3 < (salaire > 0).mean() < 0.5
+    assert 0.05 < (simulation.calculate('rsa', '2016-12') > 0).mean() < 0.15
+    assert 0.1 < (simulation.calculate('aide_logement', '2016-12') > 0).mean() < 0.3
+
+
+def test_find_regressions():
+    baseline = dict(results = [
+        dict(case = 'irpp', size = 1000, warm_time = 1., peak_memory = 100 * 1024 ** 2),
+        dict(case = 'rsa', size = 1000, warm_time = 1., peak_memory = 100 * 1024 ** 2),
+        dict(case = 'ppa', size = 1000, warm_time = 1., peak_memory = 100 * 1024 ** 2),
+        dict(case = 'irpp', size = 1, warm_time = 0.001, peak_memory = 0),
+        ])
+    results = dict(results = [
+        dict(case = 'irpp', size = 1000, warm_time = 1.1, peak_memory = 200 * 1024 ** 2),
+        dict(case = 'rsa', size = 1000, warm_time = 1.5, peak_memory = 100 * 1024 ** 2),
+        dict(case = 'ppa', size = 1000, error = u'MemoryError'),
+        # Noise
+        dict(case = 'irpp', size = 1, warm_time = 0.002, peak_memory = 1024),
+        # Not in the baseline
+        dict(case = 'irpp', size = 100000, warm_time = 10., peak_memory = 0),
+        ])
+    assert suite.find_regressions(results, baseline, threshold = 0.2) == [
+        ('irpp', 1000, 'peak_memory', 100 * 1024 ** 2, 200 * 1024 ** 2),
+        ('rsa', 1000, 'warm_time', 1., 1.5),
+        ('ppa', 1000, u'error', None, None),
+        ]
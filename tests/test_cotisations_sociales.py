@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+from numpy.random import RandomState
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.model.base import CATEGORIE_SALARIE
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    apply_bareme_for_relevant_type_sal
+from cache import tax_benefit_system
+
+
+def apply_bareme_par_categorie(bareme_by_type_sal_name, bareme_name, categorie_salarie, base,
+        plafond_securite_sociale):
+    # Calcul de référence : chaque barème est appliqué à toute la population, puis masqué.
+    cotisation = 0
+    for type_sal_name, type_sal_index in CATEGORIE_SALARIE:
+        if type_sal_name not in bareme_by_type_sal_name:
+            continue
+        bareme = bareme_by_type_sal_name[type_sal_name].get(bareme_name)
+        if bareme is not None:
+            cotisation -= bareme.calc(
+                base * (categorie_salarie == type_sal_index),
+                factor = plafond_securite_sociale,
+                round_base_decimals = 2,
+                )
+    return cotisation
+
+
+def check_apply_bareme_for_relevant_type_sal(cotisation_type, bareme_name):
+    legislation = tax_benefit_system.get_compact_legislation(periods.instant('2016-01-01'))
+    bareme_by_type_sal_name = getattr(legislation.cotsoc, 'cotisations_' + cotisation_type)
+    random_state = RandomState(2016)
+    count = 1000
+    # Des valeurs hors de l'énumération sont obtenues lorsque la catégorie est sommée sur plusieurs mois.
+    categorie_salarie = random_state.randint(len(CATEGORIE_SALARIE) + 4, size = count)
+    base = (random_state.rand(count) * 20000).round(2)
+    plafond_securite_sociale = 3218 + 0 * base
+    assert_near(
+        apply_bareme_for_relevant_type_sal(
+            bareme_by_type_sal_name = bareme_by_type_sal_name,
+            bareme_name = bareme_name,
+            categorie_salarie = categorie_salarie,
+            base = base,
+            plafond_securite_sociale = plafond_securite_sociale,
+            ),
+        apply_bareme_par_categorie(bareme_by_type_sal_name, bareme_name, categorie_salarie, base,
+            plafond_securite_sociale),
+        absolute_error_margin = 1e-9,
+        )
+
+
+def test_apply_bareme_for_relevant_type_sal():
+    for cotisation_type, bareme_name in [
+            ('employeur', 'agirc'),
+            ('employeur', 'vieillesse_plafonnee'),
+            ('salarie', 'agirc'),
+            ('salarie', 'arrco'),
+            ('salarie', 'pension'),
+            ('salarie', 'ircantec'),
+            ]:
+        yield check_apply_bareme_for_relevant_type_sal, cotisation_type, bareme_name
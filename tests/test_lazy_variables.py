@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from openfisca_core.tools import assert_near
+
+from openfisca_france import FranceTaxBenefitSystem, variables_manifest
+from openfisca_france.reforms.plf2016 import plf2016
+
+from cache import tax_benefit_system
+
+
+lazy_tax_benefit_system = FranceTaxBenefitSystem(lazy_variables = True)
+
+
+def new_simulation(tax_benefit_system):
+    return tax_benefit_system.new_scenario().init_single_entity(
+        period = '2015-01',
+        parent1 = dict(age = 40, salaire_de_base = 1500),
+        menage = dict(loyer = 500, depcom = '75114', statut_occupation_logement = 4),
+        ).new_simulation()
+
+
+def test_manifest_is_up_to_date():
+    with open(variables_manifest.MANIFEST_PATH) as manifest_file:
+        manifest = json.load(manifest_file)
+    assert manifest == json.loads(json.dumps(variables_manifest.build_manifest(tax_benefit_system))), \
+        "The variables manifest is outdated. Run openfisca_france/scripts/build_variables_manifest.py to rebuild it."
+
+
+def test_lazy_variables():
+    column_by_name = lazy_tax_benefit_system.column_by_name
+    assert set(column_by_name) == set(tax_benefit_system.column_by_name)
+    assert 'isf_tot' in column_by_name
+    assert 'unknown_variable' not in column_by_name
+
+    aide_logement = new_simulation(lazy_tax_benefit_system).calculate('aide_logement', '2015-01')
+    assert_near(aide_logement, new_simulation(tax_benefit_system).calculate('aide_logement', '2015-01'))
+    assert variables_manifest.MODEL_PACKAGE_NAME + '.prestations.education' \
+        not in column_by_name.loaded_modules_name
+
+
+def test_lazy_variables_reform():
+    reform = plf2016(lazy_tax_benefit_system)
+    assert reform.get_column('decote').formula_class is not lazy_tax_benefit_system.get_column('decote').formula_class
+    assert reform.get_column('ir_plaf_qf') is lazy_tax_benefit_system.get_column('ir_plaf_qf')
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods
+
+from openfisca_france.legislation_cache import CompactLegislationCache
+from cache import tax_benefit_system
+
+
+def test_least_recently_used_instant_is_evicted():
+    cache = CompactLegislationCache(max_size = 2)
+    cache['2015-01-01'] = 2015
+    cache['2016-01-01'] = 2016
+    assert cache.get('2015-01-01') == 2015
+    cache['2017-01-01'] = 2017
+    assert '2016-01-01' not in cache
+    assert cache.get('2016-01-01') is None
+    assert cache.info() == (1, 1, 2, 2)
+
+
+def test_cache_is_shared_by_simulations():
+    period = periods.period('2016-01')
+    legislation_cache = tax_benefit_system.compact_legislation_by_instant_cache
+    tax_benefit_system.get_compact_legislation(period.start)
+    hits = legislation_cache.hits
+    misses = legislation_cache.misses
+    for _ in range(3):
+        simulation = tax_benefit_system.new_scenario().init_single_entity(
+            parent1 = dict(salaire_de_base = 2000),
+            period = period,
+            ).new_simulation()
+        simulation.calculate('salaire_net', period)
+        assert simulation.legislation_at(period.start) is tax_benefit_system.get_compact_legislation(period.start)
+    assert legislation_cache.misses == misses
+    assert legislation_cache.hits > hits
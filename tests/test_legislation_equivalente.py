@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods
+
+from openfisca_france.model.legislation_equivalente import premier_mois_equivalent
+from openfisca_france.model.prestations.minima_sociaux.ppa import CHEMINS_LEGISLATION_PPA
+from openfisca_france.scripts.measure_extra_params import build_extra_params_report
+from cache import tax_benefit_system
+
+
+def new_simulation():
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[
+            dict(count = 3, max = 1500, min = 0, name = 'salaire_net', period = month)
+            for month in ('2016-12', '2017-01', '2017-02', '2017-03')
+            ]],
+        enfants = [dict(age = 6)],
+        parent1 = dict(age = 35),
+        period = '2017-01',
+        ).new_simulation()
+
+
+def test_premier_mois_equivalent():
+    simulation = new_simulation()
+    assert premier_mois_equivalent(simulation, periods.period('2017-03'), CHEMINS_LEGISLATION_PPA) == \
+        periods.period('2017-01')
+    # Revalorisation du RSA au 1er avril
+    assert premier_mois_equivalent(simulation, periods.period('2017-04'), CHEMINS_LEGISLATION_PPA) == \
+        periods.period('2017-04')
+    assert premier_mois_equivalent(simulation, periods.period('2017-06'), CHEMINS_LEGISLATION_PPA) == \
+        periods.period('2017-04')
+
+
+def test_intermediaires_ppa_partages():
+    simulation = new_simulation()
+    simulation.calculate('ppa', '2017-02')
+    simulation.calculate('ppa', '2017-03')
+    extra_params_count_by_variable_name = dict(
+        (variable_name, extra_params_count)
+        for variable_name, _, extra_params_count, _ in build_extra_params_report(simulation)
+        )
+    assert extra_params_count_by_variable_name['ppa_fictive'] == 2
+    for variable_name in (
+            'ppa_bonification',
+            'ppa_eligibilite',
+            'ppa_montant_forfaitaire_familial_non_majore',
+            'ppa_revenu_activite_individu',
+            ):
+        assert extra_params_count_by_variable_name[variable_name] == 1, variable_name
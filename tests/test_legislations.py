@@ -2,6 +2,8 @@
 
 import datetime
 import json
+import shutil
+import tempfile
 
 from openfisca_core import legislations, legislationsxml
 
@@ -21,3 +23,17 @@ def check_legislation_xml_file(year):
 def test_legislation_xml_file():
     for year in range(2006, datetime.date.today().year + 1):
         yield check_legislation_xml_file, year
+
+
+def test_legislation_cache():
+    legislation_cache_dir = tempfile.mkdtemp()
+    try:
+        cached_tax_benefit_system = FranceTaxBenefitSystem(legislation_cache_dir = legislation_cache_dir)
+        legislation_json = cached_tax_benefit_system.get_legislation()
+        assert 'xml_parse' in cached_tax_benefit_system.startup_timings
+
+        cached_tax_benefit_system._legislation_json = None
+        assert cached_tax_benefit_system.get_legislation() == legislation_json
+        assert 'legislation_cache_load' in cached_tax_benefit_system.startup_timings
+    finally:
+        shutil.rmtree(legislation_cache_dir)
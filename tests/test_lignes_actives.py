@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+import numpy as np
+
+from openfisca_core import periods
+from openfisca_core.formulas import DatedFormula, SimpleFormula
+from openfisca_core.tools import assert_near
+
+from openfisca_france.model import lignes_actives
+from openfisca_france.scripts.benchmarks.populations import generate_population
+from cache import tax_benefit_system
+
+
+cases_by_annee = {
+    2009: ('f7df', 'f7ga', 'f7ud', 'f7wf'),
+    2013: ('f7cf', 'f7cu', 'f7db', 'f7df', 'f7ga', 'f7uf', 'f7ud', 'f7wf'),
+    }
+
+
+def build_simulation(annee, count = 200):
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[dict(count = count, max = 150000, min = 0, name = 'salaire_imposable')]],
+        enfants = [dict(age = 8)],
+        parent1 = dict(age = 40),
+        parent2 = dict(age = 38),
+        period = str(annee),
+        ).new_simulation()
+    random_state = np.random.RandomState(annee)
+    for case in cases_by_annee[annee]:
+        array = np.zeros(count, dtype = np.int32)
+        actifs = random_state.rand(count) < 0.05
+        array[actifs] = random_state.randint(100, 10000, actifs.sum())
+        simulation.get_or_new_holder(case).set_input(periods.period(str(annee)), array)
+    return simulation
+
+
+def calculate_sur_toute_l_entite(simulation, variable_name, period):
+    proportion_max_actifs = lignes_actives.PROPORTION_MAX_ACTIFS
+    lignes_actives.PROPORTION_MAX_ACTIFS = -1
+    try:
+        return simulation.calculate(variable_name, period)
+    finally:
+        lignes_actives.PROPORTION_MAX_ACTIFS = proportion_max_actifs
+
+
+def check_evaluation_restreinte(annee, variable_name):
+    assert_near(
+        build_simulation(annee).calculate(variable_name, str(annee)),
+        calculate_sur_toute_l_entite(build_simulation(annee), variable_name, str(annee)),
+        absolute_error_margin = 1e-3,
+        )
+
+
+def test_evaluation_restreinte():
+    for annee in sorted(cases_by_annee):
+        for variable_name in ('credits_impot', 'donapd', 'irpp', 'reductions', 'saldom'):
+            yield check_evaluation_restreinte, annee, variable_name
+
+
+def test_lignes_actives():
+    simulation = build_simulation(2013)
+    lignes = lignes_actives.get_lignes_actives(simulation, ['f7ud', 'f7uf', 'f7wa'], periods.period('2013'))
+    f7ud = simulation.calculate('f7ud', '2013')
+    f7uf = simulation.calculate('f7uf', '2013')
+    assert (lignes == np.flatnonzero((f7ud != 0) | (f7uf != 0))).all()
+
+
+# Years lacking parameters read by these functions (or by the salaries of the population, in 2002).
+annees_incompletes_by_variable_name = dict(
+    dfppce = [2002],
+    intemp = [2003],
+    repsoc = [2003],
+    )
+
+
+def iter_fonctions_sur_lignes_actives():
+    """Yield the (variable name, year, declared boxes) of the functions restricted to active rows, for each year."""
+    for variable_name, column in sorted(tax_benefit_system.column_by_name.iteritems()):
+        formula_class = column.formula_class
+        if issubclass(formula_class, DatedFormula):
+            for dated_formula_class in formula_class.dated_formulas_class:
+                cases = getattr(dated_formula_class['formula_class'].function, 'cases', None)
+                if cases is not None:
+                    for annee in get_annees(dated_formula_class['start_instant'], dated_formula_class['stop_instant']):
+                        yield variable_name, annee, cases
+        else:
+            cases = getattr(formula_class.function, 'cases', None)
+            if cases is not None:
+                for annee in get_annees(column.start, column.end):
+                    yield variable_name, annee, cases
+
+
+def get_annees(start, stop):
+    """Years of the legislation (2002-2015) where a function applies."""
+    first_year = 2002 if start is None else max(start.year, 2002)
+    last_year = 2015 if stop is None else min(stop.year, 2015)
+    return range(first_year, last_year + 1)
+
+
+def est_case(column):
+    formula_class = column.formula_class
+    return column.entity.key == 'foyer_fiscal' and issubclass(formula_class, SimpleFormula) \
+        and formula_class.function is None and re.match(r'(f\d|fh|case|nb)', column.name) is not None
+
+
+def check_nul_sans_cases_declarees(variable_name, annee, cases):
+    for case in cases:
+        assert est_case(tax_benefit_system.column_by_name[case]), case
+    simulation = generate_population(100, annee, seed = annee).build_simulation(tax_benefit_system, annee)
+    # All the other boxes of the declaration are filled for some foyers.
+    random_state = np.random.RandomState(annee)
+    count = simulation.entities['foyer_fiscal'].count
+    for case, column in sorted(tax_benefit_system.column_by_name.iteritems()):
+        if case in cases or not est_case(column) or column.definition_period != periods.YEAR:
+            continue
+        remplies = random_state.rand(count) < 0.3
+        if column.dtype == np.bool:
+            array = remplies
+        elif case.startswith('nb'):
+            array = remplies * random_state.randint(1, 4, count)
+        else:
+            array = remplies * random_state.randint(1, 20000, count)
+        simulation.get_or_new_holder(case).set_input(periods.period(annee), array.astype(column.dtype))
+    array = calculate_sur_toute_l_entite(simulation, variable_name, str(annee))
+    assert (array == 0).all(), (variable_name, annee, array[array != 0])
+
+
+def test_nul_sans_cases_declarees():
+    fonctions = list(iter_fonctions_sur_lignes_actives())
+    assert len(fonctions) > 100
+    for variable_name, annee, cases in fonctions:
+        if annee in annees_incompletes_by_variable_name.get(variable_name, []):
+            continue
+        yield check_nul_sans_cases_declarees, variable_name, annee, cases
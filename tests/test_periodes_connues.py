@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.model.periodes_connues import index_periodes_by_holder
+from cache import tax_benefit_system
+
+
+def test_age_extrapole_sur_plusieurs_annees():
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        parent1 = dict(age = 30),
+        period = '2015-01',
+        ).new_simulation()
+    assert_near(simulation.calculate('age', '2017-01'), 32)
+    assert_near(simulation.calculate('age', '2016-01'), 31)
+
+
+def test_index_mis_a_jour_sans_reconstruction():
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        parent1 = dict(age_en_mois = 100),
+        period = '2015-01',
+        ).new_simulation()
+    month = periods.period('2015-01')
+    for index in range(1, 48):
+        assert_near(simulation.calculate('age_en_mois', month.offset(index)), 100 + index)
+    index_periodes = index_periodes_by_holder[simulation.get_holder('age_en_mois')]
+    # L'index n'est construit qu'une fois, les mois calculés y sont ajoutés au fur et à mesure.
+    assert index_periodes.nb_reconstructions == 1
+    assert len(index_periodes.periodes) == 47
+
+
+def test_age_en_mois_apres_saisie():
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        parent1 = dict(age_en_mois = 100),
+        period = '2016-01',
+        ).new_simulation()
+    assert_near(simulation.calculate('age_en_mois', '2016-06'), 105)
+    # Une valeur saisie après coup est prise en compte, car elle est plus récente.
+    simulation.get_holder('age_en_mois').set_input(periods.period('2017-01'), simulation.calculate(
+        'age_en_mois', '2016-01') + 20)
+    assert_near(simulation.calculate('age_en_mois', '2016-09'), 116)
+
+
+def test_index_apres_saisies():
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        parent1 = dict(age_en_mois = 100),
+        period = '2016-01',
+        ).new_simulation()
+    holder = simulation.get_holder('age_en_mois')
+    for month in ('2016-06', '2016-07', '2016-08'):
+        simulation.calculate('age_en_mois', month)
+    # A value entered for an already known period replaces the previous one.
+    holder.set_input(periods.period('2016-08'), np.array([120]))
+    assert_near(simulation.calculate('age_en_mois', '2016-09'), 121)
+    # Once all the values are deleted, only the new inputs are used.
+    holder.delete_arrays()
+    holder.set_input(periods.period('2016-01'), np.array([200]))
+    assert_near(simulation.calculate('age_en_mois', '2016-10'), 209)
+    assert index_periodes_by_holder[holder].nb_reconstructions == 2
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core.holders import Holder
+from openfisca_core.simulations import Simulation
+from openfisca_core.tools import assert_near
+
+from openfisca_france.profiler import ProfiledHolder, SimulationProfiler
+from cache import tax_benefit_system
+
+
+def new_scenario():
+    return tax_benefit_system.new_scenario().init_single_entity(
+        period = 2016,
+        parent1 = dict(
+            age = 40,
+            salaire_de_base = 15000,
+            ),
+        enfants = [
+            dict(age = 5),
+            ],
+        menage = dict(
+            loyer = 500,
+            statut_occupation_logement = 4,
+            ),
+        )
+
+
+def test_profiler():
+    profiler = SimulationProfiler()
+    simulation = new_scenario().new_simulation(profiler = profiler)
+    revenu_disponible = simulation.calculate('revenu_disponible', '2016')
+    assert_near(revenu_disponible, new_scenario().new_simulation().calculate('revenu_disponible', '2016'),
+        absolute_error_margin = 0)
+
+    statistics = profiler.statistics_by_key[('revenu_disponible', simulation.period)]
+    assert statistics.calls == 1
+    assert statistics.cache_hits == 0
+    assert 0 < statistics.self_time < statistics.cumulative_time
+    assert statistics.allocated_bytes == revenu_disponible.nbytes
+    assert any(statistics.cache_hits > 0 for statistics in profiler.statistics_by_key.itervalues())
+    assert any(statistics.cycle_retries > 0 for statistics in profiler.statistics_by_key.itervalues())
+
+    rows = profiler.get_rows(sort_by = 'cumulative_time', by_variable = True)
+    assert rows[0][0] == 'revenu_disponible'
+    assert rows[0][2].cumulative_time == statistics.cumulative_time
+    assert len(profiler.format_table(limit = 10).splitlines()) == 11
+
+    stacks = list(profiler.iter_stacks())
+    assert stacks
+    for line in stacks:
+        stack, microseconds = line.rsplit(u' ', 1)
+        assert stack.split(u';')[0] == u'revenu_disponible'
+        assert int(microseconds) > 0
+
+
+def test_profiler_du_systeme_socio_fiscal():
+    profiler = SimulationProfiler()
+    tax_benefit_system.profiler = profiler
+    try:
+        simulation = new_scenario().new_simulation()
+    finally:
+        tax_benefit_system.profiler = None
+    simulation.calculate('rsa', '2016-01')
+    assert ('rsa', simulation.period.first_month) in profiler.statistics_by_key
+    assert isinstance(simulation.get_or_new_holder('salaire_de_base'), ProfiledHolder)
+
+
+def test_sans_profiler():
+    simulation = new_scenario().new_simulation()
+    simulation.calculate('rsa', '2016-01')
+    assert simulation.__class__ is Simulation
+    assert all(holder.__class__ is Holder for holder in simulation.holder_by_name.itervalues())
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from results_cache import ResultsCache, UsageRecorder
+from cache import tax_benefit_system
+
+
+def build_recorded_scenario():
+    scenario = tax_benefit_system.new_scenario().init_single_entity(
+        enfants = [dict(age = 8), dict(age = 12)],
+        parent1 = dict(age = 40, salaire_de_base = 30000),
+        period = 2015,
+        )
+    return scenario, UsageRecorder(scenario)
+
+
+def test_results_cache():
+    directory = tempfile.mkdtemp()
+    try:
+        scenario, usage_recorder = build_recorded_scenario()
+        scenario.new_simulation().calculate('af', '2015-01')
+        assert 'af' in usage_recorder.variables_names
+        assert 'prestations.prestations_familiales.af.taux.enf2' in usage_recorder.parameters_paths
+        assert not any(path.startswith('impot_revenu') for path in usage_recorder.parameters_paths)
+
+        results_cache = ResultsCache(tax_benefit_system, os.path.join(directory, 'results.json'))
+        test_key = results_cache.get_test_key(__file__, dict(name = u'af'))
+        assert not results_cache.is_unchanged(test_key)
+        results_cache.save({test_key: results_cache.make_record(usage_recorder)})
+        assert ResultsCache(tax_benefit_system, results_cache.file_path).is_unchanged(test_key)
+        assert results_cache.get_test_key(__file__, dict(name = u'af', reforms = [u'plf2015'])) is None
+
+        # A legislation update of a parameter read by the test
+        results_cache = ResultsCache(tax_benefit_system, results_cache.file_path)
+        results_cache.parameter_hash_by_path['prestations.prestations_familiales.af.taux.enf2'] = u'modified'
+        assert not results_cache.is_unchanged(test_key)
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from openfisca_core import conv, json_to_test_case, periods
+from openfisca_core.scenarios import AbstractScenario
+from openfisca_core.tools import assert_near
+
+from openfisca_france import scenarios
+from cache import tax_benefit_system
+
+
+single_entities = [
+    dict(
+        parent1 = dict(age = 40, salaire_de_base = 2000),
+        ),
+    dict(
+        enfants = [dict(age = 10), dict(age = 5)],
+        menage = dict(loyer = 600, statut_occupation_logement = 4),
+        parent1 = dict(age = 35, salaire_de_base = 1200),
+        parent2 = dict(age = 33),
+        ),
+    dict(
+        parent1 = dict(age = 70, retraite_brute = 1500),
+        parent2 = dict(age = 68, retraite_brute = 900),
+        ),
+    ]
+
+
+def test_init_single_entities():
+    period = '2016-01'
+    scenario = tax_benefit_system.new_scenario().init_single_entities(single_entities, period = period)
+    simulation = scenario.new_simulation()
+    salaire_net = scenario.split_by_single_entity(simulation.calculate('salaire_net', period), 'individu')
+    aide_logement = scenario.split_by_single_entity(simulation.calculate('aide_logement', period), 'famille')
+    revenu_disponible = scenario.split_by_single_entity(simulation.calculate('revenu_disponible', '2016'), 'menage')
+    assert [len(individus) for individus in salaire_net] == [1, 4, 2]
+    for index, single_entity in enumerate(single_entities):
+        single_simulation = tax_benefit_system.new_scenario().init_single_entity(
+            period = period,
+            **single_entity
+            ).new_simulation()
+        assert_near(salaire_net[index], single_simulation.calculate('salaire_net', period))
+        assert_near(aide_logement[index], single_simulation.calculate('aide_logement', period))
+        assert_near(revenu_disponible[index], single_simulation.calculate('revenu_disponible', '2016'))
+
+
+def test_init_single_entities_with_ids():
+    period = '2016-01'
+    single_entities = [
+        dict(
+            famille = dict(id = u'famille'),
+            foyer_fiscal = dict(id = u'foyer'),
+            menage = dict(id = u'menage', loyer = 500 + 100 * index, statut_occupation_logement = 4),
+            parent1 = dict(age = 40, id = u'parent', salaire_de_base = 1000 * index),
+            )
+        for index in range(3)
+        ]
+    scenario = tax_benefit_system.new_scenario().init_single_entities(single_entities, period = period)
+    for key in ('familles', 'foyers_fiscaux', 'menages'):
+        assert len(set(entity['id'] for entity in scenario.test_case[key])) == 3
+    simulation = scenario.new_simulation()
+    loyer = scenario.split_by_single_entity(simulation.calculate('loyer', period), 'menage')
+    assert_near(loyer, [[500], [600], [700]])
+    for index, single_entity in enumerate(single_entities):
+        single_simulation = tax_benefit_system.new_scenario().init_single_entity(
+            period = period,
+            **single_entity
+            ).new_simulation()
+        assert_near(
+            scenario.split_by_single_entity(simulation.calculate('aide_logement', period), 'famille')[index],
+            single_simulation.calculate('aide_logement', period),
+            )
+
+
+def build_households(count):
+    individus = []
+    familles = []
+    foyers_fiscaux = []
+    menages = []
+    for index in range(count):
+        parent1, parent2, enfant = u'p1-{}'.format(index), u'p2-{}'.format(index), u'e-{}'.format(index)
+        individus.extend([dict(id = parent1, age = 40), dict(id = parent2, age = 38), dict(id = enfant, age = 10)])
+        # parent2 et enfant n'ont pas de famille, enfant n'a pas de ménage
+        familles.append(dict(id = u'f{}'.format(index), parents = [parent1]))
+        foyers_fiscaux.append(dict(id = u'ff{}'.format(index), declarants = [parent1, parent2],
+            personnes_a_charge = [enfant]))
+        menages.append(dict(id = u'm{}'.format(index), personne_de_reference = parent1, conjoint = parent2))
+    return dict(individus = individus, familles = familles, foyers_fiscaux = foyers_fiscaux, menages = menages)
+
+
+def test_attribute_groupless_persons_to_entities():
+    scenario = tax_benefit_system.new_scenario().init_from_attributes(
+        period = '2017-01',
+        repair = True,
+        test_case = build_households(50),
+        )
+    test_case = scenario.test_case
+    assert len(test_case['familles']) == 50
+    assert len(test_case['menages']) == 50
+    for index, (famille, menage) in enumerate(zip(test_case['familles'], test_case['menages'])):
+        assert famille['parents'] == [u'p1-{}'.format(index), u'p2-{}'.format(index)]
+        assert famille['enfants'] == [u'e-{}'.format(index)]
+        assert menage['enfants'] == [u'e-{}'.format(index)]
+
+
+def test_entity_and_role_index():
+    test_case = build_households(3)
+    test_case['menages'][1]['autres'] = [u'e-1']
+    for menage in test_case['menages']:
+        menage.setdefault('autres', [])
+        menage.setdefault('enfants', [])
+    for famille in test_case['familles']:
+        famille.setdefault('enfants', [])
+    index = scenarios.EntityAndRoleIndex(test_case)
+    for individu in test_case['individus']:
+        individu_id = individu['id']
+        for find in ('find_famille_and_role', 'find_foyer_fiscal_and_role', 'find_menage_and_role'):
+            assert getattr(index, find)(individu_id) == getattr(scenarios, find)(test_case, individu_id)
+    index.add(u'familles', test_case['familles'][2], u'enfants', u'e-2')
+    assert index.find_famille_and_role(u'e-2') == (test_case['familles'][2], u'enfants')
+    assert test_case['familles'][2]['enfants'] == [u'e-2']
+
+
+def test_entities_consistency_errors():
+    test_case = build_households(2)
+    test_case['familles'][1]['parents'].append(u'p1-0')
+    error_by_scenario = []
+    for scenario in (tax_benefit_system.new_scenario(), AbstractScenario()):
+        scenario.tax_benefit_system = tax_benefit_system
+        error_by_scenario.append(scenario.make_json_or_python_to_test_case(
+            periods.period('2017-01'), repair = True)(test_case)[1])
+    assert error_by_scenario[0] is not None
+    assert error_by_scenario[0] == error_by_scenario[1]
+
+
+def test_suggest():
+    scenario = tax_benefit_system.new_scenario()
+    scenario.period = periods.period('2017-05')
+    scenario.test_case = dict(
+        familles = [
+            dict(id = 0, parents = ['a', 'b'], enfants = ['c']),
+            dict(id = 1, parents = ['d'], enfants = ['e']),
+            ],
+        foyers_fiscaux = [
+            dict(id = 0, declarants = ['a', 'b'], personnes_a_charge = ['c']),
+            dict(id = 1, declarants = ['d'], personnes_a_charge = ['e']),
+            ],
+        individus = [
+            dict(id = 'a', statut_marital = 1),
+            dict(id = 'b', age = {'2017-05': 35}),
+            dict(id = 'c', date_naissance = datetime.date(2001, 6, 1)),
+            dict(id = 'd', age_en_mois = 300, activite = 1),
+            dict(id = 'e', age = 17),
+            ],
+        menages = [],
+        )
+    assert scenario.suggest() == dict(test_case = dict(
+        foyers_fiscaux = {1: dict(caseT = True)},
+        individus = dict(
+            a = dict(date_naissance = u'1977-01-01'),
+            b = dict(statut_marital = u'1'),
+            c = dict(activite = u'2'),  # 15 ans au 1er mai 2017
+            ),
+        ))
+    assert scenario.test_case['individus'][1]['statut_marital'] == 1
+
+
+def test_entities_consistency_like_core():
+    def set_unknown_member(test_case):
+        test_case['familles'][0]['enfants'] = [u'inconnu']
+
+    def set_member_twice(test_case):
+        test_case['foyers_fiscaux'][1]['personnes_a_charge'].append(u'e-0')
+
+    def set_unique_role_twice(test_case):
+        test_case['menages'][1]['conjoint'] = u'p2-0'
+
+    def set_duplicate_person(test_case):
+        test_case['individus'].append(dict(id = u'p1-0', age = 20))
+
+    def remove_unique_role(test_case):
+        del test_case['menages'][0]['conjoint']
+
+    for modify_test_case in (None, set_unknown_member, set_member_twice, set_unique_role_twice, set_duplicate_person,
+            remove_unique_role):
+        results = []
+        for check_entities_consistency in (scenarios.check_entities_consistency,
+                json_to_test_case.check_entities_consistency):
+            test_case = build_households(2)
+            if modify_test_case is not None:
+                modify_test_case(test_case)
+            test_case, error, groupless_persons = check_entities_consistency(test_case, tax_benefit_system,
+                conv.default_state)
+            results.append((error, groupless_persons if error is None else None))
+        assert results[0] == results[1], modify_test_case
+
+
+def test_each_person_has_entities_like_core():
+    test_case = build_households(2)
+    results = []
+    for scenario in (tax_benefit_system.new_scenario(), AbstractScenario()):
+        scenario.tax_benefit_system = tax_benefit_system
+        results.append(scenario.make_json_or_python_to_test_case(periods.period('2017-01'))(test_case))
+    assert results[0][1] is not None
+    assert results[0][1] == results[1][1]
+
+
+def test_enfant_du_menage_a_charge_du_foyer_fiscal():
+    # e has a famille of its own, so that it is attributed to a foyer fiscal from its ménage.
+    scenario = tax_benefit_system.new_scenario().init_from_attributes(
+        period = '2016',
+        repair = True,
+        test_case = dict(
+            familles = [dict(id = u'f0', parents = [u'p']), dict(id = u'f1', parents = [u'e'])],
+            foyers_fiscaux = [dict(id = u'ff0', declarants = [u'p'])],
+            individus = [dict(id = u'p', age = 40, salaire_imposable = 30000), dict(id = u'e', age = 10)],
+            menages = [dict(id = u'm0', personne_de_reference = u'p', enfants = [u'e'])],
+            ),
+        )
+    # e used to be attributed as a second declarant, giving the foyer fiscal 1 part instead of 1.5.
+    foyer_fiscal = scenario.test_case['foyers_fiscaux'][0]
+    assert foyer_fiscal['declarants'] == [u'p']
+    assert foyer_fiscal['personnes_a_charge'] == [u'e']
+    simulation = scenario.new_simulation()
+    assert_near(simulation.calculate('nb_pac', '2016'), 1)
+    assert_near(simulation.calculate('nbptr', '2016'), 1.5)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from nose.tools import assert_raises
+
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.model.sommes_glissantes import calculate_add_glissant, get_sommes_prefixes
+from cache import tax_benefit_system
+
+
+def new_simulation():
+    first_month = periods.period('2016-01')
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[
+            dict(count = 3, max = 2000 + 100 * index, min = 0, name = 'salaire_net', period = first_month.offset(index))
+            for index in range(12)
+            ]],
+        parent1 = dict(age = 40),
+        period = '2016',
+        ).new_simulation()
+
+
+def test_trois_derniers_mois_glissants():
+    simulation = new_simulation()
+    reference = new_simulation()
+    for index in range(3, 12):
+        last_3_months = periods.period('2016-01').offset(index).last_3_months
+        assert_near(
+            calculate_add_glissant(simulation, 'salaire_net', last_3_months),
+            reference.calculate_add('salaire_net', last_3_months),
+            absolute_error_margin = 1e-3,
+            )
+    sommes_prefixes = get_sommes_prefixes(simulation, 'salaire_net')
+    assert sommes_prefixes.nb_sommes_calculees == 11
+    assert sommes_prefixes.nb_sommes_reutilisees == 9 * 3 - 11
+
+
+def test_annee():
+    simulation = new_simulation()
+    assert_near(
+        calculate_add_glissant(simulation, 'salaire_net', periods.period('2016')),
+        new_simulation().calculate_add('salaire_net', '2016'),
+        absolute_error_margin = 1e-2,
+        )
+
+
+def test_variable_annuelle():
+    simulation = new_simulation()
+    assert_near(
+        calculate_add_glissant(simulation, 'age', periods.period('2016-01')),
+        simulation.calculate('age', '2016-01'),
+        )
+
+
+def test_verification_de_l_entite():
+    simulation = new_simulation()
+    famille = simulation.entities['famille']
+    assert_near(
+        calculate_add_glissant(simulation, 'af', periods.period('2016'), entity = famille),
+        simulation.calculate_add('af', '2016'),
+        )
+    with assert_raises(Exception):
+        calculate_add_glissant(simulation, 'salaire_net', periods.period('2016'), entity = famille)
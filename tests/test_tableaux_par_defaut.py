@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from nose.tools import assert_raises
+
+from openfisca_core import periods
+from openfisca_core.tools import assert_near
+
+from openfisca_france.model.tableaux_par_defaut import get_tableau_par_defaut
+from cache import tax_benefit_system
+
+
+def build_simulation(count = 50):
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[dict(count = count, max = 100000, min = 0, name = 'salaire_imposable')]],
+        parent1 = dict(age = 40),
+        period = '2015',
+        ).new_simulation()
+
+
+def test_tableau_par_defaut_partage():
+    simulation = build_simulation()
+    f7ga = simulation.calculate('f7ga', '2015')
+    f7gb = simulation.calculate('f7gb', '2015')
+    caseT = simulation.calculate('caseT', '2015-01')
+    assert f7ga is f7gb
+    assert f7ga.strides == (0, )
+    assert_near(f7ga, np.zeros(50))
+    assert_near(caseT, np.zeros(50))
+    assert caseT is get_tableau_par_defaut(np.bool, False, 50)
+    with assert_raises(ValueError):
+        f7ga[0] = 1
+
+
+def test_saisie_apres_lecture():
+    simulation = build_simulation()
+    simulation.calculate('irpp', '2015')
+    holder = simulation.get_or_new_holder('caseT')
+    holder.set_input(periods.period('2016-01'), np.ones(50, dtype = np.bool))
+    assert simulation.calculate('caseT', '2016-01').all()
+    assert not simulation.calculate('caseT', '2015-01').any()
+    assert not get_tableau_par_defaut(np.bool, False, 50).any()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from openfisca_core import periods
+
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.contributions_sociales import \
+    versement_transport
+
+
+with open(versement_transport.TAUX_JSON_PATH) as data_file:
+    table_versement_transport = json.load(data_file)
+
+
+def get_taux_commune(code_commune, instant):
+    """Rate of a commune, looked up in the JSON table itself."""
+    taux_commune = table_versement_transport.get(code_commune)
+    if taux_commune is None:
+        return 0.
+    total = 0.
+    for key in ('aot', 'smt'):
+        rates = taux_commune.get(key)
+        if rates is None:
+            continue
+        dates = [date for date in rates['taux'] if str(instant) >= date]
+        if dates:
+            total += float(rates['taux'][max(dates)])
+    return total
+
+
+def test_taux_versement_transport():
+    communes = sorted(table_versement_transport)
+    codes_communes = np.array(communes[:20] + communes[-20:] + [u'2A004', u'00000', u'99999', u''])
+    for period in ('1990-01', '2002-04', '2010-06', '2016-01'):
+        period = periods.period(period)
+        taux = versement_transport.get_taux_versement_transport(codes_communes, period)
+        assert taux.shape == codes_communes.shape
+        assert np.allclose(taux, [get_taux_commune(code_commune, period.start) for code_commune in codes_communes])
+    # CA du Grand Troyes
+    assert np.allclose(
+        versement_transport.get_taux_versement_transport(np.array([u'10060', u'10060']), periods.period('2016-01')),
+        [1.05, 1.05])
+
+
+def test_taux_compiles_en_cache():
+    cache_dir = os.path.join(tempfile.mkdtemp(), 'versement_transport')
+    try:
+        communes, dates, taux_by_date_by_commune = versement_transport.load_taux_versement_transport(
+            versement_transport.TAUX_JSON_PATH, cache_dir)
+        npy_name, index_name = sorted(os.listdir(cache_dir))
+        assert npy_name.startswith('taux-') and npy_name.endswith('.npy')
+        assert index_name == 'taux_index-{}.npz'.format(npy_name[len('taux-'):-len('.npy')])
+        cached_communes, cached_dates, cached_taux_by_date_by_commune = \
+            versement_transport.load_taux_versement_transport(versement_transport.TAUX_JSON_PATH, cache_dir)
+        assert isinstance(cached_taux_by_date_by_commune, np.memmap)
+        assert (cached_communes == communes).all()
+        assert (cached_dates == dates).all()
+        assert (cached_taux_by_date_by_commune == taux_by_date_by_commune).all()
+    finally:
+        shutil.rmtree(os.path.dirname(cache_dir))
@@ -1,18 +1,314 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
 
+"""
+Run the YAML tests.
+
+With nose, the tests are run serially, in the nose process. When this module is run as a script, the tax and benefit
+system is built once, and the YAML files are dispatched, costliest first, to a pool of forked processes sharing it.
+The cost of each file is its CPU time measured by the previous run (or its size, for a new file), and the costliest
+files are split into chunks of cases.
+
+With --results-cache, the tests which passed are skipped as long as the variables and parameters they use do not
+change (see results_cache.py).
+"""
+
+
+import argparse
+import collections
+import glob
+import json
+import multiprocessing
 import os
+import sys
+import time
+import traceback
+
+import yaml
 from nose.tools import nottest
 
-from openfisca_core.tools.test_runner import generate_tests
+from openfisca_core import scenarios
+from openfisca_core.tools.test_runner import _run_test, generate_tests
 
 from cache import tax_benefit_system
+from results_cache import ResultsCache, UsageRecorder
 
 nottest(generate_tests)
 
+tests_directory = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+timings_file_path = os.path.join(tests_directory, '.yaml_timings.json')
+results_cache_file_path = os.path.join(tests_directory, '.yaml_results_cache.json')
+results_cache = None  # Set by main(), before forking.
+
+YamlFileResult = collections.namedtuple('YamlFileResult', ['path', 'wall_time', 'cpu_time', 'cases_count',
+    'cached_cases_count', 'failures', 'record_by_test_key'])
+
+
 def test():
-    tests_directory = os.path.abspath(os.path.join(os.path.dirname(__file__)))
     test_generator = generate_tests(tax_benefit_system, tests_directory)
 
     for test in test_generator:
         yield test
+
+
+# Parallel runner
+
+
+def find_yaml_files(directory):
+    yaml_files_path = sorted(glob.glob(os.path.join(directory, '*.yaml')))
+    for subdirectory in sorted(glob.glob(os.path.join(directory, '*/'))):
+        yaml_files_path.extend(find_yaml_files(subdirectory))
+    return yaml_files_path
+
+
+def load_timings(file_path):
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path) as timings_file:
+        return json.load(timings_file)
+
+
+def save_timings(file_path, results):
+    timings = load_timings(file_path)
+    timings.update(
+        (os.path.relpath(result.path, tests_directory), result.cpu_time)
+        for result in results
+        )
+    with open(file_path, 'w') as timings_file:
+        json.dump(timings, timings_file, indent = 2, sort_keys = True)
+
+
+def split_by_cost(yaml_files_path, timings, jobs):
+    """
+    Return the (path, chunk_index, chunks_count) tasks to run, costliest first.
+
+    The files without a measured CPU time are estimated from their size. The costliest files are split into chunks
+    of their cases, so that no task is much longer than the others.
+    """
+    seconds_by_byte = (
+        sum(timings.values()) / sum(os.path.getsize(os.path.join(tests_directory, path)) for path in timings)
+        if timings and all(os.path.exists(os.path.join(tests_directory, path)) for path in timings)
+        else 1e-5
+        )
+    cost_by_path = dict(
+        (path, timings.get(os.path.relpath(path, tests_directory), os.path.getsize(path) * seconds_by_byte))
+        for path in yaml_files_path
+        )
+    chunk_max_cost = sum(cost_by_path.itervalues()) / (4 * jobs)
+    tasks = []
+    for path, cost in cost_by_path.iteritems():
+        chunks_count = min(jobs, int(cost / chunk_max_cost) + 1) if chunk_max_cost else 1
+        tasks.extend(
+            (cost / chunks_count, (path, chunk_index, chunks_count))
+            for chunk_index in range(chunks_count)
+            )
+    return [task for _, task in sorted(tasks, reverse = True)]
+
+
+@nottest
+def load_raw_tests(path):
+    """Return the raw tests of a YAML file, before their conversion."""
+    with open(path) as yaml_file:
+        raw_tests = yaml.load(yaml_file)
+    return [
+        raw_test
+        for raw_test in (raw_tests if isinstance(raw_tests, list) else [raw_tests])
+        if raw_test is not None
+        ]
+
+
+@nottest
+def parse_raw_test(path, raw_test):
+    """
+    Convert a raw test, like openfisca_core.tools.test_runner._parse_test_file does for all the tests of a file.
+
+    Converting builds the scenario and applies the reforms of the test, so a chunk of a file only converts its own
+    tests.
+    """
+    test = raw_test.copy()
+    current_tax_benefit_system = tax_benefit_system
+    if test.get('reforms'):
+        reforms = test.pop('reforms')
+        if not isinstance(reforms, list):
+            reforms = [reforms]
+        for reform_path in reforms:
+            current_tax_benefit_system = current_tax_benefit_system.apply_reform(reform_path)
+    test, error = scenarios.make_json_or_python_to_test(tax_benefit_system = current_tax_benefit_system)(test)
+    if error is not None:
+        raise ValueError("Error in test {}:\n{}\nYaml test content: \n{}\n".format(path, error,
+            yaml.dump(test, allow_unicode = True, default_flow_style = False, indent = 2, width = 120)))
+    return test
+
+
+def run_yaml_file(path, chunk_index = 0, chunks_count = 1, options = {}):
+    """
+    Run the tests of a YAML file (or of its chunk `chunk_index` out of `chunks_count`), returning the tracebacks (and
+    output) of the failed ones.
+
+    The tests unchanged since they passed are skipped when `results_cache` is set, and the cones of the others are
+    returned.
+    """
+    start_time = time.time()
+    start_cpu_time = time.clock()
+    failures = []
+    cases_count = 0
+    cached_cases_count = 0
+    record_by_test_key = {}
+    file_name = os.path.splitext(os.path.basename(path))[0]
+    name_filter = options.get('name_filter')
+    if isinstance(name_filter, str):
+        name_filter = name_filter.decode('utf-8')
+    try:
+        raw_tests = load_raw_tests(path)
+    except Exception:
+        # Parsing errors
+        failures.append(traceback.format_exc())
+        raw_tests = []
+    # Only the tests of the chunk are converted.
+    for test_index, raw_test in enumerate(raw_tests):
+        if test_index % chunks_count != chunk_index:
+            continue
+        name = raw_test.get('name') or file_name
+        keywords = raw_test.get('keywords') or []
+        if name_filter is not None and name_filter not in file_name and name_filter not in name \
+                and name_filter not in keywords:
+            continue
+        test_key = (
+            results_cache.get_test_key(path, raw_test)
+            if results_cache is not None
+            else None
+            )
+        if test_key is not None and results_cache.is_unchanged(test_key):
+            cached_cases_count += 1
+            continue
+        cases_count += 1
+        period_str = None
+        try:
+            test = parse_raw_test(path, raw_test)
+            period_str = unicode(test['scenario'].period)
+            usage_recorder = UsageRecorder(test['scenario']) if test_key is not None else None
+            _run_test(period_str, test, options = options)
+        except Exception:
+            failures.append(u'{}: {}{} - {}\n{}'.format(
+                os.path.basename(path),
+                u'[{}] '.format(u', '.join(keywords)) if keywords else u'',
+                name,
+                period_str,
+                traceback.format_exc().decode('utf-8'),
+                ).encode('utf-8'))
+        else:
+            if usage_recorder is not None:
+                record_by_test_key[test_key] = results_cache.make_record(usage_recorder)
+    return YamlFileResult(path, time.time() - start_time, time.clock() - start_cpu_time, cases_count,
+        cached_cases_count, failures, record_by_test_key)
+
+
+def run_yaml_files(tasks, jobs, options = {}):
+    """Run the tasks in a pool of `jobs` processes forked after the tax and benefit system is built."""
+    if jobs == 1:
+        for path, chunk_index, chunks_count in tasks:
+            yield run_yaml_file(path, chunk_index, chunks_count, options)
+        return
+    # Build what the forked processes should share.
+    tax_benefit_system.get_legislation()
+    tax_benefit_system.prefill_cache()
+    pool = multiprocessing.Pool(processes = jobs)
+    try:
+        for result in pool.imap_unordered(run_yaml_file_star, [task + (options, ) for task in tasks]):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run_yaml_file_star(arguments):
+    return run_yaml_file(*arguments)
+
+
+def merge_by_file(results):
+    result_by_path = collections.OrderedDict()
+    for result in results:
+        merged_result = result_by_path.get(result.path)
+        result_by_path[result.path] = result if merged_result is None else YamlFileResult(
+            result.path,
+            merged_result.wall_time + result.wall_time,
+            merged_result.cpu_time + result.cpu_time,
+            merged_result.cases_count + result.cases_count,
+            merged_result.cached_cases_count + result.cached_cases_count,
+            merged_result.failures + result.failures,
+            dict(merged_result.record_by_test_key, **result.record_by_test_key),
+            )
+    return result_by_path.values()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs = '*', default = [tests_directory],
+        help = "YAML files or directories to run (default: all)")
+    parser.add_argument('-j', '--jobs', type = int, default = multiprocessing.cpu_count(),
+        help = "number of processes (default: number of CPUs)")
+    parser.add_argument('-c', '--results-cache', nargs = '?', const = results_cache_file_path, default = None,
+        help = "skip the tests which passed and whose variables and parameters did not change since, using this JSON "
+            "file (default: {})".format(os.path.relpath(results_cache_file_path)))
+    parser.add_argument('-n', '--name-filter', default = None, help = "only run the tests whose name contains this")
+    parser.add_argument('-s', '--slowest', type = int, default = 20,
+        help = "number of slowest files to report (default: 20)")
+    parser.add_argument('-t', '--timings-file', default = timings_file_path,
+        help = "JSON file where the CPU time of each file is read and saved")
+    args = parser.parse_args()
+
+    yaml_files_path = []
+    for path in args.paths:
+        path = os.path.abspath(path)
+        yaml_files_path.extend(find_yaml_files(path) if os.path.isdir(path) else [path])
+    tasks = split_by_cost(yaml_files_path, load_timings(args.timings_file), args.jobs)
+    options = dict(name_filter = args.name_filter) if args.name_filter is not None else {}
+    if args.results_cache is not None:
+        global results_cache
+        results_cache = ResultsCache(tax_benefit_system, args.results_cache)
+
+    start_time = time.time()
+    results = []
+    for result in run_yaml_files(tasks, args.jobs, options):
+        results.append(result)
+        sys.stdout.write('F' if result.failures else '.')
+        sys.stdout.flush()
+    wall_time = time.time() - start_time
+    print
+    results = merge_by_file(results)
+
+    failures_count = 0
+    for result in sorted(results, key = lambda result: result.path):
+        for failure in result.failures:
+            failures_count += 1
+            print '=' * 70
+            print 'FAIL: {}'.format(os.path.relpath(result.path, tests_directory))
+            print '-' * 70
+            print failure
+    if args.slowest:
+        print 'Slowest files:'
+        for result in sorted(results, key = lambda result: result.wall_time, reverse = True)[:args.slowest]:
+            print '{:8.3f} s {:4d} {}'.format(result.wall_time, result.cases_count,
+                os.path.relpath(result.path, tests_directory))
+    if args.name_filter is None:
+        # The files with skipped tests would look cheaper than they are.
+        save_timings(args.timings_file, [result for result in results if not result.cached_cases_count])
+    if results_cache is not None:
+        results_cache.save(dict(
+            (test_key, record)
+            for result in results
+            for test_key, record in result.record_by_test_key.iteritems()
+            ))
+
+    print '-' * 70
+    print 'Ran {} tests from {} files in {:.3f} s ({:.3f} s of tests, {} processes)'.format(
+        sum(result.cases_count for result in results), len(results), wall_time,
+        sum(result.wall_time for result in results), args.jobs)
+    if results_cache is not None:
+        print 'Skipped {} unchanged tests'.format(sum(result.cached_cases_count for result in results))
+    print 'FAILED (failures={})'.format(failures_count) if failures_count else 'OK'
+    return 1 if failures_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
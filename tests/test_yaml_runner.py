@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import test_yaml
+
+
+def test_split_by_cost():
+    yaml_files_path = [
+        os.path.join(test_yaml.tests_directory, 'formulas', file_name)
+        for file_name in ('af.yaml', 'irpp.yaml', 'ppa.yaml')
+        ]
+    timings = {
+        'formulas/af.yaml': 1.,
+        'formulas/irpp.yaml': 10.,
+        'formulas/ppa.yaml': .5,
+        }
+    tasks = test_yaml.split_by_cost(yaml_files_path, timings, jobs = 2)
+    assert tasks[0][0] == yaml_files_path[1]
+    assert sorted(task[1:] for task in tasks if task[0] == yaml_files_path[1]) == [(0, 2), (1, 2)]
+    assert sorted(task[0] for task in tasks) == sorted(yaml_files_path + yaml_files_path[1:2])
+
+
+def test_run_yaml_file_by_chunks():
+    path = os.path.join(test_yaml.tests_directory, 'formulas', 'af.yaml')
+    cases_count = len(test_yaml.load_raw_tests(path))
+    results = [test_yaml.run_yaml_file(path, chunk_index, 3) for chunk_index in range(3)]
+    assert [result.cases_count for result in results] == [
+        len(range(chunk_index, cases_count, 3))
+        for chunk_index in range(3)
+        ]
+    assert not any(result.failures for result in results)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+
+import numpy as np
+import pkg_resources
+
+import openfisca_france
+from openfisca_france.model.prestations import aides_logement
+
+
+def get_zone_apl_by_depcom():
+    """Zones APL read directly from the assets, without the compiled index."""
+    with pkg_resources.resource_stream(openfisca_france.__name__, 'assets/apl/20110914_zonage.csv') as csv_file:
+        zone_apl_by_depcom = {
+            row['CODGEO']: int(row['Zonage'][0])
+            for row in csv.DictReader(csv_file)
+            }
+    with pkg_resources.resource_stream(openfisca_france.__name__,
+            'assets/apl/commune_depcom_by_subcommune_depcom.json') as json_file:
+        for subcommune_depcom, commune_depcom in json.load(json_file).iteritems():
+            zone_apl_by_depcom[subcommune_depcom] = zone_apl_by_depcom[commune_depcom]
+    return zone_apl_by_depcom
+
+
+zone_apl_by_depcom = get_zone_apl_by_depcom()
+
+
+def check_zones_apl(depcoms, zones):
+    assert np.array_equal(aides_logement.zone_apl_from_depcom(np.array(depcoms)), zones)
+
+
+def test_zone_apl_premier_et_dernier_depcom():
+    depcoms = sorted(zone_apl_by_depcom)
+    for depcom in depcoms[:3] + depcoms[-3:]:
+        check_zones_apl([depcom], [zone_apl_by_depcom[depcom]])
+
+
+def test_zone_apl_corse():
+    depcoms = [depcom for depcom in sorted(zone_apl_by_depcom) if depcom[:2] in ('2A', '2B')]
+    assert depcoms[0].startswith('2A') and depcoms[-1].startswith('2B')
+    check_zones_apl(depcoms, [zone_apl_by_depcom[depcom] for depcom in depcoms])
+    # Ajaccio
+    check_zones_apl(['2A004'], [2])
+
+
+def test_zone_apl_depcom_inconnu():
+    # Before the first code, between two codes, after the last code and empty code.
+    depcoms = ['00000', '2A000', '2C001', '75000', '99999', 'ZZZZZ', '']
+    assert not any(depcom in zone_apl_by_depcom for depcom in depcoms)
+    check_zones_apl(depcoms, [2] * len(depcoms))
+    assert np.array_equal(aides_logement.zone_apl_from_depcom(np.array(depcoms), default_value = 0), [0] * len(depcoms))
+
+
+def test_zone_apl_tous_les_depcoms():
+    depcoms = sorted(zone_apl_by_depcom)
+    check_zones_apl(depcoms, [zone_apl_by_depcom[depcom] for depcom in depcoms])